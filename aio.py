@@ -0,0 +1,166 @@
+"""Asynchronous API of the solvers
+
+    async with Solver(workers=4) as solver:
+        found = await solver.solve(x, y, method=3, deadline=1.5)
+
+Every call is solved in a warm worker process, so the event loop is never
+blocked. Calls beyond the number of workers wait for a free one, cancelling
+a call or exceeding its deadline kills the running search.
+"""
+
+import asyncio
+import os
+from collections.abc import Iterable
+from typing import Any, Optional
+
+import exceptions
+from progress import Progress
+from workers import ERROR, FAILURE, FOUND, TIMEOUT, Worker
+
+
+class Solver:
+    def __init__(self, workers: Optional[int] = None) -> None:
+        """
+        Args:
+            workers: maximal number of concurrently running searches
+                (the number of CPUs by default)
+        """
+
+        self.size = workers or os.cpu_count() or 1
+        self.workers: list[Worker] = []
+        self.idle: Optional[asyncio.Queue] = None
+
+    async def __aenter__(self) -> 'Solver':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    async def acquire(self) -> Worker:
+        if self.idle is None:
+            self.idle = asyncio.Queue()
+        if self.idle.empty() and len(self.workers) < self.size:
+            # workers are started on demand, the start blocks for a moment
+            self.workers.append(Worker())
+            return self.workers[-1]
+        worker: Worker = await self.idle.get()
+        return worker
+
+    def release(self, worker: Worker) -> None:
+        assert self.idle is not None
+        self.idle.put_nowait(worker)
+
+    async def wait_readable(self, worker: Worker) -> None:
+        """Waits for a message of the worker without blocking the loop"""
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fileno = worker.fileno()
+
+        def wake() -> None:
+            if not ready.done():
+                ready.set_result(None)
+
+        loop.add_reader(fileno, wake)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fileno)
+
+    async def receive(self, worker: Worker) -> tuple[int, int, int, str]:
+        await self.wait_readable(worker)
+        return worker.receive()
+
+    async def solve(
+        self,
+        graph_x: Iterable,
+        graph_y: Iterable,
+        method: int = 3,
+        deadline: Optional[float] = None,
+    ) -> bool:
+        """Decides whether the pair has a decomposition
+
+        Args:
+            graph_x: x graph
+            graph_y: y graph
+            method: key of main.funcs
+            deadline: runtime threshold of the call (in seconds)
+
+        Returns:
+            bool: True if the decomposition exists
+
+        Raises:
+            exceptions.SingleTestTimeoutExceeded: the deadline is exceeded
+            exceptions.InputError: the pair or the method is invalid
+            exceptions.SolverError: the search or the worker process failed
+        """
+
+        worker = await self.acquire()
+        try:
+            if not worker.ready:
+                await self.wait_readable(worker)
+                worker.wait_ready()
+            worker.send(tuple(graph_x), tuple(graph_y), method, None)
+            try:
+                status, _, _, message = await asyncio.wait_for(
+                    self.receive(worker), deadline
+                )
+            except asyncio.TimeoutError:
+                worker.restart()
+                raise exceptions.SingleTestTimeoutExceeded(
+                    'Deadline of ' + str(deadline) + ' seconds exceeded'
+                )
+            except BaseException:
+                # cancelled, the search is still running in the worker
+                worker.restart()
+                raise
+        finally:
+            self.release(worker)
+
+        if status == TIMEOUT:
+            raise exceptions.SingleTestTimeoutExceeded(message)
+        if status == ERROR:
+            raise exceptions.InputError(message)
+        if status == FAILURE:
+            raise exceptions.SolverError(message)
+        return status == FOUND
+
+    async def solve_all(
+        self,
+        pairs: Iterable,
+        method: int = 3,
+        deadline: Optional[float] = None,
+        progress: Optional[Progress] = None,
+    ) -> list:
+        """Solves all pairs concurrently
+
+        Args:
+            pairs: 2-tuple x, y graphs
+            method: key of main.funcs
+            deadline: runtime threshold of every call (in seconds)
+            progress: progress line updated as calls complete
+
+        Returns:
+            list: True, False or the raised exception for every pair
+        """
+
+        async def solve(graph_x: Iterable, graph_y: Iterable) -> bool:
+            result = None
+            try:
+                result = await self.solve(graph_x, graph_y, method, deadline)
+            finally:
+                if progress:
+                    progress.update(result)
+            return result
+
+        return await asyncio.gather(
+            *(solve(x, y) for x, y in pairs), return_exceptions=True
+        )
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(None, worker.close) for worker in self.workers)
+        )
+        self.workers = []
+        self.idle = None
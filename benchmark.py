@@ -0,0 +1,344 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from time import perf_counter_ns
+from typing import Optional
+
+import numpy
+from prettytable import PrettyTable
+
+import exceptions
+from main import funcs
+from policies import policies
+from utils import import_from_file
+
+ladder = [32, 48, 64, 96, 128, 192, 256, 384, 512, 768, 1024, 1536, 2048, 3072, 4096]
+default_paths = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'examples', f'test{n}.txt')
+    for n in ladder
+]
+
+
+# entry points that must stay importable without plotting and numeric libraries
+light_modules = ['directed', 'undirected', 'utils', 'main']
+heavy_modules = ['matplotlib', 'numpy']
+
+# chain edge fixing methods taking a branching policy
+policy_methods = [2, 3, 14, 15, 16, 17]
+
+
+def import_time(module: str, repeat: int = 5) -> dict:
+    """Measures the import time of a module in fresh interpreters
+
+    Returns:
+        dict: best import time (in seconds) and heavy modules imported with it
+    """
+
+    code = (
+        'import sys, time; start = time.perf_counter(); import {module}; '
+        'print(time.perf_counter() - start); '
+        'print(",".join(name for name in {heavy} if name in sys.modules))'
+    ).format(module=module, heavy=heavy_modules)
+
+    times, heavy = [], ''
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split('\n')
+        times.append(float(output[0]))
+        heavy = output[1]
+
+    return {'time': min(times), 'heavy': heavy.split(',') if heavy else []}
+
+
+def pack_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def pair_id(pack: str, idx: int) -> str:
+    return pack + ':' + str(idx)
+
+
+def variant(method: int, policy: Optional[str]) -> str:
+    """Names a method run with a branching policy (the method number alone
+    for the default one)
+    """
+
+    return str(method) if policy is None else str(method) + ':' + policy
+
+
+def parse_arguments() -> dict:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--path",
+        dest="path",
+        help="Path(s) to the file(s) with tests (examples/test32.txt ... by default)",
+    )
+    parser.add_argument(
+        "--method", dest="method", help="Method(s) to run", default='0,1,2,3'
+    )
+    parser.add_argument(
+        "--times", dest="times", help="How many pairs of every file to run", default=10
+    )
+    parser.add_argument(
+        "--timeout",
+        dest="timeout",
+        help="Runtime threshold for one pair (in seconds)",
+        default=60,
+    )
+    parser.add_argument(
+        "--stop-ratio",
+        dest="stop_ratio",
+        help=(
+            "Skip bigger files for a method once this share of pairs "
+            "of a file exceeded the timeout"
+        ),
+        default=0.5,
+    )
+    parser.add_argument(
+        "--output", dest="output", help="Path to the JSON results", default=None
+    )
+    parser.add_argument(
+        "--policy",
+        dest="policy",
+        help=(
+            "Branching policies of the chain edge fixing methods to compare "
+            "('default' or one of: {})".format(', '.join(policies))
+        ),
+        default='default',
+    )
+    parser.add_argument(
+        "--imports",
+        dest="imports",
+        help="Measure import time of the solver entry points instead",
+        default='false',
+    )
+
+    args = parser.parse_args()
+
+    return {
+        'paths': args.path.split(',') if args.path else default_paths,
+        'methods': list(map(int, args.method.split(','))),
+        'times': int(args.times),
+        'timeout': float(args.timeout),
+        'stop_ratio': float(args.stop_ratio),
+        'output': args.output,
+        'policies': [
+            None if policy == 'default' else policy for policy in args.policy.split(',')
+        ],
+        'imports': args.imports in ('True', 'true', 't'),
+    }
+
+
+def time_pair(
+    method: int,
+    graph_x: tuple,
+    graph_y: tuple,
+    timeout: Optional[float],
+    policy: Optional[str] = None,
+) -> tuple[Optional[bool], int]:
+    """Runs one method on one pair
+
+    Returns:
+        tuple: result (None if timeout exceeded) and runtime in nanoseconds
+    """
+
+    kwargs: dict = {}
+    start_time = perf_counter_ns()
+    if timeout:
+        kwargs['timeout'] = (datetime.now(), timeout / 60)
+    if policy:
+        kwargs['policy'] = policy
+    try:
+        result: Optional[bool] = funcs[method]['func'](graph_x, graph_y, **kwargs)
+    except exceptions.SingleTestTimeoutExceeded:
+        result = None
+
+    return result, perf_counter_ns() - start_time
+
+
+def fit_scaling(sizes: list, times: list) -> dict:
+    """Fits time = coefficient * n ** exponent by least squares in log-log scale"""
+
+    if len(sizes) < 2:
+        return {'exponent': None, 'coefficient': None, 'sizes': sizes}
+
+    exponent, intercept = numpy.polyfit(numpy.log(sizes), numpy.log(times), 1)
+    return {
+        'exponent': round(float(exponent), 3),
+        'coefficient': float(numpy.exp(intercept)),
+        'sizes': sizes,
+    }
+
+
+def summarize(records: list) -> list:
+    groups: dict = {}
+    for record in records:
+        groups.setdefault(
+            (record['method'], record['policy'] or '', record['n']), []
+        ).append(record)
+
+    summary = []
+    for (method, policy, n), group in sorted(groups.items()):
+        times = [record['time'] for record in group if not record['timeout']]
+        summary.append(
+            {
+                'method': method,
+                'policy': policy or None,
+                'variant': variant(method, policy or None),
+                'n': n,
+                'pairs': len(group),
+                'found': sum(record['result'] is True for record in group),
+                'not_found': sum(record['result'] is False for record in group),
+                'timeouts': sum(record['timeout'] for record in group),
+                'median': float(numpy.median(times)) if times else None,
+                'mean': float(numpy.mean(times)) if times else None,
+            }
+        )
+
+    return summary
+
+
+def scaling(summary: list) -> dict:
+    result = {}
+    for name in dict.fromkeys(row['variant'] for row in summary):
+        rows = [
+            row
+            for row in summary
+            if row['variant'] == name and not row['timeouts'] and row['median']
+        ]
+        result[name] = fit_scaling(
+            [row['n'] for row in rows], [row['median'] for row in rows]
+        )
+    return result
+
+
+def run(configuration: dict) -> dict:
+    records: list = []
+    stopped: set = set()
+    variants = [
+        (method, policy)
+        for method in configuration['methods']
+        for policy in (
+            configuration.get('policies') or [None]
+            if method in policy_methods
+            else [None]
+        )
+    ]
+
+    for path in configuration['paths']:
+        pack = pack_name(path)
+        graphs = import_from_file(path)[: configuration['times']]
+        vertex_number = len(graphs[0][0])
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), vertex_number * 10))
+
+        for method, policy in variants:
+            if (method, policy) in stopped:
+                continue
+
+            timeouts = 0
+            for idx, (graph_x, graph_y) in enumerate(graphs):
+                result, runtime = time_pair(
+                    method, graph_x, graph_y, configuration['timeout'], policy
+                )
+                timeouts += result is None
+                records.append(
+                    {
+                        'id': pair_id(pack, idx),
+                        'pack': pack,
+                        'pair': idx,
+                        'method': method,
+                        'policy': policy,
+                        'n': vertex_number,
+                        'result': result,
+                        'time': runtime / 10**9,
+                        'timeout': result is None,
+                    }
+                )
+
+            print(
+                '-' * 30,
+                vertex_number,
+                str(funcs[method]['title']).upper(),
+                '({})'.format(policy) if policy else '',
+                'COMPLETED',
+                '-' * 30,
+            )
+            if timeouts >= configuration['stop_ratio'] * len(graphs):
+                stopped.add((method, policy))
+
+    summary = summarize(records)
+    return {
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'configuration': configuration,
+        'methods': {
+            variant(method, policy): funcs[method]['title']
+            + (' ({} policy)'.format(policy) if policy else '')
+            for method, policy in variants
+        },
+        'results': records,
+        'summary': summary,
+        'scaling': scaling(summary),
+    }
+
+
+def print_report(report: dict) -> None:
+    table = PrettyTable(
+        ['Vertex number', 'Method', 'Pairs', 'Median time (s)', 'Limit exceeded']
+    )
+    for row in report['summary']:
+        table.add_row(
+            [
+                row['n'],
+                report['methods'][row['variant']],
+                row['pairs'],
+                round(row['median'], 4) if row['median'] is not None else '--',
+                row['timeouts'],
+            ]
+        )
+    print(table)
+
+    table = PrettyTable(['Method', 'Scaling exponent', 'Vertex numbers'])
+    for name, fit in report['scaling'].items():
+        table.add_row(
+            [
+                report['methods'][name],
+                fit['exponent'] if fit['exponent'] is not None else '--',
+                ', '.join(map(str, fit['sizes'])),
+            ]
+        )
+    print(table)
+
+
+def print_import_times() -> None:
+    table = PrettyTable(['Module', 'Import time (s)', 'Heavy modules imported'])
+    for module in light_modules:
+        result = import_time(module)
+        table.add_row(
+            [module, round(result['time'], 3), ', '.join(result['heavy']) or '--']
+        )
+    print(table)
+
+
+if __name__ == '__main__':
+    configuration = parse_arguments()
+    if configuration['imports']:
+        print_import_times()
+        exit()
+
+    report = run(configuration)
+    print_report(report)
+
+    if configuration['output']:
+        with open(configuration['output'], 'w') as file:
+            json.dump(report, file, indent=2)
@@ -0,0 +1,247 @@
+"""Exact decomposition of small pairs with edge and vertex sets as int bitmasks
+
+Single edges (of only one of X and Y) are bits of the Z and W masks of
+decided edges. Every slot (a vertex of undirected cycles, the out- or
+in-side of a vertex of directed ones) needs a number of its single edges in
+Z and the rest in W; a slot with enough of one colour gives the rest to
+the other one. The search colours the first free edge and propagates until
+nothing is forced; a colour whose edges close a cycle shorter than n is cut
+off. Graph construction is a few list comprehensions, so the method is the
+fastest one on small packs and serves as an oracle for the other methods.
+"""
+
+from collections import Counter
+from typing import Optional
+
+import exceptions
+import utils
+
+max_vertices = 64
+
+
+class Instance:
+    """Masks of the union of X and Y over vertices 0..n-1"""
+
+    def __init__(self, graph_x: list, graph_y: list, directed: bool) -> None:
+        if len(graph_x) > max_vertices:
+            raise exceptions.InputError(
+                'The bitmask method is for at most {} vertices'.format(max_vertices)
+            )
+
+        index = {vertex: idx for idx, vertex in enumerate(graph_x)}
+        n = len(graph_x)
+
+        def edges(graph: list) -> list:
+            return [
+                (
+                    (index[graph[idx - 1]], index[graph[idx]])
+                    if directed
+                    else tuple(sorted((index[graph[idx - 1]], index[graph[idx]])))
+                )
+                for idx in range(n)
+            ]
+
+        x_edges, y_edges = edges(graph_x), edges(graph_y)
+        self.n = n
+        self.doubled = set(x_edges) & set(y_edges)
+        self.single = [edge for edge in x_edges + y_edges if edge not in self.doubled]
+        self.all = (1 << len(self.single)) - 1
+        self.x_mask = (1 << (len(self.single) // 2)) - 1
+
+        # slots: (single edges of the slot, how many of them are in Z)
+        ends, out_slots, in_slots = [0] * n, [0] * n, [0] * n
+        for bit, (u, v) in enumerate(self.single):
+            ends[u] |= 1 << bit
+            ends[v] |= 1 << bit
+            out_slots[u] |= 1 << bit
+            in_slots[v] |= 1 << bit
+        masks = out_slots + in_slots if directed else ends
+        self.slots = [
+            (mask, bin(mask).count('1') // 2) for mask in masks if mask & (mask - 1)
+        ]
+
+        # adjacent[v]: neighbours of v by doubled edges (in Z and W)
+        self.adjacent = [0] * n
+        for u, v in self.doubled:
+            self.adjacent[u] |= 1 << v
+            self.adjacent[v] |= 1 << u
+
+    def short_cycle(self, colored: int) -> bool:
+        """Checks whether the doubled edges and the coloured single edges
+        contain a cycle shorter than n (every degree is at most 2)
+        """
+
+        adjacent = self.adjacent[:]
+        edges = list(self.doubled)
+        for bit in bits(colored):
+            u, v = self.single[bit]
+            adjacent[u] |= 1 << v
+            adjacent[v] |= 1 << u
+            edges.append((u, v))
+
+        vertices = 0
+        for u, v in edges:
+            vertices |= 1 << u | 1 << v
+        while vertices:
+            component, grown = vertices & -vertices, 0
+            while grown != component:
+                grown = component
+                for vertex in bits(grown):
+                    component |= adjacent[vertex]
+            vertices &= ~component
+            # a path has fewer edges than vertices, a cycle as many
+            size = bin(component).count('1')
+            if size < self.n and size == sum(1 for u, _ in edges if component >> u & 1):
+                return True
+        return False
+
+    def propagate(self, z: int, w: int) -> Optional[tuple[int, int]]:
+        """Colours the edges forced by the slots
+
+        Returns:
+            tuple: Z and W masks, None on a conflict
+        """
+
+        changed = True
+        while changed:
+            changed = False
+            for mask, need in self.slots:
+                in_z = bin(mask & z).count('1')
+                in_w = bin(mask & w).count('1')
+                if in_z > need or in_w > need:
+                    return None
+                free = mask & ~(z | w)
+                if free and in_z == need:
+                    w |= free
+                    changed = True
+                elif free and in_w == need:
+                    z |= free
+                    changed = True
+        return z, w
+
+
+def bits(mask: int) -> list:
+    """Gets the numbers of the set bits"""
+
+    numbers = []
+    while mask:
+        low = mask & -mask
+        numbers.append(low.bit_length() - 1)
+        mask ^= low
+    return numbers
+
+
+@utils.timeout('Bitmask search')
+def search(
+    instance: Instance,
+    z: int,
+    w: int,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    **kwargs: Optional[tuple],
+) -> Optional[int]:
+    """Colours the first free edge both ways
+
+    Returns:
+        int: Z mask of the decomposition different from X and Y, None if
+            there is none
+    """
+
+    if counters is not None:
+        utils.count_node(counters, depth)
+
+    free = instance.all & ~(z | w)
+    if not free:
+        if counters is not None:
+            counters['leaves'] += 1
+        # Z has no single X edges (it is Y) or all of them (it is X)
+        return z if 0 < z & instance.x_mask < instance.x_mask else None
+
+    low = free & -free
+    for new_z, new_w in ((z | low, w), (z, w | low)):
+        masks = instance.propagate(new_z, new_w)
+        if masks is None or any(map(instance.short_cycle, masks)):
+            if counters is not None:
+                counters['cycle_prunes'] += 1
+            continue
+
+        found: Optional[int] = search(
+            instance, *masks, counters=counters, depth=depth + 1, **kwargs
+        )
+        if found is not None:
+            return found
+        if counters is not None:
+            counters['backtracks'] += 1
+
+    return None
+
+
+def decomposition(
+    graph_x: list,
+    graph_y: list,
+    directed: bool,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    instance = Instance(graph_x, graph_y, directed)
+    if not instance.single:
+        return False
+
+    # Z and W are interchangeable, the first single edge is in Z
+    masks = instance.propagate(1, 0)
+    if masks is None or any(map(instance.short_cycle, masks)):
+        return False
+    z = search(
+        instance,
+        *masks,
+        counters=counters,
+        timeout=timeout,
+        global_timeout=global_timeout,
+    )
+    if z is None:
+        return False
+
+    if solution is not None:
+        names = {
+            (u, v): (
+                (graph_x[u], graph_x[v])
+                if directed
+                else tuple(sorted((graph_x[u], graph_x[v])))
+            )
+            for u, v in instance.single + list(instance.doubled)
+        }
+        doubled = {names[edge] for edge in instance.doubled}
+        solution['z'] = doubled | {names[instance.single[bit]] for bit in bits(z)}
+        solution['w'] = doubled | {
+            names[instance.single[bit]] for bit in bits(instance.all & ~z)
+        }
+
+    return True
+
+
+def directed_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, True, timeout, global_timeout, counters, solution
+    )
+
+
+def undirected_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, False, timeout, global_timeout, counters, solution
+    )
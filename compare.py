@@ -0,0 +1,240 @@
+import json
+import sys
+from argparse import ArgumentParser
+
+import numpy
+from prettytable import PrettyTable
+
+
+def parse_arguments() -> dict:
+    parser = ArgumentParser()
+    parser.add_argument("baseline", help="Path to the baseline benchmark results")
+    parser.add_argument("current", help="Path to the current benchmark results")
+    parser.add_argument(
+        "--threshold",
+        dest="threshold",
+        help="Allowed slowdown of the median time (0.1 means 10%%)",
+        default=0.1,
+    )
+    parser.add_argument(
+        "--confidence",
+        dest="confidence",
+        help="Confidence level of the bootstrapped intervals",
+        default=0.95,
+    )
+    parser.add_argument(
+        "--resamples",
+        dest="resamples",
+        help="Number of bootstrap resamples",
+        default=2000,
+    )
+    parser.add_argument(
+        "--seed", dest="seed", help="Seed of the bootstrap resampling", default=0
+    )
+
+    args = parser.parse_args()
+
+    return {
+        'baseline': args.baseline,
+        'current': args.current,
+        'threshold': float(args.threshold),
+        'confidence': float(args.confidence),
+        'resamples': int(args.resamples),
+        'seed': int(args.seed),
+    }
+
+
+def load_results(path: str) -> dict:
+    """Gets per-pair timings from the file written by benchmark.py
+
+    Runs of a method with a branching policy are a method of their own,
+    '<method>:<policy>'.
+
+    Returns:
+        dict: {(method, n): {pair id: record}}
+    """
+
+    with open(path) as file:
+        report = json.load(file)
+
+    groups: dict = {}
+    for record in report['results']:
+        method = record['method']
+        if record.get('policy'):
+            method = str(method) + ':' + record['policy']
+        groups.setdefault((method, record['n']), {})[record['id']] = record
+
+    return groups
+
+
+def group_order(key: tuple) -> tuple:
+    """Orders groups by the method number (the default policy first) and n"""
+
+    number, _, policy = str(key[0]).partition(':')
+    return int(number), policy, key[1]
+
+
+def bootstrap_ratio(
+    baseline: numpy.ndarray,
+    current: numpy.ndarray,
+    resamples: int,
+    confidence: float,
+    rng: numpy.random.Generator,
+) -> tuple[float, float]:
+    """Bootstrapped confidence interval of the ratio of medians of paired times"""
+
+    indices = rng.integers(0, len(baseline), size=(resamples, len(baseline)))
+    ratios = numpy.median(current[indices], axis=1) / numpy.maximum(
+        numpy.median(baseline[indices], axis=1), 1e-12
+    )
+    low, high = numpy.quantile(ratios, [(1 - confidence) / 2, (1 + confidence) / 2])
+    return float(low), float(high)
+
+
+def compare(baseline: dict, current: dict, configuration: dict) -> list:
+    """Compares paired per-pair timings of every method and number of vertices
+
+    A group is a regression when the whole confidence interval of the ratio
+    of medians lies above 1 + threshold, so noisy groups do not fail. Pairs
+    of the baseline missing from the current run (a method that no longer
+    reaches an n loses the whole group) are listed in 'missing'.
+    """
+
+    rng = numpy.random.default_rng(configuration['seed'])
+    rows = []
+
+    for key in sorted(baseline, key=group_order):
+        ids = sorted(set(baseline[key]) & set(current.get(key, {})))
+        missing = sorted(set(baseline[key]) - set(current.get(key, {})))
+        if not ids:
+            rows.append(
+                {
+                    'method': key[0],
+                    'n': key[1],
+                    'pairs': 0,
+                    'missing': missing,
+                    'new_timeouts': 0,
+                    'mismatches': [],
+                    'regression': False,
+                }
+            )
+            continue
+
+        baseline_times = numpy.array([baseline[key][idx]['time'] for idx in ids])
+        current_times = numpy.array([current[key][idx]['time'] for idx in ids])
+        low, high = bootstrap_ratio(
+            baseline_times,
+            current_times,
+            configuration['resamples'],
+            configuration['confidence'],
+            rng,
+        )
+        ratios = current_times / numpy.maximum(baseline_times, 1e-12)
+        worst = int(numpy.argmax(ratios))
+
+        rows.append(
+            {
+                'method': key[0],
+                'n': key[1],
+                'pairs': len(ids),
+                'missing': missing,
+                'baseline_median': float(numpy.median(baseline_times)),
+                'current_median': float(numpy.median(current_times)),
+                'ratio': float(
+                    numpy.median(current_times)
+                    / max(numpy.median(baseline_times), 1e-12)
+                ),
+                'low': low,
+                'high': high,
+                'worst_pair': ids[worst],
+                'worst_ratio': float(ratios[worst]),
+                'new_timeouts': sum(
+                    current[key][idx]['timeout'] and not baseline[key][idx]['timeout']
+                    for idx in ids
+                ),
+                'mismatches': [
+                    idx
+                    for idx in ids
+                    if not current[key][idx]['timeout']
+                    and not baseline[key][idx]['timeout']
+                    and current[key][idx]['result'] != baseline[key][idx]['result']
+                ],
+                'regression': low > 1 + configuration['threshold'],
+            }
+        )
+
+    return rows
+
+
+def status(row: dict) -> str:
+    """Gets the status of a row, anything but 'OK' fails the comparison"""
+
+    if row['missing']:
+        return 'MISSING'
+    if row['mismatches']:
+        return 'RESULT MISMATCH'
+    if row['new_timeouts']:
+        return 'NEW TIMEOUTS'
+    if row['regression']:
+        return 'SLOWER'
+    return 'OK'
+
+
+def print_report(rows: list) -> None:
+    table = PrettyTable(
+        [
+            'Vertex number',
+            'Method',
+            'Pairs',
+            'Missing',
+            'Baseline median (s)',
+            'Current median (s)',
+            'Ratio',
+            'CI',
+            'Worst pair',
+            'New timeouts',
+            'Status',
+        ]
+    )
+    for row in rows:
+        if not row['pairs']:
+            # the group isn't in the current run
+            table.add_row(
+                [row['n'], row['method'], 0, len(row['missing'])]
+                + ['-'] * 5
+                + [row['new_timeouts'], status(row)]
+            )
+            continue
+        table.add_row(
+            [
+                row['n'],
+                row['method'],
+                row['pairs'],
+                len(row['missing']),
+                round(row['baseline_median'], 4),
+                round(row['current_median'], 4),
+                round(row['ratio'], 3),
+                '['
+                + str(round(row['low'], 3))
+                + ', '
+                + str(round(row['high'], 3))
+                + ']',
+                row['worst_pair'] + ' (x' + str(round(row['worst_ratio'], 2)) + ')',
+                row['new_timeouts'],
+                status(row),
+            ]
+        )
+    print(table)
+
+
+if __name__ == '__main__':
+    configuration = parse_arguments()
+    rows = compare(
+        load_results(configuration['baseline']),
+        load_results(configuration['current']),
+        configuration,
+    )
+    print_report(rows)
+
+    if any(status(row) != 'OK' for row in rows):
+        sys.exit(1)
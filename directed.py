@@ -1,19 +1,40 @@
 import itertools
+from collections import Counter
+from collections.abc import Iterable
 from typing import Optional
 
 import networkx as nx
 
+import policies
 import utils
 
 
+def build_multigraph(x_edges: Iterable, y_edges: Iterable) -> nx.MultiDiGraph:
+    """Builds the union multigraph of X and Y edges"""
+
+    multigraph = nx.MultiDiGraph()
+    multigraph.add_edges_from(x_edges)
+    multigraph.add_edges_from(y_edges)
+    return multigraph
+
+
 def step_back(
-    multigraph: nx.MultiDiGraph, u: int, v: int, key: int, w_edges: list
+    multigraph: nx.MultiDiGraph,
+    u: int,
+    v: int,
+    key: int,
+    w_edges: list,
+    added: Optional[int] = None,
+    closing: bool = False,
 ) -> None:
-    """Reverts changes have been done on current step"""
+    """Reverts changes have been done on current step (the edge u->v has
+    added the vertex `added`, v by default, to the Z path or has closed it)
+    """
 
+    added = v if added is None else added
     del multigraph.edges[u, v, key]['fixed_z']
-    if 'started_node' not in multigraph.nodes[v]:
-        del multigraph.nodes[v]['included_in_z']
+    if not closing and 'started_node' not in multigraph.nodes[added]:
+        del multigraph.nodes[added]['included_in_z']
     multigraph.graph['length_z'] -= 1
 
     for u_w, v_w, key_w in w_edges:
@@ -23,6 +44,73 @@ def step_back(
             multigraph.graph['w'].remove((u_w, v_w))
 
 
+def get_path_end(
+    multigraph: nx.MultiDiGraph, head: int, tail: int, length: int
+) -> tuple[int, bool]:
+    """Chooses the end of the Z path with fewer viable continuations
+    (non-fixed edges to vertices out of the path unless the edge closes it)
+
+    Returns:
+        tuple: the end and True if it is the head (the path grows by out-edges)
+    """
+
+    def viable(edges: Iterable, forward: bool) -> int:
+        return sum(
+            1
+            for edge in filter(utils.is_non_fixed_edge, edges)
+            if 'included_in_z' not in multigraph.nodes[edge[1] if forward else edge[0]]
+            or multigraph.graph['length_z'] + 1 == length
+        )
+
+    if viable(multigraph.in_edges(tail, data=True, keys=True), False) < viable(
+        multigraph.edges(head, data=True, keys=True), True
+    ):
+        return tail, False
+    return head, True
+
+
+def is_feasible(multigraph: nx.MultiDiGraph, vertices: Iterable, length: int) -> bool:
+    """Checks the Z and W capacity of the vertices: a vertex takes one Z and
+    one W out-arc and in-arc, a free arc can still be in Z only if its other
+    end has room for a Z arc (it is out of the Z path or is the tail of the
+    path for an out-arc and the head for an in-arc, the ends of the path are
+    joined by the last arc only), otherwise it goes to W
+    """
+
+    closing = multigraph.graph['length_z'] + 1 == length
+    for vertex in vertices:
+        in_path = 'included_in_z' in multigraph.nodes[vertex]
+        for forward in (True, False):
+            z, w, options = 0, 0, 0
+            for u, v, attrs in (
+                multigraph.edges(vertex, data=True)
+                if forward
+                else multigraph.in_edges(vertex, data=True)
+            ):
+                other = v if forward else u
+                if 'fixed_z' in attrs:
+                    z += 1
+                elif 'fixed_w' in attrs:
+                    w += 1
+                elif 'included_in_z' not in multigraph.nodes[other] or (
+                    (not in_path or closing)
+                    and not any(
+                        'fixed_z' in value
+                        for *_, value in (
+                            multigraph.in_edges(other, data=True)
+                            if forward
+                            else multigraph.edges(other, data=True)
+                        )
+                    )
+                ):
+                    options += 1
+                else:
+                    w += 1
+            if z > 1 or w > 1 or options < 1 - z:
+                return False
+    return True
+
+
 @utils.timeout('Simple path for directed cycles')
 def backtracking_1(
     multigraph: nx.MultiDiGraph,
@@ -31,24 +119,48 @@ def backtracking_1(
     vertex: int,
     timeout: Optional[tuple],
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    tail: Optional[int] = None,
 ) -> bool:
+    """Grows the Z path from its head `vertex` (and from its tail if set,
+    by the end with fewer viable continuations)
+    """
+
+    if counters is not None:
+        utils.count_node(counters, depth)
+
+    end, forward = (
+        (vertex, True)
+        if tail is None
+        else get_path_end(multigraph, vertex, tail, len(x_edges))
+    )
     for u, v, key, attrs in filter(
-        utils.is_non_fixed_edge, multigraph.edges(vertex, data=True, keys=True)
+        utils.is_non_fixed_edge,
+        (
+            multigraph.edges(end, data=True, keys=True)
+            if forward
+            else multigraph.in_edges(end, data=True, keys=True)
+        ),
     ):
+        added = v if forward else u
         # checking for cycle in z
-        if 'included_in_z' in multigraph.nodes[v] and multigraph.graph[
+        if 'included_in_z' in multigraph.nodes[added] and multigraph.graph[
             'length_z'
         ] + 1 != len(x_edges):
+            if counters is not None:
+                counters['included_prunes'] += 1
             continue
 
+        closing = 'included_in_z' in multigraph.nodes[added]
         multigraph.edges[u, v, key]['fixed_z'] = True
-        multigraph.nodes[v]['included_in_z'] = True
+        multigraph.nodes[added]['included_in_z'] = True
         multigraph.graph['length_z'] += 1
 
         added_to_w = []
         for source in (
-            multigraph.edges(vertex, data=True, keys=True),
-            multigraph.in_edges(vertex, data=True, keys=True),
+            multigraph.edges(end, data=True, keys=True),
+            multigraph.in_edges(end, data=True, keys=True),
         ):
             for u_w, v_w, key_w, _ in filter(utils.is_non_fixed_edge, source):
                 multigraph.edges[u_w, v_w, key_w]['fixed_w'] = True
@@ -56,6 +168,17 @@ def backtracking_1(
                 multigraph.graph['length_w'] += 1
                 multigraph.graph['w'].add((u_w, v_w))
 
+        # forward checking of the vertices whose arcs have been fixed
+        if not is_feasible(
+            multigraph,
+            {added} | {v_w if u_w == end else u_w for u_w, v_w, _ in added_to_w},
+            len(x_edges),
+        ):
+            if counters is not None:
+                counters['capacity_prunes'] += 1
+            step_back(multigraph, u, v, key, added_to_w, added, closing)
+            continue
+
         if (
             added_to_w
             and utils.has_cycle(multigraph.graph['w'])
@@ -64,12 +187,16 @@ def backtracking_1(
                 or not utils.is_hamiltonian_cycle(multigraph.graph['w'])
             )
         ):
-            step_back(multigraph, u, v, key, added_to_w)
+            if counters is not None:
+                counters['cycle_prunes'] += 1
+            step_back(multigraph, u, v, key, added_to_w, added, closing)
             continue
 
         if multigraph.graph['length_z'] == len(x_edges) and multigraph.graph[
             'length_w'
         ] == len(x_edges):
+            if counters is not None:
+                counters['leaves'] += 1
             z_edges = {
                 item[:2] for item in nx.get_edge_attributes(multigraph, 'fixed_z')
             }
@@ -83,20 +210,25 @@ def backtracking_1(
             ):
                 return True
 
-            step_back(multigraph, u, v, key, added_to_w)
+            step_back(multigraph, u, v, key, added_to_w, added, closing)
             continue
 
         if backtracking_1(
             multigraph,
             x_edges,
             y_edges,
-            v,
+            v if forward else vertex,
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            depth=depth + 1,
+            tail=tail if tail is None or forward else u,
         ):
             return True
 
-        step_back(multigraph, u, v, key, added_to_w)
+        if counters is not None:
+            counters['backtracks'] += 1
+        step_back(multigraph, u, v, key, added_to_w, added, closing)
 
     return False
 
@@ -106,13 +238,14 @@ def simple_path(
     graph_y: list,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+    bidirectional: bool = False,
 ) -> bool:
     x_edges = {(graph_x[idx - 1], graph_x[idx]) for idx in range(len(graph_x))}
     y_edges = {(graph_y[idx - 1], graph_y[idx]) for idx in range(len(graph_y))}
 
-    multigraph = nx.MultiDiGraph()
-    multigraph.add_edges_from(x_edges)
-    multigraph.add_edges_from(y_edges)
+    multigraph = build_multigraph(x_edges, y_edges)
 
     start_node = 1
     for in_edge, out_edge in itertools.product(
@@ -153,7 +286,11 @@ def simple_path(
             out_edge[1],
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            tail=in_edge[0] if bidirectional else None,
         ):
+            if solution is not None:
+                solution['z'], solution['w'] = utils.get_decomposition(multigraph)
             return True
 
         for u, v in [in_edge, out_edge]:
@@ -173,7 +310,16 @@ def simple_path(
     return False
 
 
-def get_next_edges(multigraph: nx.MultiDiGraph) -> list:
+def get_next_edges(
+    multigraph: nx.MultiDiGraph, policy: Optional[policies.Policy] = None
+) -> list:
+    """Gets the out-arcs of the vertex chosen by the policy (the first one
+    with free out-arcs by default), one of them is fixed in Z next
+    """
+
+    if policy is not None:
+        return policy.branches(multigraph)
+
     for node in multigraph.nodes:
         if all(
             'fixed_z' not in value and 'fixed_w' not in value
@@ -193,17 +339,32 @@ def backtracking_2(
     edge: tuple,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    discrepancies: Optional[int] = None,
+    mode: Optional[str] = None,
+    policy: Optional[policies.Policy] = None,
 ) -> bool:
     fixed_in_z: set = set()
     fixed_in_w: set = set()
 
+    if counters is not None:
+        utils.count_node(counters, depth)
+
     utils.fix_edge(
-        multigraph, edge, in_z=True, fixed_in_z=fixed_in_z, fixed_in_w=fixed_in_w
+        multigraph,
+        edge,
+        in_z=True,
+        fixed_in_z=fixed_in_z,
+        fixed_in_w=fixed_in_w,
+        counters=counters,
     )
 
     z = nx.get_edge_attributes(multigraph, 'fixed_z')
     w = nx.get_edge_attributes(multigraph, 'fixed_w')
     if len(z) == len(x_edges) and len(w) == len(x_edges):
+        if counters is not None:
+            counters['leaves'] += 1
         z_edges = {item[:2] for item in z}
         w_edges = {item[:2] for item in w}
         if (
@@ -223,23 +384,39 @@ def backtracking_2(
         return False
 
     if utils.has_cycle(z) or utils.has_cycle(w):
+        if counters is not None:
+            counters['cycle_prunes'] += 1
         for u, v in fixed_in_z:
             del multigraph.edges[u, v, 0]['fixed_z']
         for u, v in fixed_in_w:
             del multigraph.edges[u, v, 0]['fixed_w']
         return False
 
-    for next_edge in get_next_edges(multigraph):
-        if backtracking_2(
+    if policy is not None:
+        policy.fix(fixed_in_z, fixed_in_w)
+    for index, next_edge in enumerate(get_next_edges(multigraph, policy)):
+        allowed, left = utils.discrepancy_branch(
+            multigraph, index, depth + 1, discrepancies, mode
+        )
+        if allowed and backtracking_2(
             multigraph,
             x_edges,
             y_edges,
             next_edge,
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            depth=depth + 1,
+            discrepancies=left,
+            mode=mode,
+            policy=policy,
         ):
             return True
 
+    if counters is not None:
+        counters['backtracks'] += 1
+    if policy is not None:
+        policy.unfix(fixed_in_z, fixed_in_w)
     for u, v in fixed_in_z:
         del multigraph.edges[u, v, 0]['fixed_z']
     for u, v in fixed_in_w:
@@ -253,24 +430,41 @@ def chain_edge_fixing(
     graph_y: list,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+    mode: Optional[str] = None,
+    policy: Optional[str] = None,
 ) -> bool:
     x_edges = {(graph_x[idx - 1], graph_x[idx]) for idx in range(len(graph_x))}
     y_edges = {(graph_y[idx - 1], graph_y[idx]) for idx in range(len(graph_y))}
 
-    multigraph = nx.MultiDiGraph()
-    multigraph.add_edges_from(x_edges)
-    multigraph.add_edges_from(y_edges)
+    multigraph = build_multigraph(x_edges, y_edges)
 
     utils.fix_multiedges(multigraph)
-
-    for next_edge in get_next_edges(multigraph):
-        if backtracking_2(
-            multigraph,
-            x_edges,
-            y_edges,
-            next_edge,
-            timeout=timeout,
-            global_timeout=global_timeout,
-        ):
-            return True
+    branching = policies.get_policy(policy, multigraph) if policy else None
+
+    # discrepancy search is repeated with a growing limit until no branch is cut
+    for discrepancies in itertools.count() if mode else [None]:
+        multigraph.graph['discrepancy_cut'] = False
+        for index, next_edge in enumerate(get_next_edges(multigraph, branching)):
+            allowed, left = utils.discrepancy_branch(
+                multigraph, index, 0, discrepancies, mode
+            )
+            if allowed and backtracking_2(
+                multigraph,
+                x_edges,
+                y_edges,
+                next_edge,
+                timeout=timeout,
+                global_timeout=global_timeout,
+                counters=counters,
+                discrepancies=left,
+                mode=mode,
+                policy=branching,
+            ):
+                if solution is not None:
+                    solution['z'], solution['w'] = utils.get_decomposition(multigraph)
+                return True
+        if not multigraph.graph['discrepancy_cut']:
+            break
     return False
@@ -25,6 +25,13 @@ class EqualInputGraphs(Exception):
         )
 
 
+class SolverError(Exception):
+    """The search failed on a valid input or its worker process died"""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
 class TimeoutExceeded(Exception):
     def __init__(self, message: str) -> None:
         self.message = message
@@ -0,0 +1,330 @@
+"""Frontier-based dynamic programming over the union of X and Y
+
+Edges of the union are swept in the order of X. A state keeps, for every
+vertex of the frontier (seen, but with some incident edges not swept yet),
+its degree in Z and in W and the other end (mate) of the Z and W paths it
+ends; equal states are merged and their numbers of colourings are added up.
+An edge of both X and Y is a single item giving one copy to each of Z and W.
+
+A colouring of the edges into two Hamiltonian cycles is counted once for
+{Z, W}: the first edge of only one graph always goes to Z. X and Y are one
+of the colourings, so a decomposition exists if there are at least two.
+"""
+
+from collections import Counter
+from typing import Optional
+
+import utils
+
+# offsets of degree and mate fields of the colour in a frontier slot
+Z, W = 0, 2
+SLOT = 4
+HEADER = 2
+
+
+def sweep_items(graph_x: list, graph_y: list, directed: bool) -> list:
+    """Gets edges of the union in the order they are swept
+
+    Returns:
+        list: (u, v, doubled) sorted by the later endpoint in X
+    """
+
+    position = {vertex: idx for idx, vertex in enumerate(graph_x)}
+
+    def key(edge: tuple) -> tuple:
+        return edge if directed else tuple(sorted(edge, key=position.__getitem__))
+
+    x_edges = {key((graph_x[idx - 1], graph_x[idx])) for idx in range(len(graph_x))}
+    y_edges = {key((graph_y[idx - 1], graph_y[idx])) for idx in range(len(graph_y))}
+
+    return sorted(
+        ((u, v, (u, v) in x_edges and (u, v) in y_edges) for u, v in x_edges | y_edges),
+        key=lambda item: (
+            max(position[item[0]], position[item[1]]),
+            min(position[item[0]], position[item[1]]),
+        ),
+    )
+
+
+def add_edge(
+    state: list,
+    color: int,
+    su: int,
+    sv: int,
+    v: int,
+    index: dict,
+    full: int,
+    directed: bool,
+    all_entered: bool,
+) -> bool:
+    """Adds the edge u-v (u->v if directed) of the colour to the state,
+    u and v are in the slots su and sv of the frontier, index maps
+    frontier vertices to their slots
+
+    The degree field is the degree for undirected cycles and the bits
+    1 (has out-edge) and 2 (has in-edge) for directed ones; a path end
+    keeps the other end of its path as the mate, an isolated vertex keeps
+    itself and an inner vertex keeps None.
+
+    Returns:
+        bool: False if the edge can't be added
+    """
+
+    closed = color // 2
+    if state[closed]:
+        return False
+
+    du, dv = HEADER + SLOT * su + color, HEADER + SLOT * sv + color
+    if directed:
+        if state[du] & 1 or state[dv] & 2:
+            return False
+    elif state[du] == full or state[dv] == full:
+        return False
+
+    a, b = state[du + 1], state[dv + 1]
+    if a == v:
+        # the edge closes a cycle: it must be the Hamiltonian one
+        if not all_entered:
+            return False
+        for slot in range(len(index)):
+            if (
+                slot != su
+                and slot != sv
+                and state[HEADER + SLOT * slot + color] != full
+            ):
+                return False
+        state[closed] = True
+        state[du] = state[dv] = full
+        state[du + 1] = state[dv + 1] = None
+        return True
+
+    state[HEADER + SLOT * index[a] + color + 1] = b
+    state[HEADER + SLOT * index[b] + color + 1] = a
+    if directed:
+        state[du] |= 1
+        state[dv] |= 2
+    else:
+        state[du] += 1
+        state[dv] += 1
+    for field in (du, dv):
+        if state[field] == full:
+            state[field + 1] = None
+    return True
+
+
+@utils.timeout('Frontier dynamic programming')
+def sweep(
+    states: dict,
+    witnesses: Optional[dict],
+    item: tuple,
+    number: int,
+    frontier: list,
+    entered: set,
+    leaving: list,
+    n: int,
+    directed: bool,
+    first: bool,
+    counters: Optional[Counter] = None,
+    **kwargs: Optional[tuple],
+) -> dict:
+    """Sweeps one edge: extends, colours and shrinks every state
+
+    Returns:
+        dict: new states and their numbers of colourings
+    """
+
+    u, v, doubled = item
+    full = 3 if directed else 2
+
+    new_vertices = [vertex for vertex in dict.fromkeys((u, v)) if vertex not in entered]
+    for vertex in new_vertices:
+        entered.add(vertex)
+        frontier.append(vertex)
+    extension = tuple(
+        field for vertex in new_vertices for field in (0, vertex, 0, vertex)
+    )
+    index = {vertex: slot for slot, vertex in enumerate(frontier)}
+    su, sv = index[u], index[v]
+    left = sorted((index[vertex] for vertex in leaving), reverse=True)
+    all_entered = len(entered) == n
+
+    if doubled:
+        colorings: list = [(Z, W)]
+    elif first:
+        colorings = [(Z,)]
+    else:
+        colorings = [(Z,), (W,)]
+
+    new_states: dict = {}
+    new_witnesses: dict = {}
+    for state, count in states.items():
+        for coloring in colorings:
+            new_state = list(state + extension)
+            if not all(
+                add_edge(
+                    new_state, color, su, sv, v, index, full, directed, all_entered
+                )
+                for color in coloring
+            ):
+                continue
+
+            valid = True
+            for slot in left:
+                offset = HEADER + SLOT * slot
+                if new_state[offset + Z] != full or new_state[offset + W] != full:
+                    valid = False
+                    break
+                del new_state[offset : offset + SLOT]
+            if not valid:
+                continue
+
+            key = tuple(new_state)
+            new_states[key] = new_states.get(key, 0) + count
+            if witnesses is not None:
+                # two witnesses are enough to find one different from X and Y
+                kept = new_witnesses.setdefault(key, [])
+                for witness in witnesses[state][: 2 - len(kept)]:
+                    kept.append((number, coloring[0], witness))
+
+    for vertex in leaving:
+        frontier.remove(vertex)
+    if witnesses is not None:
+        witnesses.clear()
+        witnesses.update(new_witnesses)
+    if counters is not None:
+        counters['nodes'] += len(new_states)
+        counters['max_depth'] = max(counters['max_depth'], len(frontier))
+    return new_states
+
+
+def count_decompositions(
+    graph_x: list,
+    graph_y: list,
+    directed: bool,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> int:
+    """Counts colourings of the union into two Hamiltonian cycles {Z, W}
+    (X and Y included)
+
+    Args:
+        graph_x: x graph
+        graph_y: y graph
+        directed: whether cycles are directed
+        timeout: start time and single test time limit (in minutes)
+        global_timeout: start time and all tests time limit (in minutes)
+        counters: search counters (states and the widest frontier)
+        solution: dict to put edges of Z and W different from X and Y to
+
+    Returns:
+        int: number of colourings
+    """
+
+    items = sweep_items(graph_x, graph_y, directed)
+    last: dict = {}
+    for number, (u, v, _) in enumerate(items):
+        last[u] = last[v] = number
+
+    states: dict = {(False, False): 1}
+    witnesses: Optional[dict] = (
+        {(False, False): [None]} if solution is not None else None
+    )
+    frontier: list = []
+    entered: set = set()
+    first = True
+
+    for number, item in enumerate(items):
+        states = sweep(
+            states,
+            witnesses,
+            item,
+            number,
+            frontier,
+            entered,
+            [vertex for vertex in dict.fromkeys(item[:2]) if last[vertex] == number],
+            len(graph_x),
+            directed,
+            first and not item[2],
+            counters=counters,
+            timeout=timeout,
+            global_timeout=global_timeout,
+        )
+        first = first and item[2]
+        if not states:
+            return 0
+
+    # every vertex has left the frontier, Z and W are closed
+    count: int = sum(states.values())
+    if solution is not None and witnesses is not None and count > 1:
+        put_solution(solution, items, graph_x, graph_y, directed, witnesses)
+    return count
+
+
+def put_solution(
+    solution: dict,
+    items: list,
+    graph_x: list,
+    graph_y: list,
+    directed: bool,
+    witnesses: dict,
+) -> None:
+    """Puts edges of Z and W of a witness colouring different from X and Y"""
+
+    def edge(u: int, v: int) -> tuple:
+        return (u, v) if directed else tuple(sorted((u, v)))
+
+    excluded = [
+        {edge(graph[idx - 1], graph[idx]) for idx in range(len(graph))}
+        for graph in (graph_x, graph_y)
+    ]
+
+    for witness in next(iter(witnesses.values())):
+        colors = {}
+        while witness is not None:
+            number, color, witness = witness
+            colors[number] = color
+
+        z_edges, w_edges = set(), set()
+        for number, (u, v, doubled) in enumerate(items):
+            if doubled or colors[number] == Z:
+                z_edges.add(edge(u, v))
+            if doubled or colors[number] == W:
+                w_edges.add(edge(u, v))
+
+        if z_edges not in excluded:
+            solution['z'], solution['w'] = z_edges, w_edges
+            return
+
+
+def directed_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return (
+        count_decompositions(
+            graph_x, graph_y, True, timeout, global_timeout, counters, solution
+        )
+        > 1
+    )
+
+
+def undirected_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return (
+        count_decompositions(
+            graph_x, graph_y, False, timeout, global_timeout, counters, solution
+        )
+        > 1
+    )
@@ -0,0 +1,382 @@
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterable, Iterator
+from typing import Optional
+
+import numpy
+
+import exceptions
+
+
+def generate_pyramidal_cycles(
+    number_of_vertices: int, number: int, seed: Optional[int] = None
+) -> numpy.ndarray:
+    """Generates a batch of pyramidal cycles at once
+
+    Every cycle is an ascending random subset of 1..n-1, then n, then
+    the complement in descending order (the same distribution as
+    `utils.get_pyramidal_cycles`).
+
+    Args:
+        number_of_vertices: how many vertices in cycle
+        number: count of cycles
+        seed: seed of the random generator
+
+    Returns:
+        numpy.ndarray: cycles, one per row
+    """
+
+    rng = numpy.random.default_rng(seed)
+    return _pyramidal_batch(rng, number_of_vertices, number)
+
+
+def _pyramidal_batch(
+    rng: numpy.random.Generator, number_of_vertices: int, number: int
+) -> numpy.ndarray:
+    n = number_of_vertices
+    values = numpy.arange(1, n + 1, dtype=numpy.int64)
+
+    # a vertex goes to the ascending part if its random key is less than the
+    # key of n, exactly as if n's position in a shuffled list splits it
+    keys = rng.random((number, n))
+    ascending = keys[:, :-1] < keys[:, -1:]
+
+    order_keys = numpy.empty((number, n), dtype=numpy.int64)
+    order_keys[:, :-1] = numpy.where(ascending, values[:-1], 2 * n - values[:-1])
+    order_keys[:, -1] = n
+
+    return numpy.argsort(order_keys, axis=1) + 1
+
+
+def iter_pyramidal_pairs(
+    number_of_vertices: int,
+    number: int,
+    seed: Optional[int] = None,
+    batch_size: int = 1024,
+) -> Iterator[tuple[numpy.ndarray, numpy.ndarray]]:
+    """Yields pairs of pyramidal cycles generated batch by batch
+
+    Args:
+        number_of_vertices: how many vertices in cycle
+        number: count of pairs
+        seed: seed of the random generator
+        batch_size: how many pairs to generate at once
+
+    Returns:
+        Iterator: 2-tuple x, y cycles
+    """
+
+    rng = numpy.random.default_rng(seed)
+    # keep a batch within a few million elements whatever the number of vertices
+    batch_size = max(1, min(batch_size, (2**21) // max(number_of_vertices, 1)))
+
+    left = number
+    while left > 0:
+        size = min(batch_size, left)
+        cycles = _pyramidal_batch(rng, number_of_vertices, 2 * size)
+        for idx in range(size):
+            yield cycles[2 * idx], cycles[2 * idx + 1]
+        left -= size
+
+
+def export_to_file(path: str, pairs: Iterable) -> int:
+    """Writes pairs of graphs in the format read by `utils.import_from_file`
+
+    Pairs are written one by one, so generators are never materialized.
+
+    Args:
+        path: path to the exported file
+        pairs: iterable of 2-tuple x, y graphs
+
+    Returns:
+        int: count of written pairs
+    """
+
+    written = 0
+    with open(path, 'w') as file:
+        for x, y in pairs:
+            file.write(' '.join(map(str, numpy.asarray(x).tolist())))
+            file.write('\n')
+            file.write(' '.join(map(str, numpy.asarray(y).tolist())))
+            file.write('\n\n')
+            written += 1
+
+    return written
+
+
+def arcs(cycle: list) -> set[tuple]:
+    return {(cycle[idx - 1], cycle[idx]) for idx in range(len(cycle))}
+
+
+def edges(cycle: list) -> set[tuple]:
+    return {tuple(sorted(arc)) for arc in arcs(cycle)}
+
+
+def is_cycle(successors: dict) -> bool:
+    """Checks if the successors mapping is a single cycle through all vertices"""
+
+    start = next(iter(successors))
+    vertex, length = successors[start], 1
+    while vertex != start:
+        vertex, length = successors[vertex], length + 1
+        if length > len(successors):
+            return False
+
+    return length == len(successors)
+
+
+def to_cycle(successors: dict) -> list:
+    cycle = [next(iter(successors))]
+    while len(cycle) != len(successors):
+        cycle.append(successors[cycle[-1]])
+    return cycle
+
+
+def random_cycle(rng: numpy.random.Generator, number_of_vertices: int) -> list:
+    cycle: list = (rng.permutation(number_of_vertices) + 1).tolist()
+    return cycle
+
+
+def cut_points(
+    rng: numpy.random.Generator, number_of_vertices: int, count: int, minimal: int
+) -> list:
+    """Chooses sorted positions splitting a cycle into count + 1 parts
+
+    The first and the last part are glued together by the cycle, every
+    part gets at least `minimal` vertices.
+    """
+
+    free = number_of_vertices - minimal * count
+    offsets = numpy.sort(rng.choice(free - minimal + 1, count, replace=True))
+    return [int(offset) + minimal * (idx + 1) for idx, offset in enumerate(offsets)]
+
+
+def common_edges_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """X is random, Y shares exactly k arcs with X
+
+    As undirected cycles they can share more edges: the chains of Y are in
+    the order of X, but Y may join two of them by an edge of X backwards.
+    """
+
+    if not 0 <= k <= number_of_vertices - 3:
+        raise exceptions.InputError(
+            'The number of common arcs must be between 0 and n - 3!'
+        )
+
+    x = random_cycle(rng, number_of_vertices)
+    x_arcs = arcs(x)
+
+    kept = set(rng.choice(number_of_vertices, k, replace=False).tolist())
+    chains: list = []
+    for idx in range(number_of_vertices):
+        if idx - 1 in kept and chains:
+            chains[-1].append(x[idx])
+        else:
+            chains.append([x[idx]])
+    if number_of_vertices - 1 in kept and len(chains) > 1:
+        chains[0] = chains.pop() + chains[0]
+
+    while True:
+        order = [0] + (rng.permutation(len(chains) - 1) + 1).tolist()
+        y = [vertex for idx in order for vertex in chains[idx]]
+        if len(arcs(y) & x_arcs) == k:
+            return x, y
+
+
+def two_opt_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """Y is X after k random segment reversals"""
+
+    if number_of_vertices < 4:
+        raise exceptions.InputError('The number of vertices must be at least 4!')
+    if k < 1:
+        raise exceptions.InputError('The number of moves must be at least 1!')
+
+    x = random_cycle(rng, number_of_vertices)
+    while True:
+        y = x[:]
+        for _ in range(k):
+            i, j = cut_points(rng, number_of_vertices, 2, 1)
+            y[i:j] = reversed(y[i:j])
+        if arcs(y) != arcs(x):
+            return x, y
+
+
+def three_opt_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """Y is X after k random exchanges of two adjacent segments"""
+
+    if number_of_vertices < 4:
+        raise exceptions.InputError('The number of vertices must be at least 4!')
+    if k < 1:
+        raise exceptions.InputError('The number of moves must be at least 1!')
+
+    x = random_cycle(rng, number_of_vertices)
+    while True:
+        y = x[:]
+        for _ in range(k):
+            a, b, c = cut_points(rng, number_of_vertices, 3, 1)
+            y = y[:a] + y[b:c] + y[a:b] + y[c:]
+        if arcs(y) != arcs(x):
+            return x, y
+
+
+def decomposable_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """X and Y with a known decomposition into other cycles Z and W
+
+    Z and W are random cycles such that switching the out-arcs of three
+    vertices a, b, c between them gives two other cycles X and Y. The
+    decomposition exists for both directed and undirected cycles.
+    """
+
+    if number_of_vertices < 7:
+        raise exceptions.InputError('The number of vertices must be at least 7!')
+
+    while True:
+        z = random_cycle(rng, number_of_vertices)
+        a, b, c = 0, *cut_points(rng, number_of_vertices, 2, 2)
+        z_next = {vertex: z[(idx + 1) % len(z)] for idx, vertex in enumerate(z)}
+        switched = {z[a]: z_next[z[b]], z[b]: z_next[z[c]], z[c]: z_next[z[a]]}
+
+        # W is a random cycle containing the switched arcs
+        taken = set(switched) | set(switched.values())
+        units = [[vertex, target] for vertex, target in switched.items()]
+        units += [[vertex] for vertex in z if vertex not in taken]
+        w = [vertex for idx in rng.permutation(len(units)) for vertex in units[idx]]
+        w_next = {vertex: w[(idx + 1) % len(w)] for idx, vertex in enumerate(w)}
+
+        x_next = {**z_next, **switched}
+        y_next = {**w_next, **{vertex: z_next[vertex] for vertex in switched}}
+        if not is_cycle(x_next) or not is_cycle(y_next):
+            continue
+
+        x, y = to_cycle(x_next), to_cycle(y_next)
+        cycles = [x, y, z, w]
+        if all(
+            len({frozenset(key(cycle)) for cycle in cycles}) == 4
+            for key in (arcs, edges)
+        ):
+            return x, y
+
+
+def non_decomposable_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """X and Y without any decomposition into other cycles Z and W
+
+    Y exchanges two adjacent segments of X, every segment has at least two
+    vertices. Both Z and W then have to pass every segment as a whole, and
+    X and Y are the only ways to join them.
+    """
+
+    if number_of_vertices < 6:
+        raise exceptions.InputError('The number of vertices must be at least 6!')
+
+    x = random_cycle(rng, number_of_vertices)
+    a, b = cut_points(rng, number_of_vertices, 2, 2)
+    return x, x[b:] + x[a:b] + x[:a]
+
+
+def iter_pairs(
+    generate_pair: Callable[[numpy.random.Generator, int, int], tuple[list, list]],
+) -> Callable[..., Iterator[tuple[list, list]]]:
+    def wrapper(
+        number_of_vertices: int, number: int, seed: Optional[int] = None, k: int = 1
+    ) -> Iterator[tuple[list, list]]:
+        rng = numpy.random.default_rng(seed)
+        for _ in range(number):
+            yield generate_pair(rng, number_of_vertices, k)
+
+    wrapper.__doc__ = generate_pair.__doc__
+    return wrapper
+
+
+def random_pair(
+    rng: numpy.random.Generator, number_of_vertices: int, k: int
+) -> tuple[list, list]:
+    """X and Y are uniform random cycles"""
+
+    return random_cycle(rng, number_of_vertices), random_cycle(rng, number_of_vertices)
+
+
+families: dict[str, Callable[..., Iterator]] = {
+    'pyramidal': iter_pyramidal_pairs,
+    'random': iter_pairs(random_pair),
+    'common_edges': iter_pairs(common_edges_pair),
+    'two_opt': iter_pairs(two_opt_pair),
+    'three_opt': iter_pairs(three_opt_pair),
+    'decomposable': iter_pairs(decomposable_pair),
+    'non_decomposable': iter_pairs(non_decomposable_pair),
+}
+
+
+def parse_arguments() -> dict:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--family",
+        dest="family",
+        help="Family of the generated pairs: " + ', '.join(families),
+        default='pyramidal',
+    )
+    parser.add_argument("--number", dest="n", help="Number of vertices")
+    parser.add_argument("--times", dest="times", help="How many pairs to generate")
+    parser.add_argument(
+        "--parameter",
+        dest="k",
+        help=(
+            'Parameter of the family: number of common arcs for "common_edges", '
+            'number of moves for "two_opt" and "three_opt"'
+        ),
+    )
+    parser.add_argument("--seed", dest="seed", help="Seed of the random generator")
+    parser.add_argument("--path", dest="path", help="Path to the output file")
+
+    args = parser.parse_args()
+
+    try:
+        if not args.n or not args.path:
+            raise exceptions.InputError(
+                'Set required parameters "--number" and "--path"! '
+                'Run "generators.py -h" to see the help.'
+            )
+        if args.family not in families:
+            raise exceptions.InputError(
+                'Unknown family "' + args.family + '"! '
+                'Available families: ' + ', '.join(families)
+            )
+    except exceptions.InputError as e:
+        print(e.message)
+        exit()
+
+    return {
+        'family': args.family,
+        'n': int(args.n),
+        'times': int(args.times) if args.times else 100,
+        'k': int(args.k) if args.k else None,
+        'seed': int(args.seed) if args.seed else None,
+        'path': args.path,
+    }
+
+
+if __name__ == '__main__':
+    configuration = parse_arguments()
+    kwargs = {'seed': configuration['seed']}
+    if configuration['k'] is not None:
+        kwargs['k'] = configuration['k']
+
+    try:
+        written = export_to_file(
+            configuration['path'],
+            families[configuration['family']](
+                configuration['n'], configuration['times'], **kwargs
+            ),
+        )
+    except exceptions.InputError as e:
+        print(e.message)
+        exit()
+    print(written, 'pairs written to', configuration['path'])
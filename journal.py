@@ -0,0 +1,64 @@
+"""Append-only journal of test results, one JSON record per line"""
+
+import json
+import os
+from typing import IO, Optional
+
+
+def record_key(record: dict) -> tuple[str, int, int]:
+    return record['pack'], record['pair'], record['method']
+
+
+def load(path: str) -> dict:
+    """Reads the records of completed tests
+
+    A line cut by a crash in the middle of writing is skipped.
+
+    Returns:
+        dict: (pack, pair, method) -> the last record of the test
+    """
+
+    records: dict = {}
+    if not os.path.exists(path):
+        return records
+
+    with open(path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record_key(record)] = record
+
+    return records
+
+
+class Journal:
+    """Writes a record per completed test, every record is flushed at once,
+    so an interrupted run loses at most the running test
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file: Optional[IO[str]] = open(path, 'a')
+        # finish a line cut by a crash, the rest of it is skipped by load
+        if self.file.tell():
+            with open(path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    self.file.write('\n')
+
+    def write(self, record: dict) -> None:
+        assert self.file is not None
+        self.file.write(json.dumps(record) + '\n')
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self) -> 'Journal':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,73 @@
+"""Latency percentiles and log-spaced histograms of test times"""
+
+import math
+
+quantiles = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+
+def percentile(sorted_times: list, quantile: float) -> float:
+    """Nearest-rank percentile of sorted times"""
+
+    rank = max(math.ceil(quantile * len(sorted_times)), 1)
+    value: float = sorted_times[rank - 1]
+    return value
+
+
+def summarize(times: list) -> dict:
+    """Gets p50, p90, p99 and max of times (None for no times)"""
+
+    if not times:
+        return {title: None for title in list(quantiles) + ['max']}
+
+    sorted_times = sorted(times)
+    summary = {
+        title: percentile(sorted_times, quantile)
+        for title, quantile in quantiles.items()
+    }
+    summary['max'] = sorted_times[-1]
+    return summary
+
+
+def log_histogram(times: list, buckets_per_decade: int = 4) -> list:
+    """Counts positive times in buckets with log-spaced bounds
+
+    Args:
+        times: times (of any unit)
+        buckets_per_decade: number of buckets between powers of 10
+
+    Returns:
+        list: (lower bound, upper bound, count) of non-empty buckets and
+        empty buckets between them, in increasing order
+    """
+
+    counts: dict[int, int] = {}
+    for time in times:
+        bucket = math.floor(math.log10(max(time, 1)) * buckets_per_decade)
+        counts[bucket] = counts.get(bucket, 0) + 1
+
+    if not counts:
+        return []
+
+    return [
+        (
+            10 ** (bucket / buckets_per_decade),
+            10 ** ((bucket + 1) / buckets_per_decade),
+            counts.get(bucket, 0),
+        )
+        for bucket in range(min(counts), max(counts) + 1)
+    ]
+
+
+def format_histogram(histogram: list, scale: float = 10**9, width: int = 40) -> str:
+    """Draws the histogram as text bars, bounds are divided by the scale"""
+
+    if not histogram:
+        return '(no tests)'
+
+    largest = max(count for _, _, count in histogram)
+    return '\n'.join(
+        '{:>10.4g} - {:<10.4g} {:>7} {}'.format(
+            low / scale, high / scale, count, '#' * math.ceil(width * count / largest)
+        ).rstrip()
+        for low, high, count in histogram
+    )
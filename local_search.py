@@ -0,0 +1,329 @@
+"""Local search for a decomposition (incomplete: False means "gave up")
+
+A colouring of the single edges (of only one of X and Y) is consistent if
+Z and W are 2-factors: every vertex (the out- and in-side of a vertex of
+directed cycles) gives half of its single edges to each of them. The
+search starts from a random consistent colouring and flips the colours
+of alternating closed trails - Z and W edges in turn, so every vertex
+keeps its balance - while the number of cycles of Z and W does not grow
+(or with a small probability anyway) until Z and W are Hamiltonian cycles
+or the move budget is spent.
+
+For directed cycles the alternating trails are the components of
+`transitions.directed_components`, for undirected ones they are random
+walks; the start colouring alternates along Euler circuits of the single
+edges.
+"""
+
+import random
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Optional
+
+import transitions
+import utils
+
+# moves per vertex and the probability to accept a move adding cycles
+budget = 2
+noise = 0.1
+
+
+def count_cycles(n: int, edges: list) -> int:
+    """Counts the cycles of a 2-factor given by its edges over 0..n-1"""
+
+    neighbors: list = [[] for _ in range(n)]
+    for u, v in edges:
+        neighbors[u].append(v)
+        neighbors[v].append(u)
+
+    cycles, seen = 0, [False] * n
+    for start in range(n):
+        if seen[start]:
+            continue
+        cycles += 1
+        stack = [start]
+        while stack:
+            vertex = stack.pop()
+            if not seen[vertex]:
+                seen[vertex] = True
+                stack.extend(neighbors[vertex])
+    return cycles
+
+
+class Colouring(ABC):
+    """Consistent colouring of the single edges of X and Y over 0..n-1"""
+
+    def __init__(self, n: int, single: list, doubled: list, rng: random.Random) -> None:
+        self.n = n
+        self.single = single
+        self.doubled = doubled
+        self.rng = rng
+        # Z is X
+        self.color = [number < len(single) // 2 for number in range(len(single))]
+
+    def cost(self) -> int:
+        """Number of cycles of Z and W (2 for a decomposition)"""
+
+        return sum(
+            count_cycles(
+                self.n,
+                self.doubled
+                + [edge for edge, color in zip(self.single, self.color) if color == c],
+            )
+            for c in (True, False)
+        )
+
+    @abstractmethod
+    def trail(self) -> list:
+        """Gets the numbers of single edges whose flip keeps the colouring
+        consistent (a move), empty if there is no move
+        """
+
+    def flip(self, trail: list) -> None:
+        """Swaps the colours of the single edges, Z for W and W for Z"""
+
+        for edge in trail:
+            self.color[edge] = not self.color[edge]
+
+    def is_input(self) -> bool:
+        """Checks whether Z is X or Y: all or none of the X single edges
+        (the first half) are in Z
+        """
+
+        in_z = sum(self.color[: len(self.single) // 2])
+        return in_z in (0, len(self.single) // 2)
+
+
+class DirectedColouring(Colouring):
+    """Out-arcs of a component of vertices go to Z from X or all from Y"""
+
+    def __init__(
+        self, n: int, single: list, doubled: list, rng: random.Random, components: list
+    ) -> None:
+        super().__init__(n, single, doubled, rng)
+        arc = {edge: number for number, edge in enumerate(single)}
+        x_succ = {u: v for u, v in single[: len(single) // 2]}
+        y_succ = {u: v for u, v in single[len(single) // 2 :]}
+        self.components = [
+            [
+                number
+                for vertex in component
+                for number in (
+                    arc[(vertex, x_succ[vertex])],
+                    arc[(vertex, y_succ[vertex])],
+                )
+            ]
+            for component in components
+        ]
+        for component in self.components:
+            if rng.random() < 0.5:
+                self.flip(component)
+
+    def trail(self) -> list:
+        return self.rng.choice(self.components)
+
+
+class UndirectedColouring(Colouring):
+    """Alternating closed trails are random walks over single edges"""
+
+    def __init__(self, n: int, single: list, doubled: list, rng: random.Random) -> None:
+        super().__init__(n, single, doubled, rng)
+        self.incident: list = [[] for _ in range(n)]
+        for number, (u, v) in enumerate(single):
+            self.incident[u].append(number)
+            self.incident[v].append(number)
+
+        # colours alternate along Euler circuits (every circuit is even)
+        used = [False] * len(single)
+        for start in range(n):
+            circuit = self.euler_circuit(start, used)
+            for position, edge in enumerate(circuit):
+                self.color[edge] = position % 2 == 0
+
+    def euler_circuit(self, start: int, used: list) -> list:
+        """Hierholzer's algorithm with random choices over unused edges
+
+        Returns:
+            list: edges of the circuit in order
+        """
+
+        circuit: list = []
+        stack: list = [(start, None)]
+        while stack:
+            vertex, edge = stack[-1]
+            free = [other for other in self.incident[vertex] if not used[other]]
+            if free:
+                other = self.rng.choice(free)
+                used[other] = True
+                u, v = self.single[other]
+                stack.append((v if u == vertex else u, other))
+            else:
+                stack.pop()
+                if edge is not None:
+                    circuit.append(edge)
+        return circuit
+
+    def trail(self) -> list:
+        """Gets a random alternating closed trail, empty if the walk is stuck"""
+
+        first = self.rng.randrange(len(self.single))
+        start, vertex = self.single[first]
+        trail, used, color = [first], {first}, not self.color[first]
+        for _ in range(2 * self.n):
+            free = [
+                edge
+                for edge in self.incident[vertex]
+                if self.color[edge] == color and edge not in used
+            ]
+            if not free:
+                return []
+            edge = self.rng.choice(free)
+            trail.append(edge)
+            used.add(edge)
+            u, v = self.single[edge]
+            vertex = v if u == vertex else u
+            if vertex == start and color != self.color[first]:
+                return trail
+            color = not color
+        return []
+
+
+@utils.timeout('Local search')
+def climb(
+    colouring: Colouring,
+    cost: int,
+    moves: int,
+    counters: Optional[Counter] = None,
+    **kwargs: Optional[tuple],
+) -> int:
+    """Makes the moves, stops at a decomposition different from X and Y
+
+    Returns:
+        int: cost of the colouring
+    """
+
+    for _ in range(moves):
+        if cost == 2 and not colouring.is_input():
+            break
+        trail = colouring.trail()
+        if not trail:
+            continue
+        if counters is not None:
+            counters['nodes'] += 1
+
+        colouring.flip(trail)
+        new_cost = colouring.cost()
+        if new_cost <= cost or colouring.rng.random() < noise:
+            cost = new_cost
+        else:
+            colouring.flip(trail)
+            if counters is not None:
+                counters['backtracks'] += 1
+    return cost
+
+
+def decomposition(
+    graph_x: list,
+    graph_y: list,
+    directed: bool,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    """Searches for a decomposition with a budget of moves
+
+    Returns:
+        bool: True if found, False if the budget is spent (it may exist)
+    """
+
+    index = {vertex: idx for idx, vertex in enumerate(graph_x)}
+    n = len(graph_x)
+
+    def edges(graph: list) -> list:
+        return [
+            (
+                (index[graph[idx - 1]], index[graph[idx]])
+                if directed
+                else tuple(sorted((index[graph[idx - 1]], index[graph[idx]])))
+            )
+            for idx in range(n)
+        ]
+
+    x_edges, y_edges = edges(graph_x), edges(graph_y)
+    doubled = sorted(set(x_edges) & set(y_edges))
+    single = [edge for edge in x_edges + y_edges if edge not in doubled]
+    if not single:
+        return False
+
+    rng = random.Random(0)
+    colouring: Colouring
+    if directed:
+        x_succ, y_succ = [0] * n, [0] * n
+        for u, v in x_edges:
+            x_succ[u] = v
+        for u, v in y_edges:
+            y_succ[u] = v
+        colouring = DirectedColouring(
+            n, single, doubled, rng, transitions.directed_components(x_succ, y_succ)
+        )
+    else:
+        colouring = UndirectedColouring(n, single, doubled, rng)
+
+    cost = colouring.cost()
+    # the budget is spent by rounds of n moves, the timeout is checked between
+    for _ in range(budget):
+        cost = climb(
+            colouring,
+            cost,
+            n,
+            counters=counters,
+            timeout=timeout,
+            global_timeout=global_timeout,
+        )
+        if cost == 2 and not colouring.is_input():
+            break
+    else:
+        return False
+
+    if solution is not None:
+        names = [
+            (
+                (graph_x[u], graph_x[v])
+                if directed
+                else tuple(sorted((graph_x[u], graph_x[v])))
+            )
+            for u, v in doubled + single
+        ]
+        solution['z'] = set(names[: len(doubled)])
+        solution['w'] = set(names[: len(doubled)])
+        for name, color in zip(names[len(doubled) :], colouring.color):
+            solution['z' if color else 'w'].add(name)
+
+    return True
+
+
+def directed_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, True, timeout, global_timeout, counters, solution
+    )
+
+
+def undirected_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, False, timeout, global_timeout, counters, solution
+    )
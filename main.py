@@ -1,15 +1,32 @@
+import cProfile
+import pstats
+import random
 import sys
 from argparse import ArgumentParser
-from datetime import datetime
-from time import sleep
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import partial
+from statistics import mean, pstdev
+from time import perf_counter_ns, process_time_ns, sleep
+from typing import Optional
 
-import numpy
 from prettytable import PrettyTable
 
+import bitmask
 import directed
 import exceptions
+import frontier
+import journal
+import latency
+import local_search
+import profiling
+import results
+import sat
+import transitions
 import undirected
-from utils import generate_random_graphs, import_from_file
+import workers
+from progress import Progress
+from utils import counters_titles, generate_random_graphs, import_from_file
 
 funcs: dict[int, dict] = {
     0: {'func': directed.simple_path, 'title': 'Simple path for directed cycles'},
@@ -22,7 +39,72 @@ funcs: dict[int, dict] = {
         'func': undirected.chain_edge_fixing,
         'title': 'Chain edge fixing for undirected cycles',
     },
+    4: {
+        'func': frontier.directed_decomposition,
+        'title': 'Frontier DP for directed cycles',
+    },
+    5: {
+        'func': frontier.undirected_decomposition,
+        'title': 'Frontier DP for undirected cycles',
+    },
+    6: {'func': sat.directed_decomposition, 'title': 'SAT for directed cycles'},
+    7: {'func': sat.undirected_decomposition, 'title': 'SAT for undirected cycles'},
+    8: {
+        'func': transitions.directed_decomposition,
+        'title': 'Transition bits for directed cycles',
+    },
+    9: {
+        'func': transitions.undirected_decomposition,
+        'title': 'Transitions for undirected cycles',
+    },
+    10: {
+        'func': bitmask.directed_decomposition,
+        'title': 'Bitmask search for directed cycles',
+    },
+    11: {
+        'func': bitmask.undirected_decomposition,
+        'title': 'Bitmask search for undirected cycles',
+    },
+    12: {
+        'func': local_search.directed_decomposition,
+        'title': 'Local search for directed cycles',
+    },
+    13: {
+        'func': local_search.undirected_decomposition,
+        'title': 'Local search for undirected cycles',
+    },
+    14: {
+        'func': partial(directed.chain_edge_fixing, mode='lds'),
+        'title': 'Chain edge fixing with LDS for directed cycles',
+    },
+    15: {
+        'func': partial(undirected.chain_edge_fixing, mode='lds'),
+        'title': 'Chain edge fixing with LDS for undirected cycles',
+    },
+    16: {
+        'func': partial(directed.chain_edge_fixing, mode='dds'),
+        'title': 'Chain edge fixing with DDS for directed cycles',
+    },
+    17: {
+        'func': partial(undirected.chain_edge_fixing, mode='dds'),
+        'title': 'Chain edge fixing with DDS for undirected cycles',
+    },
+    18: {
+        'func': partial(directed.simple_path, bidirectional=True),
+        'title': 'Simple path from both ends for directed cycles',
+    },
+    19: {
+        'func': partial(undirected.simple_path, bidirectional=True),
+        'title': 'Simple path from both ends for undirected cycles',
+    },
 }
+# methods replaced by the bitmask search for small packs with "--fast-path"
+fast_paths = {
+    method: 10 + method % 2 for method in (0, 1, 2, 3, 14, 15, 16, 17, 18, 19)
+}
+# local search run before the method with "--heuristic-first" (even methods are
+# for directed cycles, odd ones for undirected)
+heuristics = {method: 12 + method % 2 for method in funcs if method not in (12, 13)}
 
 
 def parse_arguments() -> dict:
@@ -40,6 +122,14 @@ def parse_arguments() -> dict:
     parser.add_argument(
         "--timeout", dest="timeout", help="Runtime threshold for one test (in minutes)"
     )
+    parser.add_argument(
+        "--hard-timeout",
+        dest="hard_timeout",
+        help=(
+            "Runtime threshold for one test (in seconds, fractions are allowed): "
+            "every test runs in a worker process killed at the threshold"
+        ),
+    )
     parser.add_argument(
         "--global-timeout",
         dest="global_timeout",
@@ -53,7 +143,23 @@ def parse_arguments() -> dict:
             "0 - Simple path for directed cycles; "
             "1 - Simple path for undirected cycles; "
             "2 - Chain edge fixing for directed cycles; "
-            "3 - Chain edge fixing for undirected cycles"
+            "3 - Chain edge fixing for undirected cycles; "
+            "4 - Frontier DP for directed cycles; "
+            "5 - Frontier DP for undirected cycles; "
+            "6 - SAT for directed cycles (requires python-sat); "
+            "7 - SAT for undirected cycles (requires python-sat); "
+            "8 - Transition bits for directed cycles; "
+            "9 - Transitions for undirected cycles; "
+            "10 - Bitmask search for directed cycles (at most 64 vertices); "
+            "11 - Bitmask search for undirected cycles (at most 64 vertices); "
+            "12 - Local search for directed cycles (gives up with not found); "
+            "13 - Local search for undirected cycles (gives up with not found); "
+            "14, 15 - Chain edge fixing with limited discrepancy search "
+            "for directed and undirected cycles; "
+            "16, 17 - Chain edge fixing with depth-bounded discrepancy search "
+            "for directed and undirected cycles; "
+            "18, 19 - Simple path growing from both ends "
+            "for directed and undirected cycles"
         ),
         default='0,1,2,3',
     )
@@ -63,6 +169,76 @@ def parse_arguments() -> dict:
         help="Show intermediate progress (enabled by default)",
         default='true',
     )
+    parser.add_argument(
+        "--fast-path",
+        dest="fast_path",
+        help=(
+            "Solve packs of at most 64 vertices by the bitmask search instead "
+            "of methods 0-3 and 14-19 (disabled by default)"
+        ),
+        default='false',
+    )
+    parser.add_argument(
+        "--heuristic-first",
+        dest="heuristic_first",
+        help=(
+            "Run the local search before the method, the method runs only if "
+            "the local search gives up (disabled by default)"
+        ),
+        default='false',
+    )
+    parser.add_argument(
+        "--counters",
+        dest="counters",
+        help=(
+            "Collect search tree counters and show their mean values "
+            "(disabled by default)"
+        ),
+        default='false',
+    )
+    parser.add_argument(
+        "--histograms",
+        dest="histograms",
+        help=(
+            "Show histograms of test times with log-spaced buckets "
+            "(disabled by default)"
+        ),
+        default='false',
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        help=(
+            "Profile every test and write the aggregated profile to "
+            "<profile>.prof (pstats), <profile>.speedscope.json and "
+            "the per-test phases breakdown to <profile>.phases.json"
+        ),
+    )
+    parser.add_argument(
+        "--journal",
+        dest="journal",
+        help="Path to the journal: every test result is appended to it at once",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        help=(
+            "Skip the tests completed in the journal and take their results "
+            "from it (disabled by default)"
+        ),
+        default='false',
+    )
+    parser.add_argument(
+        "--output",
+        dest="output",
+        help=(
+            "Path to the results of every test (method, n, pair, result, "
+            "wall and CPU time, timeout): .jsonl, .csv or .parquet (pyarrow)"
+        ),
+    )
+    parser.add_argument(
+        "--seed", dest="seed", help="Seed of random graphs (to resume random tests)"
+    )
 
     args = parser.parse_args()
 
@@ -72,6 +248,24 @@ def parse_arguments() -> dict:
                 'Set one of required parameter "--number" or "--path"! '
                 'Run "main.py -h" to see the help.'
             )
+        if args.hard_timeout and (
+            args.profile or args.counters in ('True', 'true', 't')
+        ):
+            raise exceptions.InputError(
+                'Parameter "--hard-timeout" can\'t be used with "--profile" '
+                'or "--counters"! Run "main.py -h" to see the help.'
+            )
+        if args.resume in ('True', 'true', 't') and not args.journal:
+            raise exceptions.InputError(
+                'Set parameter "--journal" to resume from! '
+                'Run "main.py -h" to see the help.'
+            )
+        if args.resume in ('True', 'true', 't') and not args.path and not args.seed:
+            # unseeded random graphs differ from the ones in the journal
+            raise exceptions.InputError(
+                'Set parameter "--seed" to resume random tests! '
+                'Run "main.py -h" to see the help.'
+            )
     except exceptions.InputError as e:
         print(e.message)
         exit()
@@ -84,7 +278,17 @@ def parse_arguments() -> dict:
             ('times', args.times),
             ('timeout', args.timeout),
             ('global_timeout', args.global_timeout),
+            ('hard_timeout', args.hard_timeout),
             ('progress', args.progress),
+            ('fast_path', args.fast_path),
+            ('heuristic_first', args.heuristic_first),
+            ('counters', args.counters),
+            ('histograms', args.histograms),
+            ('profile', args.profile),
+            ('journal', args.journal),
+            ('resume', args.resume),
+            ('seed', args.seed),
+            ('output', args.output),
         ]:
             if value:
                 arguments[key] = value
@@ -103,6 +307,12 @@ def print_configuration(args: dict) -> None:
             if 'timeout' in args
             else '(with no limit)',
         ],
+        [
+            'Single test hard time limit',
+            (args['hard_timeout'] + ' second(s)')
+            if 'hard_timeout' in args
+            else '(with no limit)',
+        ],
         [
             'All tests time limit',
             (args['global_timeout'] + ' minute(s)')
@@ -110,6 +320,16 @@ def print_configuration(args: dict) -> None:
             else '(with no limit)',
         ],
         ['Methods', '\n'.join(funcs[item]['title'] for item in args['methods'])],
+        [
+            'Packs of at most 64 vertices',
+            'bitmask search'
+            if args['fast_path'] in ('True', 'true', 't')
+            else 'the methods',
+        ],
+        [
+            'Local search first',
+            'yes' if args['heuristic_first'] in ('True', 'true', 't') else 'no',
+        ],
         [
             'Test graphs files',
             '\n'.join(item for item in args['paths'])
@@ -123,17 +343,143 @@ def print_configuration(args: dict) -> None:
 
 
 def handle_result(
-    result: bool, start_time: datetime, success_times: list, fail_times: list
+    result: bool, elapsed: int, success_times: list, fail_times: list
 ) -> None:
     if result:
-        success_times.append(
-            (datetime.now() - start_time).microseconds
-            + (datetime.now() - start_time).seconds * (10**6)
+        success_times.append(elapsed)
+    else:
+        fail_times.append(elapsed)
+
+
+def run_test(
+    method: int, heuristic: Optional[int], graph_x: list, graph_y: list, kwargs: dict
+) -> bool:
+    """Runs the test by the method, after the heuristic if it is set and
+    gives up (the counters are of the method only)
+    """
+
+    if heuristic is not None and funcs[heuristic]['func'](
+        graph_x,
+        graph_y,
+        **{key: value for key, value in kwargs.items() if key != 'counters'},
+    ):
+        return True
+    return bool(funcs[method]['func'](graph_x, graph_y, **kwargs))
+
+
+def run_supervised(
+    worker: workers.Worker,
+    graph_x: tuple,
+    graph_y: tuple,
+    method: int,
+    timeout: Optional[float],
+    hard_timeout: Optional[float],
+    heuristic: Optional[int] = None,
+) -> tuple[bool, int, int]:
+    """Runs the test in the worker process killed at the hard timeout
+
+    Args:
+        worker: warm worker process
+        graph_x: x graph
+        graph_y: y graph
+        method: key of funcs
+        timeout: soft runtime threshold (in minutes)
+        hard_timeout: runtime threshold (in seconds)
+        heuristic: key of funcs run first, the method gets the rest of the
+            hard timeout if it gives up
+
+    Returns:
+        tuple: result, wall and CPU time in nanoseconds
+    """
+
+    result, elapsed, cpu_time = False, 0, 0
+    for stage in ([heuristic] if heuristic is not None else []) + [method]:
+        status, stage_elapsed, stage_cpu_time, message = worker.run(
+            graph_x,
+            graph_y,
+            stage,
+            timeout * 60 if timeout else None,
+            hard_timeout - elapsed / 10**9 if hard_timeout else None,
         )
+        elapsed += stage_elapsed
+        cpu_time += stage_cpu_time
+        if status == workers.TIMEOUT:
+            raise exceptions.SingleTestTimeoutExceeded(
+                ' '.join(
+                    [
+                        str(datetime.now()),
+                        funcs[method]['title'] + ': single test timeout exceeded!',
+                    ]
+                )
+            )
+        if status == workers.ERROR:
+            raise exceptions.InputError(message)
+        if status == workers.FAILURE:
+            raise exceptions.SolverError(message)
+        result = status == workers.FOUND
+        if result:
+            break
+    return result, elapsed, cpu_time
+
+
+def handle_record(
+    record: dict,
+    success_times: list,
+    fail_times: list,
+    cpu_times: list,
+    method_counters: list,
+) -> bool:
+    """Takes the result of a test completed in a previous run from its record
+
+    Returns:
+        bool: True if the test exceeded the time limit
+    """
+
+    if record['timeout']:
+        return True
+
+    if record['result']:
+        success_times.append(record['time'])
     else:
-        fail_times.append(
-            (datetime.now() - start_time).microseconds
-            + (datetime.now() - start_time).seconds * (10**6)
+        fail_times.append(record['time'])
+    if record['cpu_time'] is not None:
+        cpu_times.append(record['cpu_time'])
+    if record.get('counters') is not None:
+        method_counters.append(Counter(record['counters']))
+    return False
+
+
+def report(reporter: Optional[Progress], message: str) -> None:
+    """Prints the message, keeping the progress line (if any) intact"""
+
+    if reporter:
+        reporter.message(message)
+    else:
+        print(message)
+
+
+def write_record(
+    record: dict,
+    results_journal: Optional[journal.Journal],
+    results_writer: Optional[results.Writer],
+) -> None:
+    """Writes the record of a completed test (times in nanoseconds) to
+    the journal and the results output
+    """
+
+    if results_journal:
+        results_journal.write(record)
+    if results_writer:
+        results_writer.write(
+            dict(
+                record,
+                wall_time=record['time'] / 10**9,
+                cpu_time=(
+                    record['cpu_time'] / 10**9
+                    if record['cpu_time'] is not None
+                    else None
+                ),
+            )
         )
 
 
@@ -143,6 +489,7 @@ if __name__ == '__main__':
 
     test_graphs = []
     if 'paths' in configuration:
+        packs = configuration['paths']
         for path in configuration['paths']:
             graph_pack = import_from_file(path)
             if 'times' in configuration:
@@ -150,16 +497,55 @@ if __name__ == '__main__':
             else:
                 test_graphs.append(graph_pack)
     else:
+        if 'seed' in configuration:
+            random.seed(int(configuration['seed']))
+        packs = [
+            'random' + str(n) + ':' + configuration.get('seed', '')
+            for n in configuration['n']
+        ]
         generate_random_graphs(test_graphs, configuration)
 
-    timeout = int(configuration['timeout']) if 'timeout' in configuration else None
+    timeout = float(configuration['timeout']) if 'timeout' in configuration else None
     global_timeout = (
-        int(configuration['global_timeout'])
+        float(configuration['global_timeout'])
         if 'global_timeout' in configuration
         else None
     )
+    hard_timeout = (
+        float(configuration['hard_timeout'])
+        if 'hard_timeout' in configuration
+        else None
+    )
+    worker = workers.Worker() if hard_timeout else None
     progress = configuration['progress'] in ('True', 'true', 't')
+    fast_path = configuration['fast_path'] in ('True', 'true', 't')
+    heuristic_first = configuration['heuristic_first'] in ('True', 'true', 't')
+    collect_counters = configuration['counters'] in ('True', 'true', 't')
+    histograms = configuration['histograms'] in ('True', 'true', 't')
+    profile = configuration.get('profile')
+    profile_stats: Optional[pstats.Stats] = None
+    breakdowns: list = []
+    completed = (
+        journal.load(configuration['journal'])
+        if configuration.get('resume') in ('True', 'true', 't')
+        else {}
+    )
+    results_journal = None
+    if 'journal' in configuration:
+        results_journal = journal.Journal(configuration['journal'])
+    results_writer = None
+    if 'output' in configuration:
+        try:
+            results_writer = results.open_writer(configuration['output'])
+        except exceptions.InputError as e:
+            print(e.message)
+            exit()
 
+    latency_table = PrettyTable(
+        ['Vertex number', 'Method', 'Tests', 'p50 (s)', 'p90 (s)', 'p99 (s)', 'Max (s)']
+        + ['Wall time (s)', 'CPU time (s)', 'CPU / wall']
+    )
+    histogram_tables: list = []
     table = PrettyTable(
         [
             'Vertex number',
@@ -171,26 +557,67 @@ if __name__ == '__main__':
             'Not found time (s)',
             'Not found SD time (s)',
             'Limit exceeded',
+            'Errors',
         ]
+        + (list(counters_titles.values()) if collect_counters else [])
     )
     try:
         print()
         print('-' * 30, 'STARTED', '-' * 30)
         print()
-        for graphs in test_graphs:
+        for pack, graphs in zip(packs, test_graphs):
             vertex_number = len(graphs[0][0])
 
             sys.setrecursionlimit(vertex_number * 10)
 
             for method in configuration['methods']:
                 start_time_method = datetime.now()
+                solver = (
+                    fast_paths.get(method, method)
+                    if fast_path and vertex_number <= bitmask.max_vertices
+                    else method
+                )
+                heuristic = heuristics.get(solver) if heuristic_first else None
                 success_times: list = []
                 fail_times: list = []
+                cpu_times: list = []
                 limit_exceeded = 0
+                errors = 0
+                method_counters: list = []
 
-                tests_number = len(graphs)
+                reporter = (
+                    Progress(
+                        len(graphs),
+                        funcs[method]['title'] + ' on ' + str(vertex_number),
+                    )
+                    if progress
+                    else None
+                )
 
                 for idx, (graph_x, graph_y) in enumerate(graphs, start=1):
+                    record = {'pack': pack, 'pair': idx, 'method': method}
+                    if journal.record_key(record) in completed:
+                        previous = completed[journal.record_key(record)]
+                        if previous.get('error'):
+                            errors += 1
+                        else:
+                            limit_exceeded += handle_record(
+                                previous,
+                                success_times,
+                                fail_times,
+                                cpu_times,
+                                method_counters,
+                            )
+                        if reporter:
+                            reporter.update(
+                                None
+                                if previous['timeout'] or previous.get('error')
+                                else previous['result']
+                            )
+                        # the output is written anew, so it keeps resumed tests
+                        write_record(previous, None, results_writer)
+                        continue
+
                     try:
                         if len(graph_x) != len(graph_y):
                             raise exceptions.InputGraphsLengthError(graph_x, graph_y)
@@ -198,52 +625,148 @@ if __name__ == '__main__':
                         if graph_x == graph_y:
                             raise exceptions.EqualInputGraphs(graph_x, graph_y)
 
-                        start_time = datetime.now()
+                        start_time = perf_counter_ns()
+                        cpu_start_time = process_time_ns()
 
-                        kwargs = {}
+                        kwargs: dict = {}
                         if timeout:
-                            kwargs['timeout'] = (start_time, timeout)
+                            kwargs['timeout'] = (datetime.now(), timeout)
                         if global_timeout:
                             kwargs['global_timeout'] = (
                                 start_time_method,
                                 global_timeout,
                             )
+                        if collect_counters:
+                            kwargs['counters'] = Counter()
+                            method_counters.append(kwargs['counters'])
 
-                        result = funcs[method]['func'](graph_x, graph_y, **kwargs)
-                        handle_result(result, start_time, success_times, fail_times)
-
-                        if progress:
-                            print(
-                                datetime.now(),
-                                funcs[method]['title'],
-                                'on ' + str(len(graph_x)) + ' vertices',
-                                idx,
-                                '/',
-                                tests_number,
-                                'passed',
+                        if profile:
+                            profiler = cProfile.Profile()
+                            profiler.enable()
+                            try:
+                                result = run_test(
+                                    solver, heuristic, graph_x, graph_y, kwargs
+                                )
+                            finally:
+                                profiler.disable()
+                                if profile_stats is None:
+                                    profile_stats = pstats.Stats(profiler)
+                                else:
+                                    profile_stats.add(profiler)
+                            breakdowns.append(
+                                {
+                                    'method': method,
+                                    'n': vertex_number,
+                                    'pair': idx,
+                                    'result': result,
+                                    'phases': profiling.phase_breakdown(
+                                        pstats.Stats(profiler),
+                                        (perf_counter_ns() - start_time) / 10**9,
+                                    ),
+                                }
+                            )
+                        elif worker:
+                            if global_timeout and datetime.now() - start_time_method > (
+                                timedelta(minutes=global_timeout)
+                            ):
+                                raise exceptions.AllTestsTimeoutExceeded(
+                                    str(datetime.now())
+                                    + ' '
+                                    + funcs[method]['title']
+                                    + ': all tests timeout exceeded!'
+                                )
+                            result, elapsed, cpu_time = run_supervised(
+                                worker,
+                                graph_x,
+                                graph_y,
+                                solver,
+                                timeout,
+                                hard_timeout,
+                                heuristic,
+                            )
+                        else:
+                            result = run_test(
+                                solver, heuristic, graph_x, graph_y, kwargs
                             )
+                        if not worker:
+                            elapsed = perf_counter_ns() - start_time
+                            cpu_time = process_time_ns() - cpu_start_time
+                        handle_result(result, elapsed, success_times, fail_times)
+                        cpu_times.append(cpu_time)
+                        record.update(
+                            n=vertex_number,
+                            result=result,
+                            time=elapsed,
+                            cpu_time=cpu_time,
+                            timeout=False,
+                            counters=kwargs.get('counters'),
+                        )
+                        write_record(record, results_journal, results_writer)
+
+                        if reporter:
+                            reporter.update(result)
                     except (
                         exceptions.InputGraphsLengthError,
                         exceptions.EqualInputGraphs,
                     ) as e:
-                        print(e.message)
+                        report(reporter, e.message)
+                        if reporter:
+                            reporter.update(None)
                     except exceptions.SingleTestTimeoutExceeded as e:
-                        print(e.message)
+                        report(reporter, e.message)
                         limit_exceeded += 1
+                        if reporter:
+                            reporter.update(None)
+                        record.update(
+                            n=vertex_number,
+                            result=None,
+                            time=perf_counter_ns() - start_time,
+                            # the CPU time of a killed worker is unknown
+                            cpu_time=(
+                                process_time_ns() - cpu_start_time
+                                if not worker
+                                else None
+                            ),
+                            timeout=True,
+                            counters=kwargs.get('counters'),
+                        )
+                        write_record(record, results_journal, results_writer)
+                    except (exceptions.InputError, exceptions.SolverError) as e:
+                        # a worker error fails the test only
+                        report(reporter, e.message)
+                        errors += 1
+                        if reporter:
+                            reporter.update(None)
+                        record.update(
+                            n=vertex_number,
+                            result=None,
+                            time=perf_counter_ns() - start_time,
+                            cpu_time=None,
+                            timeout=False,
+                            counters=kwargs.get('counters'),
+                            error=e.message,
+                        )
+                        write_record(record, results_journal, results_writer)
                     except exceptions.AllTestsTimeoutExceeded as e:
-                        print(e.message)
+                        report(reporter, e.message)
                         break
                     except KeyboardInterrupt:
-                        print(
+                        report(
+                            reporter,
                             'The current test has been stopped. '
-                            'Press Ctrl+C in 5 seconds to stop process this method.'
+                            'Press Ctrl+C in 5 seconds to stop process this method.',
                         )
+                        if reporter:
+                            reporter.update(None)
                         try:
                             sleep(5)
                         except KeyboardInterrupt:
-                            print('The current method has been stopped')
+                            report(reporter, 'The current method has been stopped')
                             break
 
+                if reporter:
+                    reporter.close()
+
                 found = len(success_times)
                 not_found = len(fail_times)
                 found_time = (sum(success_times) / found) if found else 0
@@ -254,18 +777,53 @@ if __name__ == '__main__':
                         vertex_number,
                         funcs[method]['title'],
                         found,
-                        round(found_time / 10**6, 3),
+                        round(found_time / 10**9, 3),
                         (
-                            round(numpy.std(success_times) / 10**6, 3)
+                            round(pstdev(success_times) / 10**9, 3)
                             if success_times
                             else 0
                         ),
                         not_found,
-                        round(not_found_time / 10**6, 3),
-                        round(numpy.std(fail_times) / 10**6, 3) if fail_times else 0,
+                        round(not_found_time / 10**9, 3),
+                        round(pstdev(fail_times) / 10**9, 3) if fail_times else 0,
                         limit_exceeded,
+                        errors,
+                    ]
+                    + (
+                        [
+                            round(mean(item[key] for item in method_counters), 1)
+                            if method_counters
+                            else 0
+                            for key in counters_titles
+                        ]
+                        if collect_counters
+                        else []
+                    )
+                )
+                wall_times = success_times + fail_times
+                latency_table.add_row(
+                    [vertex_number, funcs[method]['title'], len(wall_times)]
+                    + [
+                        round(value / 10**9, 4) if value is not None else '--'
+                        for value in latency.summarize(wall_times).values()
+                    ]
+                    + [
+                        round(sum(wall_times) / 10**9, 3),
+                        round(sum(cpu_times) / 10**9, 3),
+                        (
+                            round(sum(cpu_times) / sum(wall_times), 2)
+                            if sum(wall_times)
+                            else '--'
+                        ),
                     ]
                 )
+                if histograms:
+                    histogram_tables.append(
+                        (
+                            str(vertex_number) + ' vertices, ' + funcs[method]['title'],
+                            latency.log_histogram(wall_times),
+                        )
+                    )
                 print(
                     '-' * 30,
                     vertex_number,
@@ -275,9 +833,47 @@ if __name__ == '__main__':
                 )
     except KeyboardInterrupt:
         pass
+    finally:
+        if results_journal:
+            results_journal.close()
+        if results_writer:
+            results_writer.close()
+        if worker:
+            worker.close()
 
     print()
     print('-' * 30, 'RESULTS', '-' * 30)
     print()
     print(table)
     print('SD - standard deviation')
+    print()
+    print(latency_table)
+    print('Percentiles of completed tests (found and not found)')
+    for title, histogram in histogram_tables:
+        print()
+        print(title, '(time in seconds)')
+        print(latency.format_histogram(histogram))
+    if collect_counters:
+        print('Counters are mean values per test')
+
+    if profile:
+        phases_table = PrettyTable(
+            ['Vertex number', 'Method']
+            + [title + ' (%)' for title in profiling.phases]
+            + [profiling.search_phase + ' (%)']
+        )
+        for (method, n), totals in sorted(profiling.aggregate(breakdowns).items()):
+            total = sum(totals.values()) or 1
+            phases_table.add_row(
+                [n, funcs[method]['title']]
+                + [round(100 * value / total, 1) for value in totals.values()]
+            )
+        print()
+        print(phases_table)
+        for path in profiling.write_profile(
+            profile,
+            profile_stats,
+            breakdowns,
+            {method: funcs[method]['title'] for method in funcs},
+        ):
+            print('Profile written to', path)
@@ -0,0 +1,277 @@
+"""Branching policies of the chain edge fixing
+
+A policy chooses the vertex whose free edges are the branches of the next
+search node. Candidates are kept in a bucket queue by an integer score
+(the best one is the highest) and their scores are updated with every
+fixed and unfixed edge, so a choice doesn't scan the multigraph:
+
+- most_fixed: the most fixed incident edges
+- fewest_options: the fewest ways to put the free incident edges into Z
+  and W
+- fragment: an end of the longest path of fixed Z or W edges
+- random: any vertex with free edges
+
+A choice depends on the fixed edges only (a random one is seeded by them,
+ties go to the smallest vertex), so the iterations of a discrepancy search
+see the same branches in the same order.
+
+For directed cycles the branches are the out-arcs of a vertex, and they
+are fixed together, so the candidates are the vertices with free out-arcs;
+for undirected cycles they are the vertices with free edges.
+"""
+
+import math
+import random
+from collections import Counter
+from typing import Iterable, Optional
+
+import networkx as nx
+
+import exceptions
+
+
+class Buckets:
+    """Bucket queue of vertices by keys 0..size-1"""
+
+    def __init__(self, size: int) -> None:
+        self.buckets: list[list] = [[] for _ in range(size)]
+        # vertex: (key, position in the bucket)
+        self.place: dict = {}
+        self.top = 0
+
+    def update(self, vertex: int, key: Optional[int]) -> None:
+        """Moves the vertex to the bucket of the key, None removes it"""
+
+        if vertex in self.place:
+            old, position = self.place.pop(vertex)
+            bucket = self.buckets[old]
+            last = bucket.pop()
+            if last != vertex:
+                bucket[position] = last
+                self.place[last] = (old, position)
+
+        if key is not None:
+            self.place[vertex] = (key, len(self.buckets[key]))
+            self.buckets[key].append(vertex)
+            self.top = max(self.top, key)
+
+    def best(self) -> list:
+        """Gets the bucket of the highest key (empty if there are no vertices)"""
+
+        while self.top > 0 and not self.buckets[self.top]:
+            self.top -= 1
+        return self.buckets[self.top]
+
+
+class Policy:
+    """Chooses the vertex of the highest score, scores are of candidates"""
+
+    def __init__(self, multigraph: nx.MultiGraph) -> None:
+        self.directed = multigraph.is_directed()
+        # fixed edge ends of vertices (of both colours, of Z, out-arcs)
+        self.fixed: Counter = Counter()
+        self.z: Counter = Counter()
+        self.out: Counter = Counter()
+        self.queue = Buckets(self.size(len(multigraph)))
+
+        for u, v, value in multigraph.edges(data=True):
+            for attr in ('fixed_z', 'fixed_w'):
+                if attr in value:
+                    self.count(u, v, attr == 'fixed_z', 1)
+        for vertex in multigraph:
+            self.rescore([vertex])
+
+    def size(self, n: int) -> int:
+        """Number of buckets"""
+
+        return 1
+
+    def score(self, vertex: int) -> int:
+        return 0
+
+    def choose(self, bucket: list) -> int:
+        vertex: int = min(bucket)
+        return vertex
+
+    def is_candidate(self, vertex: int) -> bool:
+        if self.directed:
+            return not self.out[vertex]
+        return self.fixed[vertex] < 4
+
+    def count(self, u: int, v: int, in_z: bool, step: int) -> None:
+        self.fixed[u] += step
+        self.fixed[v] += step
+        if in_z:
+            self.z[u] += step
+            self.z[v] += step
+        if self.directed:
+            self.out[u] += step
+
+    def rescore(self, vertices: Iterable) -> None:
+        for vertex in vertices:
+            self.queue.update(
+                vertex, self.score(vertex) if self.is_candidate(vertex) else None
+            )
+
+    def fix(self, fixed_in_z: set, fixed_in_w: set) -> None:
+        """Takes the edges fixed by a search node into account"""
+
+        for edges, in_z in ((fixed_in_z, True), (fixed_in_w, False)):
+            for u, v in edges:
+                self.count(u, v, in_z, 1)
+        self.rescore({vertex for edge in fixed_in_z | fixed_in_w for vertex in edge})
+
+    def unfix(self, fixed_in_z: set, fixed_in_w: set) -> None:
+        """Reverts `fix` of the edges when the search node is left"""
+
+        for edges, in_z in ((fixed_in_z, True), (fixed_in_w, False)):
+            for u, v in edges:
+                self.count(u, v, in_z, -1)
+        self.rescore({vertex for edge in fixed_in_z | fixed_in_w for vertex in edge})
+
+    def branches(self, multigraph: nx.MultiGraph) -> list:
+        """Gets the edges to fix in Z at the next search node"""
+
+        bucket = self.queue.best()
+        if not bucket:
+            return []
+        vertex = self.choose(bucket)
+
+        if self.directed:
+            return list(multigraph.edges(vertex))
+        return [
+            edge
+            for edge in multigraph.edges(vertex)
+            if all(
+                'fixed_z' not in value and 'fixed_w' not in value
+                for value in multigraph[edge[0]][edge[1]].values()
+            )
+        ]
+
+
+class MostFixed(Policy):
+    def size(self, n: int) -> int:
+        return 4
+
+    def score(self, vertex: int) -> int:
+        return self.fixed[vertex]
+
+
+class FewestOptions(Policy):
+    """Options of a vertex are the ways to choose the free edge ends going to
+    Z: C(free, 2 - in Z) for undirected cycles, 2 for every free pair of
+    arcs (in or out) for directed ones
+    """
+
+    def size(self, n: int) -> int:
+        return 7
+
+    def score(self, vertex: int) -> int:
+        options: int
+        if self.directed:
+            options = 2 ** ((4 - self.fixed[vertex]) // 2)
+        elif self.z[vertex] <= 2:
+            options = math.comb(4 - self.fixed[vertex], 2 - self.z[vertex])
+        else:
+            options = 0
+        return 6 - min(options, 6)
+
+
+class Fragment(Policy):
+    """Paths of fixed edges of a colour keep the other end (mate) and the
+    number of edges at their ends, an inner vertex has no mate
+    """
+
+    def __init__(self, multigraph: nx.MultiGraph) -> None:
+        self.mate: list = [{vertex: vertex for vertex in multigraph} for _ in range(2)]
+        self.length: list = [{vertex: 0 for vertex in multigraph} for _ in range(2)]
+        # (dict, vertex, old value) of the changes and sizes at fix calls
+        self.history: list = []
+        self.sizes: list = []
+        self.touched: set = set()
+        super().__init__(multigraph)
+
+    def size(self, n: int) -> int:
+        return n + 1
+
+    def score(self, vertex: int) -> int:
+        return max(
+            length[vertex] if mate[vertex] is not None else 0
+            for mate, length in zip(self.mate, self.length)
+        )
+
+    def change(self, values: dict, vertex: int, value: Optional[int]) -> None:
+        self.history.append((values, vertex, values[vertex]))
+        values[vertex] = value
+        self.touched.add(vertex)
+
+    def count(self, u: int, v: int, in_z: bool, step: int) -> None:
+        super().count(u, v, in_z, step)
+        if step < 0:
+            return
+
+        mate, length = self.mate[not in_z], self.length[not in_z]
+        a, b = mate[u], mate[v]
+        if a is None or b is None or a == v:
+            # a conflict or a cycle, the node is about to be cut off
+            return
+        joined = length[u] + length[v] + 1
+        for vertex in (u, v):
+            self.change(mate, vertex, None)
+        self.change(mate, a, b)
+        self.change(mate, b, a)
+        self.change(length, a, joined)
+        self.change(length, b, joined)
+
+    def fix(self, fixed_in_z: set, fixed_in_w: set) -> None:
+        self.sizes.append(len(self.history))
+        self.touched = set()
+        super().fix(fixed_in_z, fixed_in_w)
+        self.rescore(self.touched)
+
+    def unfix(self, fixed_in_z: set, fixed_in_w: set) -> None:
+        self.touched = set()
+        size = self.sizes.pop()
+        while len(self.history) > size:
+            values, vertex, value = self.history.pop()
+            values[vertex] = value
+            self.touched.add(vertex)
+        super().unfix(fixed_in_z, fixed_in_w)
+        self.rescore(self.touched)
+
+
+class Random(Policy):
+    """The fixed edges are hashed (XOR of the hashes of the edges and their
+    colours, so unfixing reverts it) into the seed of the choice
+    """
+
+    def __init__(self, multigraph: nx.MultiGraph) -> None:
+        self.state = 0
+        super().__init__(multigraph)
+
+    def count(self, u: int, v: int, in_z: bool, step: int) -> None:
+        super().count(u, v, in_z, step)
+        edge = (u, v) if self.directed else tuple(sorted((u, v)))
+        self.state ^= hash((edge, in_z))
+
+    def choose(self, bucket: list) -> int:
+        vertex: int = random.Random(self.state).choice(sorted(bucket))
+        return vertex
+
+
+policies = {
+    'most_fixed': MostFixed,
+    'fewest_options': FewestOptions,
+    'fragment': Fragment,
+    'random': Random,
+}
+
+
+def get_policy(name: str, multigraph: nx.MultiGraph) -> Policy:
+    if name not in policies:
+        raise exceptions.InputError(
+            'Unknown branching policy {}, use one of: {}'.format(
+                name, ', '.join(policies)
+            )
+        )
+    return policies[name](multigraph)
@@ -0,0 +1,136 @@
+import json
+import os
+import pstats
+from typing import Optional
+
+# phase title: functions (module, function name) attributed to the phase
+phases: dict[str, list[tuple[str, str]]] = {
+    'Graph construction': [
+        ('directed', 'build_multigraph'),
+        ('undirected', 'build_multigraph'),
+    ],
+    'Fixing multiedges': [('utils', 'fix_multiedges')],
+    'Propagation': [('utils', 'fix_edge')],
+    'Cycle checks': [('utils', 'has_cycle')],
+    'Verification': [('utils', 'is_hamiltonian_cycle')],
+    'Branch selection': [
+        ('directed', 'get_next_edges'),
+        ('undirected', 'get_next_edges'),
+    ],
+}
+search_phase = 'Search'
+
+
+def phase_breakdown(stats: pstats.Stats, total: float) -> dict[str, float]:
+    """Attributes the profiled time of one solve to the phases
+
+    Cumulative times are used, so recursive calls (`fix_edge`) are counted
+    once. The time not attributed to any phase is the search itself.
+
+    Args:
+        stats: profile of one solve
+        total: wall time of the solve (in seconds)
+
+    Returns:
+        dict: phase title -> time (in seconds)
+    """
+
+    functions = {
+        (module, name): title
+        for title, items in phases.items()
+        for module, name in items
+    }
+    breakdown = {title: 0.0 for title in phases}
+
+    profiled: dict = stats.stats  # type: ignore
+    for (filename, _, name), (_, _, _, cumulative, _) in profiled.items():
+        module = os.path.splitext(os.path.basename(filename))[0]
+        if (module, name) in functions:
+            breakdown[functions[(module, name)]] += cumulative
+
+    breakdown[search_phase] = max(total - sum(breakdown.values()), 0.0)
+    return breakdown
+
+
+def aggregate(breakdowns: list) -> dict:
+    """Sums per-pair breakdowns by method and number of vertices"""
+
+    result: dict = {}
+    for item in breakdowns:
+        totals = result.setdefault((item['method'], item['n']), {})
+        for title, value in item['phases'].items():
+            totals[title] = totals.get(title, 0.0) + value
+    return result
+
+
+def write_speedscope(path: str, breakdowns: list, titles: dict) -> None:
+    """Writes the phases as a speedscope sampled profile (one per method and n)
+
+    Args:
+        path: path to the written file
+        breakdowns: per-pair breakdowns
+        titles: method -> title
+    """
+
+    frames: list = []
+    frame_ids: dict[str, int] = {}
+
+    def frame(name: str) -> int:
+        if name not in frame_ids:
+            frame_ids[name] = len(frames)
+            frames.append({'name': name})
+        return frame_ids[name]
+
+    profiles = []
+    for (method, n), totals in sorted(aggregate(breakdowns).items()):
+        samples, weights = [], []
+        for title, value in totals.items():
+            samples.append([frame(titles[method]), frame(title)])
+            weights.append(int(value * 10**9))
+        profiles.append(
+            {
+                'type': 'sampled',
+                'name': titles[method] + ' on ' + str(n) + ' vertices',
+                'unit': 'nanoseconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights,
+            }
+        )
+
+    with open(path, 'w') as file:
+        json.dump(
+            {
+                '$schema': 'https://www.speedscope.app/file-format-schema.json',
+                'shared': {'frames': frames},
+                'profiles': profiles,
+                'name': 'backtracking phases',
+            },
+            file,
+        )
+
+
+def write_profile(
+    prefix: str, stats: Optional[pstats.Stats], breakdowns: list, titles: dict
+) -> list:
+    """Writes the aggregated pstats profile, the speedscope profile and
+    the per-pair breakdown
+
+    Returns:
+        list: paths of the written files
+    """
+
+    paths = []
+    if stats is not None:
+        stats.dump_stats(prefix + '.prof')
+        paths.append(prefix + '.prof')
+
+    write_speedscope(prefix + '.speedscope.json', breakdowns, titles)
+    paths.append(prefix + '.speedscope.json')
+
+    with open(prefix + '.phases.json', 'w') as file:
+        json.dump(breakdowns, file, indent=2)
+    paths.append(prefix + '.phases.json')
+
+    return paths
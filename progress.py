@@ -0,0 +1,96 @@
+import sys
+import threading
+from time import monotonic
+from typing import IO, Optional
+
+
+class Progress:
+    """Single updating progress line with throughput, ETA and counts
+
+    The line is redrawn at most once per `interval` seconds, so updating
+    it after every test costs a clock read. Updates are thread-safe.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        title: str = '',
+        interval: float = 0.25,
+        stream: Optional[IO[str]] = None,
+    ) -> None:
+        self.total = total
+        self.title = title
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.found = 0
+        self.not_found = 0
+        self.exceeded = 0
+        self.start_time = monotonic()
+        self.drawn_time = 0.0
+        self.width = 0
+        self.lock = threading.Lock()
+
+    @property
+    def done(self) -> int:
+        return self.found + self.not_found + self.exceeded
+
+    def update(self, result: Optional[bool]) -> None:
+        """Counts a completed test
+
+        Args:
+            result: True if found, False if not found, None if the test was
+                not completed (the time limit was exceeded or an error)
+        """
+
+        with self.lock:
+            if result is None:
+                self.exceeded += 1
+            elif result:
+                self.found += 1
+            else:
+                self.not_found += 1
+
+            now = monotonic()
+            if now - self.drawn_time >= self.interval or self.done == self.total:
+                self.drawn_time = now
+                self.draw(now)
+
+    def render(self, now: float) -> str:
+        elapsed = now - self.start_time
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate else 0.0
+        return (
+            '{title} {done}/{total} | {rate:.1f} pairs/s | ETA {eta:.0f}s | '
+            'found {found}, not found {not_found}, limit exceeded {exceeded}'
+        ).format(
+            title=self.title,
+            done=self.done,
+            total=self.total,
+            rate=rate,
+            eta=eta,
+            found=self.found,
+            not_found=self.not_found,
+            exceeded=self.exceeded,
+        )
+
+    def draw(self, now: float) -> None:
+        line = self.render(now)
+        self.stream.write('\r' + line.ljust(self.width))
+        self.stream.flush()
+        self.width = len(line)
+
+    def message(self, text: str) -> None:
+        """Prints the text on a line of its own above the progress line"""
+
+        with self.lock:
+            self.stream.write('\r' + ' ' * self.width + '\r' + text + '\n')
+            self.width = 0
+            self.draw(monotonic())
+
+    def close(self) -> None:
+        """Draws the final state and ends the line"""
+
+        with self.lock:
+            self.draw(monotonic())
+            self.stream.write('\n')
+            self.stream.flush()
@@ -0,0 +1,219 @@
+import os
+import sys
+from argparse import ArgumentParser
+from collections.abc import Iterable
+from typing import Optional
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy  # noqa: E402
+from matplotlib.collections import LineCollection  # noqa: E402
+
+import exceptions  # noqa: E402
+from main import funcs  # noqa: E402
+from utils import import_from_file  # noqa: E402
+
+# the same colours as in utils.show
+colors = {
+    'z': '#FF0000',
+    'w': '#0000FF',
+    'both': '#FF00FF',
+    'x': '#000000',
+    'y': '#A0A0A0',
+}
+
+
+class Renderer:
+    """Headless renderer of a pair and its decomposition
+
+    The figure and its artists are created once and reused for every pair,
+    edges are drawn as a single LineCollection.
+    """
+
+    def __init__(self, size: float = 12, dpi: int = 100, labels_limit: int = 64):
+        self.figure = plt.figure(figsize=(size, size), dpi=dpi)
+        self.axes = self.figure.add_axes((0, 0, 1, 1))
+        self.axes.set_xlim(-1.1, 1.1)
+        self.axes.set_ylim(-1.1, 1.1)
+        self.axes.set_aspect('equal')
+        self.axes.axis('off')
+        self.labels_limit = labels_limit
+
+        self.edges = LineCollection([], linewidths=1, alpha=0.8)
+        self.axes.add_collection(self.edges)
+        self.nodes = self.axes.scatter([], [], s=20, c='#1F78B4', zorder=2)
+        self.labels: list = []
+        self.title = self.axes.text(0, 1.07, '', ha='center', fontsize=14)
+
+    def render(
+        self,
+        path: str,
+        graph_x: Iterable,
+        graph_y: Iterable,
+        z_edges: Optional[set] = None,
+        w_edges: Optional[set] = None,
+        title: str = '',
+    ) -> None:
+        """Writes the union of X and Y (or of Z and W if they are passed) to
+        the file, the format is chosen by the extension (png, svg, ...)
+        """
+
+        x, y = numpy.asarray(graph_x), numpy.asarray(graph_y)
+        n = len(x)
+
+        # circular layout in the order of vertex numbers
+        vertices = numpy.sort(x)
+        angles = 2 * numpy.pi * numpy.arange(n) / n
+        points = numpy.column_stack((numpy.cos(angles), numpy.sin(angles)))
+        index = numpy.zeros(int(vertices[-1]) + 1, dtype=numpy.int64)
+        index[vertices] = numpy.arange(n)
+
+        if z_edges is not None and w_edges is not None:
+            both = z_edges & w_edges
+            groups = [
+                (numpy.array(sorted(z_edges - both)), colors['z']),
+                (numpy.array(sorted(w_edges - both)), colors['w']),
+                (numpy.array(sorted(both)), colors['both']),
+            ]
+        else:
+            groups = [
+                (numpy.column_stack((x, numpy.roll(x, -1))), colors['x']),
+                (numpy.column_stack((y, numpy.roll(y, -1))), colors['y']),
+            ]
+
+        segments, segment_colors = [], []
+        for edges, color in groups:
+            if len(edges):
+                segments.append(points[index[edges]])
+                segment_colors += [color] * len(edges)
+
+        self.edges.set_segments(list(numpy.concatenate(segments)) if segments else [])
+        self.edges.set_color(segment_colors)
+        self.edges.set_linewidth(2 if n <= self.labels_limit else 0.5)
+        # antialiasing thousands of long chords dominates the drawing time
+        self.edges.set_antialiased(n <= self.labels_limit)
+        self.nodes.set_offsets(points)
+        self.nodes.set_sizes([200 if n <= self.labels_limit else 2])
+
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        if n <= self.labels_limit:
+            self.labels = [
+                self.axes.text(
+                    point[0], point[1], str(vertex), ha='center', va='center'
+                )
+                for vertex, point in zip(vertices.tolist(), points)
+            ]
+        self.title.set_text(title)
+
+        if path.endswith('.png'):
+            self.figure.savefig(path, pil_kwargs={'compress_level': 1})
+        else:
+            self.figure.savefig(path)
+
+    def close(self) -> None:
+        plt.close(self.figure)
+
+
+def render_batch(
+    pairs: Iterable,
+    directory: str,
+    method: Optional[int] = None,
+    image_format: str = 'png',
+    prefix: str = 'pair',
+) -> list:
+    """Renders many pairs in one process with one reused figure
+
+    Args:
+        pairs: 2-tuple x, y graphs
+        directory: directory for the written files
+        method: method to find the decomposition with (the pair only if None)
+        image_format: png, svg or any other format supported by matplotlib
+        prefix: prefix of the file names
+
+    Returns:
+        list: paths of the written files
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    renderer = Renderer()
+    paths = []
+
+    try:
+        for idx, (graph_x, graph_y) in enumerate(pairs, start=1):
+            solution: dict = {}
+            title = str(len(graph_x)) + ' vertices'
+            if method is not None:
+                found = funcs[method]['func'](graph_x, graph_y, solution=solution)
+                title += ', ' + funcs[method]['title'].lower() + ': '
+                title += 'found' if found else 'not found'
+
+            path = os.path.join(directory, prefix + str(idx) + '.' + image_format)
+            renderer.render(
+                path,
+                graph_x,
+                graph_y,
+                z_edges=solution.get('z'),
+                w_edges=solution.get('w'),
+                title=title,
+            )
+            paths.append(path)
+    finally:
+        renderer.close()
+
+    return paths
+
+
+def parse_arguments() -> dict:
+    parser = ArgumentParser()
+    parser.add_argument("--path", dest="path", help="Path to the file with tests")
+    parser.add_argument("--times", dest="times", help="How many pairs to render")
+    parser.add_argument(
+        "--method",
+        dest="method",
+        help="Method to find the decomposition with (only pairs are drawn if not set)",
+    )
+    parser.add_argument(
+        "--output-dir", dest="directory", help="Output directory", default='images'
+    )
+    parser.add_argument(
+        "--format", dest="format", help="Image format (png, svg, ...)", default='png'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if not args.path:
+            raise exceptions.InputError(
+                'Set required parameter "--path"! Run "render.py -h" to see the help.'
+            )
+    except exceptions.InputError as e:
+        print(e.message)
+        exit()
+
+    return {
+        'path': args.path,
+        'times': int(args.times) if args.times else None,
+        'method': int(args.method) if args.method else None,
+        'directory': args.directory,
+        'format': args.format,
+    }
+
+
+if __name__ == '__main__':
+    configuration = parse_arguments()
+    graphs = import_from_file(configuration['path'])[: configuration['times']]
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(graphs[0][0]) * 10))
+
+    for path in render_batch(
+        graphs,
+        configuration['directory'],
+        method=configuration['method'],
+        image_format=configuration['format'],
+        prefix=os.path.splitext(os.path.basename(configuration['path']))[0] + '_',
+    ):
+        print(path)
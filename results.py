@@ -0,0 +1,142 @@
+"""Streaming writers of per-test results
+
+The format is chosen by the extension of the path: .jsonl, .csv or .parquet
+(requires pyarrow). Rows are buffered and written in bulk.
+"""
+
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+import exceptions
+
+columns = ['pack', 'method', 'n', 'pair', 'result', 'wall_time', 'cpu_time', 'timeout']
+
+
+class Writer(ABC):
+    """Buffers rows and writes them every `buffer_size` rows and on close"""
+
+    def __init__(self, path: str, buffer_size: int = 1000) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self.rows: list[dict] = []
+
+    def write(self, row: dict) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.rows:
+            self.write_rows(self.rows)
+            self.rows = []
+
+    @abstractmethod
+    def write_rows(self, rows: list[dict]) -> None:
+        """Writes the buffered rows to the file"""
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'Writer':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class JsonLinesWriter(Writer):
+    def __init__(self, path: str, buffer_size: int = 1000) -> None:
+        super().__init__(path, buffer_size)
+        self.file = open(path, 'w')
+
+    def write_rows(self, rows: list[dict]) -> None:
+        self.file.write(
+            ''.join(
+                json.dumps({key: row.get(key) for key in columns}) + '\n'
+                for row in rows
+            )
+        )
+        self.file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+
+class CsvWriter(Writer):
+    def __init__(self, path: str, buffer_size: int = 1000) -> None:
+        super().__init__(path, buffer_size)
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.DictWriter(self.file, columns, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write_rows(self, rows: list[dict]) -> None:
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self) -> None:
+        super().close()
+        self.file.close()
+
+
+class ParquetWriter(Writer):
+    """Writes every flushed buffer as a row group"""
+
+    def __init__(self, path: str, buffer_size: int = 1000) -> None:
+        super().__init__(path, buffer_size)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise exceptions.InputError(
+                'Install pyarrow to write results to .parquet files!'
+            )
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema(
+            [
+                ('pack', pyarrow.string()),
+                ('method', pyarrow.int8()),
+                ('n', pyarrow.int32()),
+                ('pair', pyarrow.int32()),
+                ('result', pyarrow.bool_()),
+                ('wall_time', pyarrow.float64()),
+                ('cpu_time', pyarrow.float64()),
+                ('timeout', pyarrow.bool_()),
+            ]
+        )
+        self.writer: Optional[Any] = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write_rows(self, rows: list[dict]) -> None:
+        assert self.writer is not None
+        self.writer.write_table(
+            self.pyarrow.Table.from_pylist(rows, schema=self.schema)
+        )
+
+    def close(self) -> None:
+        super().close()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+writers: dict[str, type[Writer]] = {
+    '.jsonl': JsonLinesWriter,
+    '.csv': CsvWriter,
+    '.parquet': ParquetWriter,
+}
+
+
+def open_writer(path: str, buffer_size: int = 1000) -> Writer:
+    extension = os.path.splitext(path)[1]
+    if extension not in writers:
+        raise exceptions.InputError(
+            'Unknown results format "'
+            + extension
+            + '"! Use one of: '
+            + ', '.join(writers)
+        )
+    return writers[extension](path, buffer_size)
@@ -0,0 +1,206 @@
+"""Decomposition by a SAT solver with lazily added subtour cuts
+
+Every edge of only one of X and Y is a variable (true - the edge is in Z,
+false - in W), an edge of both is in Z and W. The CNF has degree
+constraints of every vertex and Z != X, Z != Y (so W != Y, W != X). Models
+whose Z or W consist of several cycles are cut off by clauses requiring
+an edge of the colour to leave the vertex set of a short cycle, until a
+model of two Hamiltonian cycles is found or the formula is unsatisfiable.
+
+Requires python-sat (`pip install python-sat`).
+"""
+
+import itertools
+from collections import Counter
+from typing import Any, Optional
+
+import exceptions
+import utils
+
+solver_name = 'cadical153'
+
+
+def exactly(literals: list, number: int) -> list:
+    """Clauses for exactly `number` of the literals are true"""
+
+    clauses = [
+        [-literal for literal in subset]
+        for subset in itertools.combinations(literals, number + 1)
+    ]
+    clauses += [
+        list(subset)
+        for subset in itertools.combinations(literals, len(literals) - number + 1)
+    ]
+    return clauses
+
+
+def encode(graph_x: list, graph_y: list, directed: bool) -> tuple[list, dict, set]:
+    """Encodes the colouring of the union of X and Y
+
+    Returns:
+        tuple: clauses, variables of single edges, doubled edges
+    """
+
+    def edges(graph: list) -> list:
+        return [
+            (
+                (graph[idx - 1], graph[idx])
+                if directed
+                else tuple(sorted((graph[idx - 1], graph[idx])))
+            )
+            for idx in range(len(graph))
+        ]
+
+    x_edges, y_edges = edges(graph_x), edges(graph_y)
+    doubled = set(x_edges) & set(y_edges)
+    variables = {
+        edge: number
+        for number, edge in enumerate(
+            [edge for edge in x_edges + y_edges if edge not in doubled], start=1
+        )
+    }
+
+    clauses = []
+    groups: dict = {}
+    for (u, v), variable in variables.items():
+        if directed:
+            groups.setdefault(('out', u), []).append(variable)
+            groups.setdefault(('in', v), []).append(variable)
+        else:
+            groups.setdefault(u, []).append(variable)
+            groups.setdefault(v, []).append(variable)
+    for literals in groups.values():
+        # the single edges of a vertex take the half of its degree in Z
+        clauses += exactly(literals, len(literals) // 2)
+
+    for first, second in ((x_edges, y_edges), (y_edges, x_edges)):
+        clauses.append(
+            [-variables[edge] for edge in first if edge in variables]
+            + [variables[edge] for edge in second if edge in variables]
+        )
+
+    # Z and W are interchangeable
+    if variables:
+        clauses.append([1])
+
+    return clauses, variables, doubled
+
+
+def components(edges: set, directed: bool) -> list:
+    """Splits a graph with all degrees 2 (in- and out-degrees 1) into cycles
+
+    Returns:
+        list: vertex sets of the cycles
+    """
+
+    neighbors: dict = {}
+    for u, v in edges:
+        neighbors.setdefault(u, []).append(v)
+        if not directed:
+            neighbors.setdefault(v, []).append(u)
+
+    cycles, seen = [], set()
+    for start in neighbors:
+        if start in seen:
+            continue
+        cycle, stack = set(), [start]
+        while stack:
+            vertex = stack.pop()
+            if vertex not in cycle:
+                cycle.add(vertex)
+                stack.extend(neighbors[vertex])
+        seen |= cycle
+        cycles.append(cycle)
+    return cycles
+
+
+@utils.timeout('SAT with subtour cuts')
+def next_model(solver: Any, counters: Optional[Counter] = None, **kwargs: Any) -> Any:
+    if counters is not None:
+        counters['leaves'] += 1
+    return solver.get_model() if solver.solve() else None
+
+
+def decomposition(
+    graph_x: list,
+    graph_y: list,
+    directed: bool,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    try:
+        from pysat.solvers import Solver
+    except ImportError:
+        raise exceptions.InputError(
+            'Install python-sat to use the SAT method: pip install python-sat'
+        )
+
+    clauses, variables, doubled = encode(graph_x, graph_y, directed)
+    n = len(graph_x)
+
+    with Solver(name=solver_name, bootstrap_with=clauses) as solver:
+        while True:
+            model = next_model(
+                solver,
+                counters=counters,
+                timeout=timeout,
+                global_timeout=global_timeout,
+            )
+            if model is None:
+                return False
+
+            values = set(literal for literal in model if literal > 0)
+            z_edges = doubled | {e for e, var in variables.items() if var in values}
+            w_edges = doubled | {e for e, var in variables.items() if var not in values}
+
+            found = True
+            for edges, sign in ((z_edges, 1), (w_edges, -1)):
+                cycles = components(edges, directed)
+                if len(cycles) == 1 and len(cycles[0]) == n:
+                    continue
+                found = False
+                for cycle in cycles:
+                    # an edge of the colour must leave the vertices of the cycle
+                    solver.add_clause(
+                        [
+                            sign * variable
+                            for (u, v), variable in variables.items()
+                            if (u in cycle) != (v in cycle)
+                            and (not directed or u in cycle)
+                        ]
+                    )
+                    if counters is not None:
+                        counters['cycle_prunes'] += 1
+
+            if found:
+                if solution is not None:
+                    solution['z'], solution['w'] = z_edges, w_edges
+                return True
+
+
+def directed_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, True, timeout, global_timeout, counters, solution
+    )
+
+
+def undirected_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    return decomposition(
+        graph_x, graph_y, False, timeout, global_timeout, counters, solution
+    )
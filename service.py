@@ -0,0 +1,293 @@
+"""Long-running solver service
+
+Frames (all integers are big-endian):
+
+- a batch of requests: u32 length of the rest of the frame, u32 number of
+  requests, then every request as u8 method, f64 timeout in seconds
+  (0 - with no limit), u32 number of vertices n, n u32 vertices of X and
+  n u32 vertices of Y;
+- a result, streamed as soon as it is ready: u32 index of the request in
+  its batch, u8 status, u64 runtime in nanoseconds.
+
+A connection may send any number of batches, results of a batch are sent
+before the next batch is read.
+
+Requests are solved by warm worker processes (see workers.Worker): a worker
+whose process died is started again, and a search running longer than the
+hard timeout (the soft one plus `grace` seconds by default) is killed with
+the timeout status.
+"""
+
+import os
+import queue
+import socket
+import socketserver
+import struct
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Optional
+
+import workers
+from workers import (  # noqa: F401
+    ERROR,
+    FAILURE,
+    FOUND,
+    NOT_FOUND,
+    TIMEOUT,
+    statuses,
+    warm_up,
+)
+
+frame_header = struct.Struct('!I')
+request_header = struct.Struct('!BdI')
+result_frame = struct.Struct('!IBQ')
+
+# seconds after the soft timeout at which a search is killed
+grace = 1.0
+
+
+def encode_batch(requests: list) -> bytes:
+    """Encodes a batch of (graph_x, graph_y, method, timeout) requests"""
+
+    parts = [frame_header.pack(len(requests))]
+    for graph_x, graph_y, method, timeout in requests:
+        n = len(graph_x)
+        parts.append(request_header.pack(method, timeout or 0, n))
+        parts.append(struct.pack('!%dI' % (2 * n), *graph_x, *graph_y))
+
+    payload = b''.join(parts)
+    return frame_header.pack(len(payload)) + payload
+
+
+def decode_batch(payload: bytes) -> list:
+    (count,) = frame_header.unpack_from(payload, 0)
+    offset = frame_header.size
+    requests = []
+    for _ in range(count):
+        method, timeout, n = request_header.unpack_from(payload, offset)
+        offset += request_header.size
+        vertices = struct.unpack_from('!%dI' % (2 * n), payload, offset)
+        offset += 4 * 2 * n
+        requests.append((vertices[:n], vertices[n:], method, timeout or None))
+    return requests
+
+
+def receive_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+    chunks, left = [], size
+    while left:
+        chunk = connection.recv(min(left, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        left -= len(chunk)
+    return b''.join(chunks)
+
+
+class Pool:
+    """Worker processes shared by all connections, one request at a time
+    in every worker
+    """
+
+    def __init__(self, size: Optional[int], hard_timeout: Optional[float]) -> None:
+        """
+        Args:
+            size: number of worker processes (the number of CPUs by default)
+            hard_timeout: runtime threshold of a request (in seconds) at which
+                its worker is killed, the soft timeout plus `grace` by default
+        """
+
+        self.hard_timeout = hard_timeout
+        self.workers = [workers.Worker() for _ in range(size or os.cpu_count() or 1)]
+        self.idle: queue.Queue = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+        self.executor = ThreadPoolExecutor(max_workers=len(self.workers))
+
+    def solve(
+        self, graph_x: tuple, graph_y: tuple, method: int, timeout: Optional[float]
+    ) -> tuple[int, int]:
+        """Runs one request in an idle worker process
+
+        Returns:
+            tuple: status and runtime in nanoseconds
+        """
+
+        deadline = self.hard_timeout
+        if deadline is None and timeout:
+            deadline = timeout + grace
+
+        worker = self.idle.get()
+        try:
+            status, runtime, _, _ = worker.run(
+                graph_x, graph_y, method, timeout, deadline
+            )
+        except Exception:
+            # e.g. the pipe of the process broke, the next request gets a new one
+            worker.restart()
+            raise
+        finally:
+            self.idle.put(worker)
+        return status, runtime
+
+    def submit(self, *request: Any) -> Future:
+        return self.executor.submit(self.solve, *request)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+        for worker in self.workers:
+            worker.close()
+
+
+class Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        pool: Pool = self.server.pool  # type: ignore
+        while True:
+            header = receive_exactly(self.request, frame_header.size)
+            if header is None:
+                return
+            payload = receive_exactly(self.request, frame_header.unpack(header)[0])
+            if payload is None:
+                return
+
+            futures = {
+                pool.submit(*request): idx
+                for idx, request in enumerate(decode_batch(payload))
+            }
+            for future in as_completed(futures):
+                try:
+                    status, runtime = future.result()
+                except Exception:
+                    status, runtime = FAILURE, 0
+                self.request.sendall(
+                    result_frame.pack(futures[future], status, runtime)
+                )
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def parse_address(address: str) -> tuple[int, Any]:
+    """Gets socket family and address: "host:port" or a Unix socket path"""
+
+    if ':' in address and not address.startswith(('/', '.')):
+        host, port = address.rsplit(':', 1)
+        return socket.AF_INET, (host, int(port))
+    return socket.AF_UNIX, address
+
+
+def create_server(
+    address: str, workers: Optional[int] = None, hard_timeout: Optional[float] = None
+) -> socketserver.BaseServer:
+    family, parsed = parse_address(address)
+    server: socketserver.BaseServer
+    if family == socket.AF_UNIX:
+        if os.path.exists(address):
+            os.remove(address)
+        server = UnixServer(address, Handler)
+    else:
+        server = TCPServer(parsed, Handler)
+
+    server.pool = Pool(workers, hard_timeout)  # type: ignore
+    return server
+
+
+def solve_batch(address: str, requests: list) -> Iterator[tuple[int, int, int]]:
+    """Sends a batch of (graph_x, graph_y, method, timeout) requests to
+    the service
+
+    Returns:
+        Iterator: index of the request, status and runtime in nanoseconds
+        in order of completion
+    """
+
+    family, parsed = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as connection:
+        connection.connect(parsed)
+        connection.sendall(encode_batch(requests))
+        for _ in range(len(requests)):
+            frame = receive_exactly(connection, result_frame.size)
+            if frame is None:
+                raise ConnectionError('The service closed the connection')
+            index, status, runtime = result_frame.unpack(frame)
+            yield index, status, runtime
+
+
+def parse_arguments() -> dict:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--address",
+        dest="address",
+        help='Unix socket path or "host:port"',
+        default='/tmp/backtracking.sock',
+    )
+    parser.add_argument(
+        "--workers", dest="workers", help="Number of worker processes (all CPUs)"
+    )
+    parser.add_argument(
+        "--hard-timeout",
+        dest="hard_timeout",
+        help="Runtime threshold for one test (in seconds) at which its worker "
+        "process is killed (the soft timeout plus 1 second by default)",
+    )
+    parser.add_argument(
+        "--path",
+        dest="path",
+        help="Send the tests from the file to the running service instead",
+    )
+    parser.add_argument("--method", dest="method", help="Method to run", default='3')
+    parser.add_argument(
+        "--timeout", dest="timeout", help="Runtime threshold for one test (in seconds)"
+    )
+
+    args = parser.parse_args()
+
+    return {
+        'address': args.address,
+        'workers': int(args.workers) if args.workers else None,
+        'hard_timeout': float(args.hard_timeout) if args.hard_timeout else None,
+        'path': args.path,
+        'methods': list(map(int, args.method.split(','))),
+        'timeout': float(args.timeout) if args.timeout else None,
+    }
+
+
+if __name__ == '__main__':
+    configuration = parse_arguments()
+
+    if configuration['path']:
+        from utils import import_from_file
+
+        requests = [
+            (graph_x, graph_y, method, configuration['timeout'])
+            for method in configuration['methods']
+            for graph_x, graph_y in import_from_file(configuration['path'])
+        ]
+        for index, status, runtime in solve_batch(configuration['address'], requests):
+            print(
+                index,
+                'method',
+                requests[index][2],
+                statuses[status],
+                round(runtime / 10**9, 6),
+            )
+    else:
+        server = create_server(
+            configuration['address'],
+            configuration['workers'],
+            configuration['hard_timeout'],
+        )
+        print('Serving on', configuration['address'])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            server.pool.shutdown()  # type: ignore
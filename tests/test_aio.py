@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+import aio
+import exceptions
+import undirected
+from utils import import_from_file
+
+pairs = [
+    ([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2]),
+    ([6, 3, 2, 4, 5, 1, 7], [7, 4, 5, 2, 1, 6, 3]),
+    ([2, 4, 1, 7, 6, 5, 3], [7, 1, 6, 5, 2, 3, 4]),
+    ([1, 2, 3], [1, 2, 3, 4]),
+]
+
+
+def test_solve_all():
+    async def solve_all() -> list:
+        async with aio.Solver(workers=2) as solver:
+            return await solver.solve_all(pairs * 10, method=3)
+
+    results = asyncio.run(solve_all())
+
+    expected = [undirected.chain_edge_fixing(x, y) for x, y in pairs[:3]]
+    for idx in range(0, 40, 4):
+        assert results[idx : idx + 3] == expected
+        assert isinstance(results[idx + 3], exceptions.InputError)
+
+
+def test_deadline_and_cancellation():
+    graph_x, graph_y = import_from_file('../examples/test512.txt')[0]
+
+    async def solve() -> tuple:
+        async with aio.Solver(workers=1) as solver:
+            start_time = time.perf_counter()
+            with pytest.raises(exceptions.SingleTestTimeoutExceeded):
+                await solver.solve(graph_x, graph_y, method=0, deadline=0.5)
+
+            task = asyncio.ensure_future(solver.solve(graph_x, graph_y, method=0))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # the killed worker is replaced by a new one
+            found = await solver.solve(*pairs[0], method=3)
+            return found, time.perf_counter() - start_time
+
+    found, runtime = asyncio.run(solve())
+
+    assert found == undirected.chain_edge_fixing(*pairs[0])
+    assert runtime < 5
@@ -0,0 +1,60 @@
+import pytest
+
+import benchmark
+
+
+def test_fit_scaling():
+    fit = benchmark.fit_scaling([32, 64, 128], [0.5, 2.0, 8.0])
+
+    assert fit['exponent'] == pytest.approx(2)
+    assert fit['coefficient'] == pytest.approx(0.5 / 32**2)
+
+
+def test_run():
+    report = benchmark.run(
+        {
+            'paths': ['../examples/test32.txt'],
+            'methods': [2, 3],
+            'times': 3,
+            'timeout': 60,
+            'stop_ratio': 0.5,
+            'output': None,
+        }
+    )
+
+    assert [record['id'] for record in report['results']] == [
+        'test32:0',
+        'test32:1',
+        'test32:2',
+    ] * 2
+    assert [
+        record['result'] for record in report['results'] if record['method'] == 2
+    ] == [True, False, True]
+    assert [row['pairs'] for row in report['summary']] == [3, 3]
+
+
+def test_run_policies():
+    report = benchmark.run(
+        {
+            'paths': ['../examples/test32.txt'],
+            'methods': [2, 10],
+            'times': 3,
+            'timeout': 60,
+            'stop_ratio': 0.5,
+            'output': None,
+            'policies': [None, 'fragment'],
+        }
+    )
+
+    policy_results = [
+        record['result'] for record in report['results'] if record['policy']
+    ]
+
+    assert [row['variant'] for row in report['summary']] == ['2', '2:fragment', '10']
+    assert policy_results == [True, False, True]
+    assert set(report['scaling']) == {'2', '2:fragment', '10'}
+
+
+@pytest.mark.parametrize('module', benchmark.light_modules)
+def test_light_imports(module):
+    assert benchmark.import_time(module, repeat=1)['heavy'] == []
@@ -0,0 +1,75 @@
+import random
+from collections import Counter
+
+import pytest
+
+import bitmask
+import directed
+import exceptions
+import frontier
+import undirected
+from test_frontier import cycle_edges, is_hamiltonian
+from utils import import_from_file
+
+
+def test_bits():
+    assert bitmask.bits(0b101001) == [0, 3, 5]
+    assert bitmask.bits(0) == []
+
+
+def test_short_cycle():
+    instance = bitmask.Instance([0, 1, 2, 3], [0, 2, 1, 3], True)
+    x_bits = (1 << len(instance.single) // 2) - 1
+
+    # X alone is the Hamiltonian cycle, 1->2 and 2->1 are a short one
+    assert not instance.short_cycle(x_bits)
+    assert instance.short_cycle(
+        sum(
+            1 << bit
+            for bit, edge in enumerate(instance.single)
+            if edge in ((1, 2), (2, 1))
+        )
+    )
+
+
+@pytest.mark.parametrize('is_directed', [True, False])
+def test_decomposition(is_directed):
+    rng = random.Random(5)
+    for _ in range(200):
+        n = rng.randint(4, 10)
+        graph_x, graph_y = rng.sample(range(n), n), rng.sample(range(n), n)
+        x_edges = cycle_edges(graph_x, is_directed)
+        y_edges = cycle_edges(graph_y, is_directed)
+        if x_edges == y_edges:
+            continue
+        solution = {}
+
+        result = bitmask.decomposition(graph_x, graph_y, is_directed, solution=solution)
+
+        assert result == (
+            frontier.count_decompositions(graph_x, graph_y, is_directed) > 1
+        )
+        if result:
+            assert is_hamiltonian(solution['z'], n, is_directed)
+            assert is_hamiltonian(solution['w'], n, is_directed)
+            assert solution['z'] not in (x_edges, y_edges)
+            assert Counter(solution['z']) + Counter(solution['w']) == Counter(
+                x_edges
+            ) + Counter(y_edges)
+
+
+@pytest.mark.parametrize(
+    'func, reference',
+    [
+        (bitmask.directed_decomposition, directed.chain_edge_fixing),
+        (bitmask.undirected_decomposition, undirected.chain_edge_fixing),
+    ],
+)
+def test_examples(func, reference):
+    for graph_x, graph_y in import_from_file('../examples/test48.txt')[:10]:
+        assert func(graph_x, graph_y) == reference(graph_x, graph_y)
+
+
+def test_too_many_vertices():
+    with pytest.raises(exceptions.InputError):
+        bitmask.directed_decomposition(list(range(65)), list(range(64, -1, -1)))
@@ -0,0 +1,57 @@
+import pytest
+
+import compare
+
+configuration = {'threshold': 0.1, 'confidence': 0.95, 'resamples': 500, 'seed': 0}
+
+
+def group(times, results=None):
+    return {
+        (2, 32): {
+            'test32:{}'.format(idx): {
+                'time': time,
+                'timeout': False,
+                'result': results[idx] if results else True,
+            }
+            for idx, time in enumerate(times)
+        }
+    }
+
+
+@pytest.mark.parametrize('factor,expected', [(1.0, False), (1.05, False), (2.0, True)])
+def test_regression(factor, expected):
+    baseline = [0.01 * (idx % 7 + 1) for idx in range(30)]
+    rows = compare.compare(
+        group(baseline), group([time * factor for time in baseline]), configuration
+    )
+
+    assert rows[0]['regression'] is expected
+    assert rows[0]['ratio'] == pytest.approx(factor)
+
+
+def test_result_mismatch():
+    rows = compare.compare(
+        group([1, 1, 1], [True, True, False]),
+        group([1, 1, 1], [True, False, False]),
+        configuration,
+    )
+
+    assert rows[0]['mismatches'] == ['test32:1']
+
+
+def test_missing_group():
+    baseline = group([1, 1, 1])
+    baseline[(3, 64)] = group([1, 1])[(2, 32)]
+    rows = compare.compare(baseline, group([1, 1, 1]), configuration)
+
+    assert [compare.status(row) for row in rows] == ['OK', 'MISSING']
+    assert rows[1]['missing'] == ['test32:0', 'test32:1']
+
+
+def test_new_timeouts():
+    current = group([1, 1, 1])
+    current[(2, 32)]['test32:2']['timeout'] = True
+    rows = compare.compare(group([1, 1, 1]), current, configuration)
+
+    assert rows[0]['new_timeouts'] == 1
+    assert compare.status(rows[0]) == 'NEW TIMEOUTS'
@@ -0,0 +1,92 @@
+import itertools
+import random
+
+import pytest
+
+import directed
+import frontier
+import undirected
+
+
+def is_hamiltonian(edges, n, is_directed):
+    successors = {}
+    for u, v in edges:
+        successors.setdefault(u, []).append(v)
+        if not is_directed:
+            successors.setdefault(v, []).append(u)
+    if len(edges) != n or len(successors) != n:
+        return False
+    if any(len(item) != (1 if is_directed else 2) for item in successors.values()):
+        return False
+
+    previous, current, length = None, next(iter(successors)), 0
+    start = current
+    while True:
+        following = list(successors[current])
+        if not is_directed and previous is not None:
+            following.remove(previous)
+        previous, current, length = current, following[0], length + 1
+        if current == start or length > n:
+            return current == start and length == n
+
+
+def cycle_edges(graph, is_directed):
+    return {
+        (
+            (graph[idx - 1], graph[idx])
+            if is_directed
+            else tuple(sorted((graph[idx - 1], graph[idx])))
+        )
+        for idx in range(len(graph))
+    }
+
+
+def brute_force_count(graph_x, graph_y, is_directed):
+    x_edges = cycle_edges(graph_x, is_directed)
+    y_edges = cycle_edges(graph_y, is_directed)
+    doubled, single = x_edges & y_edges, sorted(x_edges ^ y_edges)
+    count = 0
+    for colors in itertools.product((0, 1), repeat=len(single)):
+        z_edges = doubled | {edge for edge, color in zip(single, colors) if color}
+        w_edges = doubled | {edge for edge, color in zip(single, colors) if not color}
+        count += is_hamiltonian(z_edges, len(graph_x), is_directed) and is_hamiltonian(
+            w_edges, len(graph_x), is_directed
+        )
+    return count // 2 if single else count
+
+
+@pytest.mark.parametrize('is_directed', [True, False])
+def test_count_decompositions(is_directed):
+    rng = random.Random(0)
+    for _ in range(30):
+        graph_x = rng.sample(range(1, 7), 6)
+        graph_y = rng.sample(range(1, 7), 6)
+        assert frontier.count_decompositions(
+            graph_x, graph_y, is_directed
+        ) == brute_force_count(graph_x, graph_y, is_directed)
+
+
+@pytest.mark.parametrize(
+    'func, reference, is_directed',
+    [
+        (frontier.directed_decomposition, directed.chain_edge_fixing, True),
+        (frontier.undirected_decomposition, undirected.chain_edge_fixing, False),
+    ],
+)
+def test_decomposition(func, reference, is_directed):
+    rng = random.Random(1)
+    for _ in range(20):
+        graph_x = rng.sample(range(1, 15), 14)
+        graph_y = rng.sample(range(1, 15), 14)
+        solution = {}
+
+        result = func(graph_x, graph_y, solution=solution)
+
+        assert result == reference(graph_x, graph_y)
+        if result:
+            assert is_hamiltonian(solution['z'], 14, is_directed)
+            assert is_hamiltonian(solution['w'], 14, is_directed)
+            x_edges = cycle_edges(graph_x, is_directed)
+            y_edges = cycle_edges(graph_y, is_directed)
+            assert solution['z'] | solution['w'] == x_edges | y_edges
+            assert solution['z'] not in (x_edges, y_edges)
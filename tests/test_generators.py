@@ -0,0 +1,76 @@
+import pytest
+
+import directed
+import exceptions
+import generators
+import undirected
+import utils
+
+
+def is_pyramidal(cycle):
+    top = list(cycle).index(len(cycle))
+    return (
+        sorted(cycle) == list(range(1, len(cycle) + 1))
+        and list(cycle[:top]) == sorted(cycle[:top])
+        and list(cycle[top:]) == sorted(cycle[top:], reverse=True)
+    )
+
+
+@pytest.mark.parametrize('number_of_vertices', [1, 2, 7, 64])
+def test_pyramidal_cycles(number_of_vertices):
+    cycles = generators.generate_pyramidal_cycles(number_of_vertices, 50, seed=1)
+
+    assert cycles.shape == (50, number_of_vertices)
+    assert all(is_pyramidal(cycle.tolist()) for cycle in cycles)
+
+
+def test_pyramidal_cycles_seed():
+    first = generators.generate_pyramidal_cycles(32, 10, seed=7)
+    second = generators.generate_pyramidal_cycles(32, 10, seed=7)
+
+    assert (first == second).all()
+
+
+def test_export_pyramidal_pairs(tmp_path):
+    path = str(tmp_path / 'pyramidal.txt')
+    pairs = list(generators.iter_pyramidal_pairs(16, 5, seed=3, batch_size=2))
+
+    assert generators.export_to_file(path, pairs) == 5
+    assert utils.import_from_file(path) == [
+        (tuple(x.tolist()), tuple(y.tolist())) for x, y in pairs
+    ]
+
+
+@pytest.mark.parametrize('family', list(generators.families))
+def test_families_are_cycle_pairs(family):
+    for x, y in generators.families[family](12, 5, seed=2):
+        assert sorted(x) == sorted(y) == list(range(1, 13))
+        assert list(x) != list(y)
+
+
+@pytest.mark.parametrize('k', [0, 3, 9])
+def test_common_edges(k):
+    for x, y in generators.families['common_edges'](12, 5, seed=k, k=k):
+        assert len(generators.arcs(x) & generators.arcs(y)) == k
+
+
+@pytest.mark.parametrize(
+    'family,expected', [('decomposable', True), ('non_decomposable', False)]
+)
+def test_known_decomposition(family, expected):
+    for x, y in generators.families[family](10, 5, seed=4):
+        assert directed.chain_edge_fixing(x, y) is expected
+        assert undirected.chain_edge_fixing(x, y) is expected
+
+
+@pytest.mark.parametrize('family', ['two_opt', 'three_opt'])
+@pytest.mark.parametrize('number_of_vertices,k', [(3, 1), (4, 0)])
+def test_moves_input(family, number_of_vertices, k):
+    with pytest.raises(exceptions.InputError):
+        next(generators.families[family](number_of_vertices, 1, seed=1, k=k))
+
+
+@pytest.mark.parametrize('family', ['two_opt', 'three_opt'])
+def test_moves_small(family):
+    for x, y in generators.families[family](4, 5, seed=1):
+        assert generators.arcs(x) != generators.arcs(y)
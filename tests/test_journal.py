@@ -0,0 +1,22 @@
+import journal
+
+
+def test_journal(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    records = [
+        {'pack': 'test32.txt', 'pair': 1, 'method': 3, 'result': True, 'time': 10},
+        {'pack': 'test32.txt', 'pair': 2, 'method': 3, 'result': None, 'time': 20},
+    ]
+
+    with journal.Journal(path) as results_journal:
+        results_journal.write(records[0])
+    with open(path, 'a') as file:
+        file.write('{"pack": "test32.txt", "pa')
+    with journal.Journal(path) as results_journal:
+        results_journal.write(records[1])
+
+    assert journal.load(path) == {
+        ('test32.txt', 1, 3): records[0],
+        ('test32.txt', 2, 3): records[1],
+    }
+    assert journal.load(str(tmp_path / 'missing.jsonl')) == {}
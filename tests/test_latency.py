@@ -0,0 +1,30 @@
+import pytest
+
+import latency
+
+
+def test_summarize():
+    times = list(range(1, 101))
+
+    assert latency.summarize(times) == {'p50': 50, 'p90': 90, 'p99': 99, 'max': 100}
+    assert latency.summarize([7]) == {'p50': 7, 'p90': 7, 'p99': 7, 'max': 7}
+    assert latency.summarize([]) == {'p50': None, 'p90': None, 'p99': None, 'max': None}
+
+
+def test_log_histogram():
+    histogram = latency.log_histogram([1, 2, 5, 15, 20, 1000], buckets_per_decade=1)
+
+    assert [count for _, _, count in histogram] == [3, 2, 0, 1]
+    assert histogram[0][:2] == (1, 10)
+    assert histogram[-1][:2] == (1000, pytest.approx(10000))
+    assert latency.log_histogram([]) == []
+
+
+def test_format_histogram():
+    lines = latency.format_histogram(
+        [(1, 10, 4), (10, 100, 0), (100, 1000, 2)], scale=1, width=4
+    ).split('\n')
+
+    assert lines[0].split() == ['1', '-', '10', '4', '####']
+    assert lines[1].split() == ['10', '-', '100', '0']
+    assert lines[2].split() == ['100', '-', '1000', '2', '##']
@@ -0,0 +1,77 @@
+import random
+from collections import Counter
+
+import pytest
+
+import local_search
+import transitions
+from test_frontier import cycle_edges, is_hamiltonian
+from utils import import_from_file
+
+
+def test_count_cycles():
+    assert local_search.count_cycles(4, [(0, 1), (1, 2), (2, 3), (3, 0)]) == 1
+    assert local_search.count_cycles(4, [(0, 1), (1, 0), (2, 3), (3, 2)]) == 2
+
+
+@pytest.mark.parametrize('is_directed', [True, False])
+def test_found_is_decomposition(is_directed):
+    rng = random.Random(6)
+    for _ in range(200):
+        n = rng.randint(4, 10)
+        graph_x, graph_y = rng.sample(range(n), n), rng.sample(range(n), n)
+        x_edges = cycle_edges(graph_x, is_directed)
+        y_edges = cycle_edges(graph_y, is_directed)
+        if x_edges == y_edges:
+            continue
+        solution = {}
+
+        if local_search.decomposition(graph_x, graph_y, is_directed, solution=solution):
+            assert is_hamiltonian(solution['z'], n, is_directed)
+            assert is_hamiltonian(solution['w'], n, is_directed)
+            assert solution['z'] not in (x_edges, y_edges)
+            assert Counter(solution['z']) + Counter(solution['w']) == Counter(
+                x_edges
+            ) + Counter(y_edges)
+
+
+def test_undirected_colouring_is_consistent():
+    graph_x, graph_y = import_from_file('../examples/test32.txt')[0]
+    index = {vertex: idx for idx, vertex in enumerate(graph_x)}
+    edges = [
+        tuple(sorted((index[graph[idx - 1]], index[graph[idx]])))
+        for graph in (graph_x, graph_y)
+        for idx in range(32)
+    ]
+    doubled = sorted(set(edges[:32]) & set(edges[32:]))
+    single = [edge for edge in edges if edge not in doubled]
+
+    colouring = local_search.UndirectedColouring(32, single, doubled, random.Random(0))
+    for _ in range(50):
+        colouring.flip(colouring.trail())
+
+        degrees = Counter()
+        for (u, v), color in zip(single, colouring.color):
+            degrees[u] += 1 if color else -1
+            degrees[v] += 1 if color else -1
+        assert not any(degrees.values())
+
+
+@pytest.mark.parametrize(
+    'func, reference',
+    [
+        (local_search.directed_decomposition, transitions.directed_decomposition),
+        (local_search.undirected_decomposition, transitions.undirected_decomposition),
+    ],
+)
+def test_examples(func, reference):
+    for graph_x, graph_y in import_from_file('../examples/test64.txt')[:10]:
+        if reference(graph_x, graph_y):
+            assert func(graph_x, graph_y)
+        else:
+            assert not func(graph_x, graph_y)
+
+
+def test_colouring_is_abstract():
+    with pytest.raises(TypeError):
+        local_search.Colouring(2, [], [], random.Random(0))
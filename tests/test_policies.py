@@ -0,0 +1,85 @@
+import pytest
+
+import bitmask
+import directed
+import policies
+import undirected
+from test_utils import random_pairs
+from utils import import_from_file, is_hamiltonian_cycle
+
+
+def test_buckets():
+    buckets = policies.Buckets(4)
+    for vertex, key in ((1, 0), (2, 3), (3, 3), (4, 1)):
+        buckets.update(vertex, key)
+
+    assert sorted(buckets.best()) == [2, 3]
+
+    buckets.update(2, None)
+    buckets.update(3, 1)
+
+    assert sorted(buckets.best()) == [3, 4]
+    assert buckets.place[3] == (1, len(buckets.buckets[1]) - 1)
+
+    buckets.update(3, None)
+    buckets.update(4, None)
+
+    assert buckets.best() == [1]
+
+
+def test_fragment():
+    multigraph = undirected.build_multigraph([(1, 2), (2, 3), (3, 4)], [(4, 5)])
+    policy = policies.Fragment(multigraph)
+    policy.fix({(1, 2), (2, 3)}, set())
+
+    assert policy.queue.best() in ([1, 3], [3, 1])
+    assert policy.score(2) == 0
+
+    policy.unfix({(1, 2), (2, 3)}, set())
+
+    assert policy.mate[0] == {vertex: vertex for vertex in range(1, 6)}
+    assert all(policy.score(vertex) == 0 for vertex in range(1, 6))
+
+
+@pytest.mark.parametrize('policy', policies.policies)
+@pytest.mark.parametrize(
+    'module,oracle',
+    [
+        (directed, bitmask.directed_decomposition),
+        (undirected, bitmask.undirected_decomposition),
+    ],
+)
+def test_chain_edge_fixing(policy, module, oracle):
+    for graph_x, graph_y in import_from_file('../examples/test32.txt')[:10]:
+        solution = {}
+
+        assert module.chain_edge_fixing(
+            graph_x, graph_y, solution=solution, policy=policy
+        ) == oracle(graph_x, graph_y)
+        if solution:
+            assert is_hamiltonian_cycle(solution['z'], module is directed)
+            assert is_hamiltonian_cycle(solution['w'], module is directed)
+
+
+@pytest.mark.parametrize('policy', policies.policies)
+@pytest.mark.parametrize('mode', ['lds', 'dds'])
+@pytest.mark.parametrize(
+    'module,oracle',
+    [
+        (directed, bitmask.directed_decomposition),
+        (undirected, bitmask.undirected_decomposition),
+    ],
+)
+def test_discrepancy_search(policy, mode, module, oracle):
+    pairs = import_from_file('../examples/test32.txt')[:10] + random_pairs()
+    pairs.append(
+        (
+            [4, 14, 10, 5, 6, 3, 12, 11, 7, 9, 8, 13, 1, 2],
+            [1, 12, 7, 5, 4, 8, 10, 2, 14, 9, 6, 3, 13, 11],
+        )
+    )
+    pairs.append(([2, 9, 6, 8, 3, 4, 1, 5, 7], [9, 5, 2, 7, 1, 3, 4, 6, 8]))
+    for graph_x, graph_y in pairs:
+        assert module.chain_edge_fixing(
+            graph_x, graph_y, policy=policy, mode=mode
+        ) == oracle(graph_x, graph_y)
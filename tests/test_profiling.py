@@ -0,0 +1,29 @@
+import cProfile
+import json
+import pstats
+
+import profiling
+import undirected
+
+
+def test_phase_breakdown(tmp_path):
+    profiler = cProfile.Profile()
+    profiler.runcall(
+        undirected.chain_edge_fixing, [7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2]
+    )
+    stats = pstats.Stats(profiler)
+    breakdown = profiling.phase_breakdown(stats, 10.0)
+
+    assert list(breakdown) == list(profiling.phases) + [profiling.search_phase]
+    assert breakdown['Graph construction'] > 0
+    assert breakdown['Propagation'] > 0
+    assert sum(breakdown.values()) == 10.0
+
+    breakdowns = [{'method': 3, 'n': 7, 'pair': 1, 'result': True, 'phases': breakdown}]
+    paths = profiling.write_profile(
+        str(tmp_path / 'profile'), stats, breakdowns, {3: 'Chain edge fixing'}
+    )
+    speedscope = json.load(open(paths[1]))
+
+    assert len(paths) == 3
+    assert speedscope['profiles'][0]['endValue'] == 10 * 10**9
@@ -0,0 +1,44 @@
+import io
+import threading
+
+from progress import Progress
+
+
+def test_progress():
+    stream = io.StringIO()
+    progress = Progress(400, 'Test', interval=60, stream=stream)
+
+    def update(result):
+        for _ in range(100):
+            progress.update(result)
+
+    threads = [
+        threading.Thread(target=update, args=(result,))
+        for result in (True, False, None, True)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    progress.close()
+
+    lines = stream.getvalue().split('\r')[1:]
+    # the first update, the last update and the closing line only
+    assert len(lines) == 3
+    assert lines[-1].startswith('Test 400/400 |')
+    assert lines[-1].rstrip().endswith('found 200, not found 100, limit exceeded 100')
+    assert stream.getvalue().endswith('\n')
+
+
+def test_progress_message():
+    stream = io.StringIO()
+    progress = Progress(2, 'Test', interval=60, stream=stream)
+    progress.update(True)
+    progress.message('Error')
+    progress.update(None)
+    progress.close()
+
+    lines = stream.getvalue().split('\n')
+    # the message replaces the progress line, which is drawn again below it
+    assert lines[0].split('\r')[-1] == 'Error'
+    assert lines[1].split('\r')[-1].startswith('Test 2/2 |')
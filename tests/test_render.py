@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+import render
+
+
+@pytest.mark.parametrize('image_format', ['png', 'svg'])
+@pytest.mark.parametrize('method', [None, 3])
+def test_render_batch(tmp_path, image_format, method):
+    pairs = [
+        ([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2]),
+        ([6, 3, 2, 4, 5, 1, 7], [7, 4, 5, 2, 1, 6, 3]),
+    ]
+    paths = render.render_batch(
+        pairs, str(tmp_path), method=method, image_format=image_format
+    )
+
+    assert [os.path.basename(path) for path in paths] == [
+        'pair1.' + image_format,
+        'pair2.' + image_format,
+    ]
+    assert all(os.path.getsize(path) > 0 for path in paths)
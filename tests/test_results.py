@@ -0,0 +1,70 @@
+import csv
+import json
+
+import pytest
+
+import exceptions
+import results
+
+rows = [
+    {
+        'pack': 'test32.txt',
+        'method': 3,
+        'n': 32,
+        'pair': idx,
+        'result': idx % 2 == 0,
+        'wall_time': idx / 10,
+        'cpu_time': idx / 20,
+        'timeout': False,
+        'counters': {'nodes': idx},
+    }
+    for idx in range(1, 6)
+]
+expected = [{key: row[key] for key in results.columns} for row in rows]
+
+
+def test_json_lines_writer(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    with results.open_writer(path, buffer_size=2) as writer:
+        for row in rows[:3]:
+            writer.write(row)
+        # the full buffer is already written
+        with open(path) as file:
+            assert [json.loads(line) for line in file] == expected[:2]
+        for row in rows[3:]:
+            writer.write(row)
+
+    with open(path) as file:
+        assert [json.loads(line) for line in file] == expected
+
+
+def test_csv_writer(tmp_path):
+    path = str(tmp_path / 'results.csv')
+    with results.open_writer(path, buffer_size=2) as writer:
+        for row in rows:
+            writer.write(row)
+
+    with open(path) as file:
+        assert list(csv.DictReader(file)) == [
+            {key: str(value) for key, value in row.items()} for row in expected
+        ]
+
+
+def test_parquet_writer(tmp_path):
+    parquet = pytest.importorskip('pyarrow.parquet')
+    path = str(tmp_path / 'results.parquet')
+    with results.open_writer(path, buffer_size=2) as writer:
+        for row in rows:
+            writer.write(row)
+
+    assert parquet.read_table(path).to_pylist() == expected
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(exceptions.InputError):
+        results.open_writer(str(tmp_path / 'results.txt'))
+
+
+def test_writer_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        results.Writer(str(tmp_path / 'results'))
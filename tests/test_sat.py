@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+import directed
+import frontier
+import sat
+import undirected
+from utils import import_from_file
+
+pytest.importorskip('pysat')
+
+
+def test_exactly():
+    clauses = sat.exactly([1, 2, 3, 4], 2)
+
+    def satisfied(values):
+        return all(any(values[abs(item)] == (item > 0) for item in c) for c in clauses)
+
+    for mask in range(16):
+        values = {bit + 1: bool(mask >> bit & 1) for bit in range(4)}
+        assert satisfied(values) == (bin(mask).count('1') == 2)
+
+
+@pytest.mark.parametrize('is_directed', [True, False])
+def test_small_pairs(is_directed):
+    rng = random.Random(2)
+    for _ in range(50):
+        n = rng.randint(4, 12)
+        graph_x, graph_y = rng.sample(range(n), n), rng.sample(range(n), n)
+        if graph_x == graph_y:
+            continue
+
+        assert sat.decomposition(graph_x, graph_y, is_directed) == (
+            frontier.count_decompositions(graph_x, graph_y, is_directed) > 1
+        )
+
+
+@pytest.mark.parametrize(
+    'func, reference',
+    [
+        (sat.directed_decomposition, directed.chain_edge_fixing),
+        (sat.undirected_decomposition, undirected.chain_edge_fixing),
+    ],
+)
+def test_examples(func, reference):
+    for graph_x, graph_y in import_from_file('../examples/test64.txt')[:5]:
+        solution = {}
+
+        result = func(graph_x, graph_y, solution=solution)
+
+        assert result == reference(graph_x, graph_y)
+        if result:
+            assert len(solution['z']) == len(solution['w']) == 64
@@ -0,0 +1,91 @@
+import os
+import signal
+import threading
+
+import service
+import undirected
+from utils import import_from_file
+
+
+def test_encode_decode_batch():
+    requests = [((3, 1, 2), (1, 3, 2), 3, 1.5), ((1, 2, 3, 4), (4, 3, 1, 2), 0, None)]
+    frame = service.encode_batch(requests)
+
+    assert service.decode_batch(frame[service.frame_header.size :]) == requests
+
+
+def test_solve_batch(tmp_path):
+    address = str(tmp_path / 'service.sock')
+    server = service.create_server(address, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    pairs = [
+        ([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2]),
+        ([6, 3, 2, 4, 5, 1, 7], [7, 4, 5, 2, 1, 6, 3]),
+        ([2, 4, 1, 7, 6, 5, 3], [7, 1, 6, 5, 2, 3, 4]),
+    ]
+    try:
+        results = {
+            index: status
+            for index, status, _ in service.solve_batch(
+                address, [(x, y, 3, 10) for x, y in pairs]
+            )
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
+
+    assert results == {
+        idx: service.FOUND if undirected.chain_edge_fixing(x, y) else service.NOT_FOUND
+        for idx, (x, y) in enumerate(pairs)
+    }
+
+
+def test_killed_worker(tmp_path):
+    address = str(tmp_path / 'service.sock')
+    server = service.create_server(address, workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    request = ([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2], 3, 10)
+    try:
+        worker = server.pool.workers[0]
+        worker.wait_ready()
+        os.kill(worker.process.pid, signal.SIGKILL)
+        worker.process.join()
+        results = [
+            status for _, status, _ in service.solve_batch(address, [request] * 2)
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
+
+    assert results == [service.FOUND] * 2
+
+
+def test_hard_timeout(tmp_path):
+    address = str(tmp_path / 'service.sock')
+    server = service.create_server(address, workers=1, hard_timeout=1e-6)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    graph_x, graph_y = import_from_file('../examples/test32.txt')[0]
+    try:
+        results = [
+            status
+            for _, status, _ in service.solve_batch(
+                address, [(graph_x, graph_y, 1, None)]
+            )
+        ]
+        alive = server.pool.workers[0].process.is_alive()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
+
+    # the killed worker is started again
+    assert results == [service.TIMEOUT]
+    assert alive
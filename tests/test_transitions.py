@@ -0,0 +1,94 @@
+import random
+from collections import Counter
+
+import directed
+import frontier
+import transitions
+import undirected
+from test_frontier import cycle_edges, is_hamiltonian
+from utils import import_from_file
+
+
+def test_directed_components():
+    # X: 0->1->2->3->0, Y: 0->2->1->3->0, 3->0 is in both
+    components = transitions.directed_components([1, 2, 3, 0], [2, 3, 1, 0])
+
+    assert sorted(map(sorted, components)) == [[0, 1, 2]]
+
+
+def test_paths():
+    paths, history = transitions.Paths(3), []
+
+    assert paths.add(0, 1, history)
+    assert paths.add(1, 2, history)
+    assert paths.mate[0] == 2 and paths.mate[2] == 0
+
+    transitions.undo(history, 0)
+
+    assert paths.mate == [0, 1, 2] and paths.length == 0
+    assert paths.add(0, 1, history) and not paths.add(1, 0, history)
+
+
+def test_directed_decomposition():
+    rng = random.Random(3)
+    for _ in range(300):
+        n = rng.randint(3, 10)
+        graph_x, graph_y = rng.sample(range(n), n), rng.sample(range(n), n)
+        if cycle_edges(graph_x, True) == cycle_edges(graph_y, True):
+            continue
+        solution = {}
+
+        result = transitions.directed_decomposition(graph_x, graph_y, solution=solution)
+
+        assert result == (frontier.count_decompositions(graph_x, graph_y, True) > 1)
+        if result:
+            assert is_hamiltonian(solution['z'], n, True)
+            assert is_hamiltonian(solution['w'], n, True)
+            assert solution['z'] not in (
+                cycle_edges(graph_x, True),
+                cycle_edges(graph_y, True),
+            )
+            assert Counter(solution['z']) + Counter(solution['w']) == Counter(
+                cycle_edges(graph_x, True)
+            ) + Counter(cycle_edges(graph_y, True))
+
+
+def test_examples():
+    for graph_x, graph_y in import_from_file('../examples/test32.txt')[:10]:
+        counters = Counter()
+
+        result = transitions.directed_decomposition(graph_x, graph_y, counters=counters)
+
+        assert result == directed.chain_edge_fixing(graph_x, graph_y)
+        assert counters['nodes'] > 0
+
+
+def test_undirected_decomposition():
+    rng = random.Random(4)
+    for _ in range(300):
+        n = rng.randint(4, 10)
+        graph_x, graph_y = rng.sample(range(n), n), rng.sample(range(n), n)
+        x_edges, y_edges = cycle_edges(graph_x, False), cycle_edges(graph_y, False)
+        if x_edges == y_edges:
+            continue
+        solution = {}
+
+        result = transitions.undirected_decomposition(
+            graph_x, graph_y, solution=solution
+        )
+
+        assert result == (frontier.count_decompositions(graph_x, graph_y, False) > 1)
+        if result:
+            assert is_hamiltonian(solution['z'], n, False)
+            assert is_hamiltonian(solution['w'], n, False)
+            assert solution['z'] not in (x_edges, y_edges)
+            assert Counter(solution['z']) + Counter(solution['w']) == Counter(
+                x_edges
+            ) + Counter(y_edges)
+
+
+def test_undirected_examples():
+    for graph_x, graph_y in import_from_file('../examples/test32.txt')[:10]:
+        assert transitions.undirected_decomposition(
+            graph_x, graph_y
+        ) == undirected.chain_edge_fixing(graph_x, graph_y)
@@ -1,6 +1,12 @@
+import collections
+
+import networkx as nx
 import pytest
 
+import bitmask
 import directed
+import generators
+import undirected
 import utils
 
 
@@ -287,3 +293,123 @@ def test_get_different():
 
     assert utils.get_different_edge({edge_1, edge_2}, edge_1) == edge_2
     assert utils.get_different_edge({edge_1, edge_2}, edge_2) == edge_1
+
+
+@pytest.mark.parametrize(
+    'func,expected',
+    [
+        (directed.simple_path, False),
+        (directed.chain_edge_fixing, False),
+        # backtracking_1 and backtracking_2 of undirected cycles
+        (undirected.simple_path, True),
+        (undirected.chain_edge_fixing, True),
+    ],
+)
+def test_search_counters(func, expected):
+    counters = collections.Counter()
+    result = func([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2], counters=counters)
+
+    assert result is expected
+    assert result is func([7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2])
+    assert counters['nodes'] > 0
+    assert set(counters) <= set(utils.counters_titles)
+
+
+def test_discrepancy_branch():
+    multigraph = nx.MultiGraph()
+    multigraph.graph['discrepancy_cut'] = False
+
+    assert utils.discrepancy_branch(multigraph, 1, 3, None, None) == (True, None)
+    assert utils.discrepancy_branch(multigraph, 0, 3, 0, 'lds') == (True, 0)
+    assert utils.discrepancy_branch(multigraph, 1, 3, 2, 'lds') == (True, 1)
+    assert not multigraph.graph['discrepancy_cut']
+    assert utils.discrepancy_branch(multigraph, 1, 3, 0, 'lds') == (False, 0)
+    assert multigraph.graph['discrepancy_cut']
+
+    multigraph.graph['discrepancy_cut'] = False
+    assert utils.discrepancy_branch(multigraph, 1, 0, 2, 'dds') == (True, 2)
+    assert utils.discrepancy_branch(multigraph, 1, 1, 2, 'dds') == (True, 2)
+    assert utils.discrepancy_branch(multigraph, 0, 2, 2, 'dds') == (True, 2)
+    assert not multigraph.graph['discrepancy_cut']
+    assert utils.discrepancy_branch(multigraph, 1, 2, 2, 'dds') == (False, 2)
+    assert multigraph.graph['discrepancy_cut']
+
+    # the subtree of the skipped heuristic choice has deeper discrepancies
+    multigraph.graph['discrepancy_cut'] = False
+    assert utils.discrepancy_branch(multigraph, 0, 1, 2, 'dds') == (False, 2)
+    assert multigraph.graph['discrepancy_cut']
+
+
+def random_pairs() -> list:
+    """Distinct random pairs of 5..11 vertices, 40 of every size"""
+
+    return [
+        (graph_x, graph_y)
+        for n in range(5, 12)
+        for graph_x, graph_y in generators.families['random'](n, 40, seed=n)
+        if graph_x != graph_y
+    ]
+
+
+@pytest.mark.parametrize(
+    'module,oracle',
+    [
+        (directed, bitmask.directed_decomposition),
+        (undirected, bitmask.undirected_decomposition),
+    ],
+)
+@pytest.mark.parametrize('mode', ['lds', 'dds'])
+def test_discrepancy_search(module, oracle, mode):
+    pairs = utils.import_from_file('../examples/test32.txt')[:10] + random_pairs()
+    for graph_x, graph_y in pairs:
+        solution = {}
+
+        result = module.chain_edge_fixing(
+            graph_x, graph_y, mode=mode, solution=solution
+        )
+
+        assert result == oracle(graph_x, graph_y)
+        if result:
+            assert utils.is_hamiltonian_cycle(solution['z'])
+
+
+@pytest.mark.parametrize('module', [directed, undirected])
+def test_bidirectional_simple_path(module):
+    for graph_x, graph_y in utils.import_from_file('../examples/test32.txt')[:5]:
+        solution = {}
+
+        result = module.simple_path(
+            graph_x, graph_y, bidirectional=True, solution=solution
+        )
+
+        assert result == module.simple_path(graph_x, graph_y)
+        if result:
+            assert utils.is_hamiltonian_cycle(solution['z'], module is directed)
+            assert utils.is_hamiltonian_cycle(solution['w'], module is directed)
+
+
+@pytest.mark.parametrize('other,expected', [(2, False), (6, True)])
+def test_is_feasible(other, expected):
+    # Z path 1-2-3, vertex 4 has two W edges and two free ones
+    multigraph = nx.MultiGraph(length_z=2)
+    multigraph.add_edges_from([(1, 2), (2, 3), (4, 1), (4, 3), (4, 5), (4, other)])
+    for u, v in [(1, 2), (2, 3)]:
+        multigraph.edges[u, v, 0]['fixed_z'] = True
+    for u, v in [(4, 1), (4, 3)]:
+        multigraph.edges[u, v, 0]['fixed_w'] = True
+    for vertex in (1, 2, 3):
+        multigraph.nodes[vertex]['included_in_z'] = True
+
+    # a free edge to the inner vertex 2 of the path can only be in W
+    assert undirected.is_feasible(multigraph, [4], 6) is expected
+
+
+@pytest.mark.parametrize('module', [directed, undirected])
+def test_simple_path_capacity_prunes(module):
+    counters = collections.Counter()
+    for graph_x, graph_y in utils.import_from_file('../examples/test32.txt')[:5]:
+        assert module.simple_path(
+            graph_x, graph_y, counters=counters
+        ) == module.chain_edge_fixing(graph_x, graph_y)
+
+    assert counters['capacity_prunes'] > 0
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+import workers
+from utils import import_from_file
+
+
+def test_worker_run():
+    worker = workers.Worker()
+    try:
+        status, runtime, cpu_time, _ = worker.run(
+            (1, 2, 3, 4, 5, 6, 7), (1, 3, 5, 7, 2, 4, 6), 3, None, 10
+        )
+        assert status in (workers.FOUND, workers.NOT_FOUND)
+        assert 0 < cpu_time and 0 < runtime
+
+        graph_x, graph_y = import_from_file('../examples/test512.txt')[0]
+        start_time = time.perf_counter()
+        status, runtime, _, _ = worker.run(graph_x, graph_y, 0, None, 0.2)
+        assert status == workers.TIMEOUT
+        assert time.perf_counter() - start_time < 0.5
+        assert 0.2 * 10**9 <= runtime < 0.5 * 10**9
+
+        # the killed worker is replaced by a warm one
+        assert worker.run((1, 2, 3), (1, 2, 3, 4), 3, None, 10)[0] == workers.ERROR
+        assert worker.run((1, 2, 3), (1, 2, 3), 2, None, 10)[0] == workers.ERROR
+    finally:
+        worker.close()
+
+
+def test_solve_failure(monkeypatch):
+    import main
+
+    def fail(graph_x, graph_y, **kwargs):
+        raise RecursionError('maximum recursion depth exceeded')
+
+    monkeypatch.setitem(main.funcs, 99, {'title': 'Failing', 'func': fail})
+
+    status, _, _, message = workers.solve((1, 2, 3), (1, 3, 2), 99, None)
+    assert status == workers.FAILURE and 'RecursionError' in message
+    assert workers.solve((1, 2, 3), (1, 3, 2), 100, None)[0] == workers.ERROR
+
+
+def test_run_supervised_failure(monkeypatch):
+    import exceptions
+    import main
+
+    def fail(graph_x, graph_y, **kwargs):
+        raise MemoryError()
+
+    # the worker is forked with the failing method
+    monkeypatch.setitem(main.funcs, 99, {'title': 'Failing', 'func': fail})
+    worker = workers.Worker()
+    try:
+        with pytest.raises(exceptions.SolverError):
+            main.run_supervised(worker, (1, 2, 3), (1, 3, 2), 99, None, 10)
+        with pytest.raises(exceptions.InputError):
+            main.run_supervised(worker, (1, 2, 3), (1, 2, 3, 4), 3, None, 10)
+    finally:
+        worker.close()
+
+
+def test_run_test_counters(monkeypatch):
+    from collections import Counter
+
+    import main
+
+    def give_up(graph_x, graph_y, counters=None, **kwargs):
+        if counters is not None:
+            counters['nodes'] += 1000
+        return False
+
+    monkeypatch.setitem(main.funcs, 99, {'title': 'Giving up', 'func': give_up})
+    graph_x, graph_y = [7, 5, 2, 4, 1, 3, 6], [7, 1, 5, 3, 6, 4, 2]
+    counters, expected = Counter(), Counter()
+    main.funcs[3]['func'](graph_x, graph_y, counters=expected)
+
+    assert main.run_test(3, 99, graph_x, graph_y, {'counters': counters})
+    assert counters == expected
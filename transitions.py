@@ -0,0 +1,499 @@
+"""Decomposition by transitions of vertices
+
+Directed cycles: the out-arcs of a vertex v (to its successors in X and in
+Y) go to different cycles, so Z is given by one bit per vertex - whether
+its X out-arc is in Z. The in-arcs of a vertex come from its predecessors
+in X and in Y and go to different cycles too, so the bits of v and of the
+Y predecessor of the X successor of v are equal. Vertices split into the
+cycles of that permutation and each cycle is a single bit. A vertex with
+the same X and Y successors is a fixed point, its arc is in Z and W.
+
+The search assigns the bits of the components keeping both ends of every
+path of Z and W and cuts off assignments closing a cycle shorter than n.
+
+Undirected cycles: every vertex has four edge ends and gives two of them to
+Z, so Z is given by the transitions of vertices - the pairings of their
+ends - which agree on every edge. The search chooses the transitions
+vertex by vertex in the order of X and propagates the colours along edges.
+"""
+
+import itertools
+from collections import Counter
+from typing import Optional
+
+import utils
+
+
+class Paths:
+    """Paths of one colour over vertices 0..n-1, every end of a path keeps
+    the other end as its mate (an isolated vertex keeps itself)
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.mate = list(range(n))
+        self.length = 0
+
+    def add(self, u: int, v: int, history: list) -> bool:
+        """Joins the path ending at u and the path starting at v by u->v,
+        the changes are appended to the history
+
+        Returns:
+            bool: False if the edge closes a cycle shorter than n
+        """
+
+        start, end = self.mate[u], self.mate[v]
+        if start == v and self.length + 1 < self.n:
+            return False
+
+        history.append((self, start, self.mate[start]))
+        history.append((self, end, self.mate[end]))
+        history.append((self, None, None))
+        self.mate[start], self.mate[end] = end, start
+        self.length += 1
+        return True
+
+
+def undo(history: list, size: int) -> None:
+    """Reverts the changes made after the history had the size"""
+
+    while len(history) > size:
+        paths, vertex, mate = history.pop()
+        if vertex is None:
+            paths.length -= 1
+        else:
+            paths.mate[vertex] = mate
+
+
+def directed_components(x_succ: list, y_succ: list) -> list:
+    """Gets the components of vertices with equal bits
+
+    Args:
+        x_succ: successors of vertices 0..n-1 in X
+        y_succ: successors of vertices 0..n-1 in Y
+
+    Returns:
+        list: lists of vertices, fixed points are skipped
+    """
+
+    y_pred = [0] * len(y_succ)
+    for vertex, successor in enumerate(y_succ):
+        y_pred[successor] = vertex
+
+    components, seen = [], [False] * len(x_succ)
+    for vertex in range(len(x_succ)):
+        if seen[vertex] or x_succ[vertex] == y_succ[vertex]:
+            continue
+        component = []
+        while not seen[vertex]:
+            seen[vertex] = True
+            component.append(vertex)
+            vertex = y_pred[x_succ[vertex]]
+        components.append(component)
+
+    return components
+
+
+def assign(
+    vertices: list,
+    bit: bool,
+    x_succ: list,
+    y_succ: list,
+    z: Paths,
+    w: Paths,
+    history: list,
+) -> bool:
+    """Adds the out-arcs of the vertices of a component to Z and W, the X
+    ones go to Z if the bit is set
+
+    Returns:
+        bool: False if a cycle shorter than n is closed
+    """
+
+    for vertex in vertices:
+        z_succ, w_succ = (
+            (x_succ[vertex], y_succ[vertex])
+            if bit
+            else (y_succ[vertex], x_succ[vertex])
+        )
+        if not z.add(vertex, z_succ, history) or not w.add(vertex, w_succ, history):
+            return False
+    return True
+
+
+def closes(vertex: int, z_succ: int, w_succ: int, z: Paths, w: Paths) -> bool:
+    """Checks whether the out-arcs of a vertex without them close a cycle
+    shorter than n in Z or W
+    """
+
+    return (z.mate[vertex] == z_succ and z.length + 1 < z.n) or (
+        w.mate[vertex] == w_succ and w.length + 1 < w.n
+    )
+
+
+def propagate(
+    components: list,
+    bits: list,
+    trail: list,
+    x_succ: list,
+    y_succ: list,
+    z: Paths,
+    w: Paths,
+    history: list,
+    counters: Optional[Counter] = None,
+) -> bool:
+    """Sets the bits of components having a vertex whose arcs close a short
+    cycle with one of the values, until nothing is forced
+
+    Returns:
+        bool: False if a component can't take any value
+    """
+
+    forced = True
+    while forced:
+        forced = False
+        for component, vertices in enumerate(components):
+            if bits[component] is not None:
+                continue
+            allowed = [True, True]
+            for vertex in vertices:
+                if allowed[True] and closes(
+                    vertex, x_succ[vertex], y_succ[vertex], z, w
+                ):
+                    allowed[True] = False
+                if allowed[False] and closes(
+                    vertex, y_succ[vertex], x_succ[vertex], z, w
+                ):
+                    allowed[False] = False
+            if all(allowed):
+                continue
+            if not any(allowed):
+                return False
+
+            if counters is not None:
+                counters['propagations'] += 1
+            bits[component] = allowed[True]
+            trail.append(component)
+            if not assign(vertices, allowed[True], x_succ, y_succ, z, w, history):
+                return False
+            forced = True
+
+    return True
+
+
+@utils.timeout('Transitions for directed cycles')
+def search_directed(
+    components: list,
+    depth: int,
+    bits: list,
+    trail: list,
+    x_succ: list,
+    y_succ: list,
+    z: Paths,
+    w: Paths,
+    history: list,
+    counters: Optional[Counter] = None,
+    **kwargs: Optional[tuple],
+) -> bool:
+    """Sets the bit of the first free component, propagates it and goes on
+
+    Returns:
+        bool: True if Z and W are Hamiltonian cycles different from X and Y
+    """
+
+    if counters is not None:
+        utils.count_node(counters, depth)
+
+    if len(trail) == len(components):
+        if counters is not None:
+            counters['leaves'] += 1
+        # all bits set is X and Y
+        return not all(bits)
+
+    component = bits.index(None)
+    # the first bit is set, the assignments with all bits inverted are the same
+    for bit in (True, False) if trail else (True,):
+        size, trail_size = len(history), len(trail)
+        bits[component] = bit
+        trail.append(component)
+        valid = assign(
+            components[component], bit, x_succ, y_succ, z, w, history
+        ) and propagate(
+            components, bits, trail, x_succ, y_succ, z, w, history, counters
+        )
+
+        if valid and search_directed(
+            components,
+            depth + 1,
+            bits,
+            trail,
+            x_succ,
+            y_succ,
+            z,
+            w,
+            history,
+            counters=counters,
+            **kwargs,
+        ):
+            return True
+
+        if counters is not None:
+            counters['backtracks' if valid else 'cycle_prunes'] += 1
+        while len(trail) > trail_size:
+            bits[trail.pop()] = None
+        undo(history, size)
+
+    return False
+
+
+def directed_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    index = {vertex: idx for idx, vertex in enumerate(graph_x)}
+    n = len(graph_x)
+    x_succ, y_succ = [0] * n, [0] * n
+    for idx in range(n):
+        x_succ[index[graph_x[idx - 1]]] = index[graph_x[idx]]
+        y_succ[index[graph_y[idx - 1]]] = index[graph_y[idx]]
+
+    z, w = Paths(n), Paths(n)
+    history: list = []
+    for vertex in range(n):
+        if x_succ[vertex] == y_succ[vertex] and not (
+            z.add(vertex, x_succ[vertex], history)
+            and w.add(vertex, x_succ[vertex], history)
+        ):
+            return False
+
+    components = directed_components(x_succ, y_succ)
+    bits: list = [None] * len(components)
+    if not search_directed(
+        components,
+        0,
+        bits,
+        [],
+        x_succ,
+        y_succ,
+        z,
+        w,
+        history,
+        counters=counters,
+        timeout=timeout,
+        global_timeout=global_timeout,
+    ):
+        return False
+
+    if solution is not None:
+        solution['z'], solution['w'] = set(), set()
+        for vertex in range(n):
+            if x_succ[vertex] == y_succ[vertex]:
+                solution['z'].add((graph_x[vertex], graph_x[x_succ[vertex]]))
+                solution['w'].add((graph_x[vertex], graph_x[x_succ[vertex]]))
+        for component, bit in zip(components, bits):
+            for vertex in component:
+                x_arc = (graph_x[vertex], graph_x[x_succ[vertex]])
+                y_arc = (graph_x[vertex], graph_x[y_succ[vertex]])
+                solution['z'].add(x_arc if bit else y_arc)
+                solution['w'].add(y_arc if bit else x_arc)
+
+    return True
+
+
+class Transitions:
+    """Colouring of the single edges of undirected X and Y into Z and W
+
+    Every vertex takes half of its single edges into Z; the choice is one of
+    the pairings of its four edge ends (one of two if a doubled edge takes
+    two ends). Colours are propagated along edges: a vertex with enough Z
+    (W) edges gives the rest to W (Z), and an edge joining the ends of a
+    path of one colour goes to the other one unless it closes the
+    Hamiltonian cycle.
+    """
+
+    def __init__(self, n: int, single: list, doubled: list) -> None:
+        self.n = n
+        self.single = single
+        self.incident: list = [[] for _ in range(n)]
+        self.between: dict = {}
+        for edge, (u, v) in enumerate(single):
+            self.incident[u].append(edge)
+            self.incident[v].append(edge)
+            self.between.setdefault((u, v), []).append(edge)
+            self.between.setdefault((v, u), []).append(edge)
+        self.need = [len(edges) // 2 for edges in self.incident]
+        self.color: list = [None] * len(single)
+        self.count = [[0] * n, [0] * n]
+        self.paths = [Paths(n), Paths(n)]
+        self.colored: list = []
+        self.history: list = []
+        for u, v in doubled:
+            self.paths[0].add(u, v, self.history)
+            self.paths[1].add(u, v, self.history)
+
+    def push(self, edge: int, color: bool, counters: Optional[Counter] = None) -> bool:
+        """Colours the edge (True - Z, False - W) and everything it forces
+
+        Returns:
+            bool: False on a conflict, the changes are kept to be undone
+        """
+
+        pending = [(edge, color)]
+        while pending:
+            edge, color = pending.pop()
+            if self.color[edge] is not None:
+                if self.color[edge] != color:
+                    return False
+                continue
+            if counters is not None:
+                counters['propagations'] += 1
+
+            u, v = self.single[edge]
+            side = 0 if color else 1
+            paths = self.paths[side]
+            start, end = paths.mate[u], paths.mate[v]
+            self.color[edge] = color
+            self.colored.append(edge)
+            for vertex in (u, v):
+                self.count[side][vertex] += 1
+            if any(self.count[side][vertex] > self.need[vertex] for vertex in (u, v)):
+                return False
+            if not paths.add(u, v, self.history):
+                return False
+
+            for vertex in (u, v):
+                if self.count[side][vertex] == self.need[vertex]:
+                    pending += [
+                        (other, not color)
+                        for other in self.incident[vertex]
+                        if self.color[other] is None
+                    ]
+            if paths.length + 1 < self.n:
+                pending += [
+                    (other, not color)
+                    for other in self.between.get((start, end), ())
+                    if self.color[other] is None
+                ]
+        return True
+
+    def undo(self, size: int, history_size: int) -> None:
+        while len(self.colored) > size:
+            edge = self.colored.pop()
+            side = 0 if self.color[edge] else 1
+            for vertex in self.single[edge]:
+                self.count[side][vertex] -= 1
+            self.color[edge] = None
+        undo(self.history, history_size)
+
+    def options(self, vertex: int) -> list:
+        """Gets the sets of free edges of the vertex which can go to Z"""
+
+        free = [edge for edge in self.incident[vertex] if self.color[edge] is None]
+        return [
+            set(subset)
+            for subset in itertools.combinations(
+                free, self.need[vertex] - self.count[0][vertex]
+            )
+        ]
+
+
+@utils.timeout('Transitions for undirected cycles')
+def search_undirected(
+    transitions: Transitions,
+    cursor: int,
+    x_single: set,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    **kwargs: Optional[tuple],
+) -> bool:
+    """Chooses the transition of the first vertex from the cursor with free
+    edges, propagates it and goes on
+
+    Returns:
+        bool: True if Z and W are Hamiltonian cycles different from X and Y
+    """
+
+    if counters is not None:
+        utils.count_node(counters, depth)
+
+    while cursor < transitions.n and all(
+        transitions.color[edge] is not None for edge in transitions.incident[cursor]
+    ):
+        cursor += 1
+
+    if cursor == transitions.n:
+        if counters is not None:
+            counters['leaves'] += 1
+        # Z has no single X edges (it is Y) or all of them (it is X)
+        in_z = sum(1 for edge in x_single if transitions.color[edge])
+        return 0 < in_z < len(x_single)
+
+    free = [
+        edge for edge in transitions.incident[cursor] if transitions.color[edge] is None
+    ]
+    for z_edges in transitions.options(cursor):
+        size, history_size = len(transitions.colored), len(transitions.history)
+        valid = all(transitions.push(edge, edge in z_edges, counters) for edge in free)
+
+        if valid and search_undirected(
+            transitions, cursor, x_single, counters=counters, depth=depth + 1, **kwargs
+        ):
+            return True
+
+        if counters is not None:
+            counters['backtracks' if valid else 'cycle_prunes'] += 1
+        transitions.undo(size, history_size)
+
+    return False
+
+
+def undirected_decomposition(
+    graph_x: list,
+    graph_y: list,
+    timeout: Optional[tuple] = None,
+    global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+) -> bool:
+    index = {vertex: idx for idx, vertex in enumerate(graph_x)}
+    n = len(graph_x)
+
+    def edges(graph: list) -> list:
+        return [
+            tuple(sorted((index[graph[idx - 1]], index[graph[idx]])))
+            for idx in range(n)
+        ]
+
+    x_edges, y_edges = edges(graph_x), edges(graph_y)
+    doubled = set(x_edges) & set(y_edges)
+    single = [edge for edge in x_edges + y_edges if edge not in doubled]
+    if not single:
+        return False
+
+    transitions = Transitions(n, single, sorted(doubled))
+    x_single = set(range(len(single) // 2))
+    # Z and W are interchangeable, the first single edge is in Z
+    if not transitions.push(0, True, counters) or not search_undirected(
+        transitions,
+        0,
+        x_single,
+        counters=counters,
+        timeout=timeout,
+        global_timeout=global_timeout,
+    ):
+        return False
+
+    if solution is not None:
+        solution['z'], solution['w'] = set(), set()
+        for u, v in doubled:
+            solution['z'].add(tuple(sorted((graph_x[u], graph_x[v]))))
+            solution['w'].add(tuple(sorted((graph_x[u], graph_x[v]))))
+        for edge, (u, v) in enumerate(single):
+            color = 'z' if transitions.color[edge] else 'w'
+            solution[color].add(tuple(sorted((graph_x[u], graph_x[v]))))
+
+    return True
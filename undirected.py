@@ -1,19 +1,39 @@
 import copy
 import itertools
+from collections import Counter
+from collections.abc import Iterable
 from typing import Optional
 
 import networkx as nx
 
+import policies
 import utils
 
 
+def build_multigraph(x_edges: Iterable, y_edges: Iterable) -> nx.MultiGraph:
+    """Builds the union multigraph of X and Y edges"""
+
+    multigraph = nx.MultiGraph()
+    multigraph.add_edges_from(x_edges)
+    multigraph.add_edges_from(y_edges)
+    return multigraph
+
+
 def step_back(
-    multigraph: nx.MultiGraph, u: int, v: int, key: int, vertex: int, w_edges: list
+    multigraph: nx.MultiGraph,
+    u: int,
+    v: int,
+    key: int,
+    vertex: int,
+    w_edges: list,
+    closing: bool = False,
 ) -> None:
-    """Reverts changes have been done on current step"""
+    """Reverts changes have been done on current step (the edge has added
+    its end other than the vertex to the Z path or has closed it)
+    """
 
     del multigraph.edges[u, v, key]['fixed_z']
-    if 'started_node' not in multigraph.nodes[v if u == vertex else u]:
+    if not closing and 'started_node' not in multigraph.nodes[v if u == vertex else u]:
         del multigraph.nodes[v if u == vertex else u]['included_in_z']
     multigraph.graph['length_z'] -= 1
 
@@ -24,6 +44,56 @@ def step_back(
             multigraph.graph['w'].remove(tuple(sorted((u_w, v_w))))
 
 
+def get_path_end(multigraph: nx.MultiGraph, head: int, tail: int, length: int) -> int:
+    """Chooses the end of the Z path with fewer viable continuations
+    (non-fixed edges to vertices out of the path unless the edge closes it)
+    """
+
+    def viable(end: int) -> int:
+        return sum(
+            1
+            for u, v, _, _ in filter(
+                utils.is_non_fixed_edge, multigraph.edges(end, data=True, keys=True)
+            )
+            if 'included_in_z' not in multigraph.nodes[v if u == end else u]
+            or multigraph.graph['length_z'] + 1 == length
+        )
+
+    return tail if viable(tail) < viable(head) else head
+
+
+def is_feasible(multigraph: nx.MultiGraph, vertices: Iterable, length: int) -> bool:
+    """Checks the Z and W capacity of the vertices: a vertex takes two Z and
+    two W edges, a free edge can still be in Z only if its other end has room
+    for a Z edge (it is out of the Z path or ends it, the ends of the path are
+    joined by the last edge only), otherwise it goes to W
+    """
+
+    closing = multigraph.graph['length_z'] + 1 == length
+    for vertex in vertices:
+        in_path = 'included_in_z' in multigraph.nodes[vertex]
+        z, w, options = 0, 0, set()
+        for _, other, attrs in multigraph.edges(vertex, data=True):
+            if 'fixed_z' in attrs:
+                z += 1
+            elif 'fixed_w' in attrs:
+                w += 1
+            elif 'included_in_z' not in multigraph.nodes[other] or (
+                (not in_path or closing)
+                and sum(
+                    'fixed_z' in value
+                    for *_, value in multigraph.edges(other, data=True)
+                )
+                < 2
+            ):
+                options.add(other)
+            else:
+                w += 1
+        if z > 2 or w > 2 or len(options) < 2 - z:
+            return False
+    return True
+
+
 @utils.timeout('Simple path for undirected cycles')
 def backtracking_1(
     multigraph: nx.MultiGraph,
@@ -32,10 +102,22 @@ def backtracking_1(
     vertex: int,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    tail: Optional[int] = None,
 ) -> bool:
+    """Grows the Z path from its end `vertex` (and from the other end if
+    set, by the end with fewer viable continuations)
+    """
+
+    if counters is not None:
+        utils.count_node(counters, depth)
+
     if multigraph.graph['length_z'] == len(x_edges) and multigraph.graph[
         'length_w'
     ] == len(x_edges):
+        if counters is not None:
+            counters['leaves'] += 1
         z = nx.get_edge_attributes(multigraph, 'fixed_z')
         z_edges = {tuple(sorted(item[:2])) for item in z}
         if (
@@ -49,28 +131,46 @@ def backtracking_1(
             return True
         return False
 
+    end = (
+        vertex if tail is None else get_path_end(multigraph, vertex, tail, len(x_edges))
+    )
     for u, v, key, attrs in filter(
-        utils.is_non_fixed_edge, multigraph.edges(vertex, data=True, keys=True)
+        utils.is_non_fixed_edge, multigraph.edges(end, data=True, keys=True)
     ):
-        if 'included_in_z' in multigraph.nodes[
-            v if u == vertex else u
-        ] and multigraph.graph['length_z'] + 1 != len(x_edges):
+        added = v if u == end else u
+        if 'included_in_z' in multigraph.nodes[added] and multigraph.graph[
+            'length_z'
+        ] + 1 != len(x_edges):
+            if counters is not None:
+                counters['included_prunes'] += 1
             continue
 
+        closing = 'included_in_z' in multigraph.nodes[added]
         multigraph.edges[u, v, key]['fixed_z'] = True
-        multigraph.nodes[v if u == vertex else u]['included_in_z'] = True
+        multigraph.nodes[added]['included_in_z'] = True
         multigraph.graph['length_z'] += 1
 
         added_to_w = []
 
         for u_w, v_w, key_w, _ in filter(
-            utils.is_non_fixed_edge, multigraph.edges(vertex, data=True, keys=True)
+            utils.is_non_fixed_edge, multigraph.edges(end, data=True, keys=True)
         ):
             multigraph.edges[u_w, v_w, key_w]['fixed_w'] = True
             added_to_w.append((u_w, v_w, key_w))
             multigraph.graph['length_w'] += 1
             multigraph.graph['w'].add(tuple(sorted((u_w, v_w))))
 
+        # forward checking of the vertices whose edges have been fixed
+        if not is_feasible(
+            multigraph,
+            {added} | {v_w if u_w == end else u_w for u_w, v_w, _ in added_to_w},
+            len(x_edges),
+        ):
+            if counters is not None:
+                counters['capacity_prunes'] += 1
+            step_back(multigraph, u, v, key, end, added_to_w, closing)
+            continue
+
         if (
             added_to_w
             and utils.has_cycle(multigraph.graph['w'])
@@ -79,20 +179,27 @@ def backtracking_1(
                 or not utils.is_hamiltonian_cycle(multigraph.graph['w'])
             )
         ):
-            step_back(multigraph, u, v, key, vertex, added_to_w)
+            if counters is not None:
+                counters['cycle_prunes'] += 1
+            step_back(multigraph, u, v, key, end, added_to_w, closing)
             continue
 
         if backtracking_1(
             multigraph,
             x_edges,
             y_edges,
-            v,
+            added if end == vertex else vertex,
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            depth=depth + 1,
+            tail=tail if tail is None or end == vertex else added,
         ):
             return True
 
-        step_back(multigraph, u, v, key, vertex, added_to_w)
+        if counters is not None:
+            counters['backtracks'] += 1
+        step_back(multigraph, u, v, key, end, added_to_w, closing)
 
     return False
 
@@ -102,6 +209,9 @@ def simple_path(
     graph_y: list,
     timeout: Optional[int] = None,
     global_timeout: Optional[int] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+    bidirectional: bool = False,
 ) -> bool:
     x_edges = {
         tuple(sorted((graph_x[idx - 1], graph_x[idx]))) for idx in range(len(graph_x))
@@ -110,9 +220,7 @@ def simple_path(
         tuple(sorted((graph_y[idx - 1], graph_y[idx]))) for idx in range(len(graph_y))
     }
 
-    multigraph = nx.MultiGraph()
-    multigraph.add_edges_from(x_edges)
-    multigraph.add_edges_from(y_edges)
+    multigraph = build_multigraph(x_edges, y_edges)
 
     start_node = 1
     start_edges = list(multigraph.edges(start_node))
@@ -151,7 +259,11 @@ def simple_path(
             edge_2[1],
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            tail=edge_1[1] if bidirectional else None,
         ):
+            if solution is not None:
+                solution['z'], solution['w'] = utils.get_decomposition(multigraph)
             return True
 
         for u, v in [edge_1, edge_2]:
@@ -191,6 +303,28 @@ def get_node_with_min_degree(multigraph: nx.MultiGraph) -> int:
     return max(nodes, key=lambda x: nodes[x]) if nodes else 1
 
 
+def get_next_edges(
+    multigraph: nx.MultiGraph, policy: Optional[policies.Policy] = None
+) -> list:
+    """Gets the free edges of the vertex chosen by the policy (the one with
+    the most fixed edges by default), one of them is fixed in Z next
+    """
+
+    if policy is not None:
+        return policy.branches(multigraph)
+
+    next_node = get_node_with_min_degree(multigraph)
+    return list(
+        filter(
+            lambda x: all(
+                'fixed_z' not in value and 'fixed_w' not in value
+                for key, value in multigraph[x[0]][x[1]].items()
+            ),
+            multigraph.edges(next_node),
+        )
+    )
+
+
 @utils.timeout('Chain edge fixing for undirected cycles')
 def backtracking_2(
     multigraph: nx.MultiGraph,
@@ -199,17 +333,32 @@ def backtracking_2(
     edge: tuple,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    depth: int = 0,
+    discrepancies: Optional[int] = None,
+    mode: Optional[str] = None,
+    policy: Optional[policies.Policy] = None,
 ) -> bool:
     fixed_in_z: set = set()
     fixed_in_w: set = set()
 
+    if counters is not None:
+        utils.count_node(counters, depth)
+
     utils.fix_edge(
-        multigraph, edge, in_z=True, fixed_in_z=fixed_in_z, fixed_in_w=fixed_in_w
+        multigraph,
+        edge,
+        in_z=True,
+        fixed_in_z=fixed_in_z,
+        fixed_in_w=fixed_in_w,
+        counters=counters,
     )
 
     z = nx.get_edge_attributes(multigraph, 'fixed_z')
     w = nx.get_edge_attributes(multigraph, 'fixed_w')
     if len(z) == len(x_edges) and len(w) == len(x_edges):
+        if counters is not None:
+            counters['leaves'] += 1
         z_edges = {tuple(sorted(item[:2])) for item in z}
         w_edges = {tuple(sorted(item[:2])) for item in w}
         if (
@@ -229,30 +378,39 @@ def backtracking_2(
         return False
 
     if utils.has_cycle(z) or utils.has_cycle(w):
+        if counters is not None:
+            counters['cycle_prunes'] += 1
         for u, v in fixed_in_z:
             del multigraph.edges[u, v, 0]['fixed_z']
         for u, v in fixed_in_w:
             del multigraph.edges[u, v, 0]['fixed_w']
         return False
 
-    next_node = get_node_with_min_degree(multigraph)
-    for next_edge in filter(
-        lambda x: all(
-            'fixed_z' not in value and 'fixed_w' not in value
-            for key, value in multigraph[x[0]][x[1]].items()
-        ),
-        multigraph.edges(next_node),
-    ):
-        if backtracking_2(
+    if policy is not None:
+        policy.fix(fixed_in_z, fixed_in_w)
+    for index, next_edge in enumerate(get_next_edges(multigraph, policy)):
+        allowed, left = utils.discrepancy_branch(
+            multigraph, index, depth + 1, discrepancies, mode
+        )
+        if allowed and backtracking_2(
             multigraph,
             x_edges,
             y_edges,
             next_edge,
             timeout=timeout,
             global_timeout=global_timeout,
+            counters=counters,
+            depth=depth + 1,
+            discrepancies=left,
+            mode=mode,
+            policy=policy,
         ):
             return True
 
+    if counters is not None:
+        counters['backtracks'] += 1
+    if policy is not None:
+        policy.unfix(fixed_in_z, fixed_in_w)
     for u, v in fixed_in_z:
         del multigraph.edges[u, v, 0]['fixed_z']
     for u, v in fixed_in_w:
@@ -266,35 +424,45 @@ def chain_edge_fixing(
     graph_y: list,
     timeout: Optional[tuple] = None,
     global_timeout: Optional[tuple] = None,
+    counters: Optional[Counter] = None,
+    solution: Optional[dict] = None,
+    mode: Optional[str] = None,
+    policy: Optional[str] = None,
 ) -> bool:
     x, y = nx.Graph(), nx.Graph()
     nx.add_cycle(x, graph_x)
     nx.add_cycle(y, graph_y)
 
-    multigraph = nx.MultiGraph()
-    multigraph.add_edges_from(x.edges)
-    multigraph.add_edges_from(y.edges)
+    multigraph = build_multigraph(x.edges, y.edges)
 
     utils.fix_multiedges(multigraph)
+    branching = policies.get_policy(policy, multigraph) if policy else None
 
     x_edges = {tuple(sorted(item)) for item in x.edges}
     y_edges = {tuple(sorted(item)) for item in y.edges}
 
-    next_node = get_node_with_min_degree(multigraph)
-    for next_edge in filter(
-        lambda x: all(
-            'fixed_z' not in value and 'fixed_w' not in value
-            for key, value in multigraph[x[0]][x[1]].items()
-        ),
-        multigraph.edges(next_node),
-    ):
-        if backtracking_2(
-            multigraph,
-            x_edges,
-            y_edges,
-            next_edge,
-            timeout=timeout,
-            global_timeout=global_timeout,
-        ):
-            return True
+    # discrepancy search is repeated with a growing limit until no branch is cut
+    for discrepancies in itertools.count() if mode else [None]:
+        multigraph.graph['discrepancy_cut'] = False
+        for index, next_edge in enumerate(get_next_edges(multigraph, branching)):
+            allowed, left = utils.discrepancy_branch(
+                multigraph, index, 0, discrepancies, mode
+            )
+            if allowed and backtracking_2(
+                multigraph,
+                x_edges,
+                y_edges,
+                next_edge,
+                timeout=timeout,
+                global_timeout=global_timeout,
+                counters=counters,
+                discrepancies=left,
+                mode=mode,
+                policy=branching,
+            ):
+                if solution is not None:
+                    solution['z'], solution['w'] = utils.get_decomposition(multigraph)
+                return True
+        if not multigraph.graph['discrepancy_cut']:
+            break
     return False
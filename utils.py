@@ -3,16 +3,12 @@ from collections import Counter
 from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta
 from random import shuffle
-from typing import Any, Callable, Union
+from typing import Any, Callable, Optional, Union
 
-import matplotlib.pyplot as plt
 import networkx as nx
 
 import exceptions
 
-plt.rcParams["figure.figsize"] = (12, 12)
-plt.axis('off')
-
 
 def get_pyramidal_cycles(number_of_vertices: int, number: int) -> list:
     """Generates list of pyramidal cycles
@@ -245,6 +241,12 @@ def generate_random_graphs(target: list, arguments: dict) -> None:
 
 
 def show(G: nx.MultiGraph) -> None:
+    # matplotlib is slow to import and is only needed here
+    import matplotlib.pyplot as plt
+
+    plt.rcParams["figure.figsize"] = (12, 12)
+    plt.axis('off')
+
     pos = nx.circular_layout(G)
 
     nx.draw_networkx_nodes(G, pos, nodelist=G.nodes, **{"node_size": 500})
@@ -287,6 +289,27 @@ def show(G: nx.MultiGraph) -> None:
     plt.show()
 
 
+def get_decomposition(multigraph: nx.MultiGraph) -> tuple[set, set]:
+    """Gets edges of Z and W fixed in the multigraph
+
+    Returns:
+        tuple: edges of Z, edges of W
+    """
+
+    decomposition = []
+    for attr in ('fixed_z', 'fixed_w'):
+        if isinstance(multigraph, nx.MultiDiGraph):
+            edges = {item[:2] for item in nx.get_edge_attributes(multigraph, attr)}
+        else:
+            edges = {
+                tuple(sorted(item[:2]))
+                for item in nx.get_edge_attributes(multigraph, attr)
+            }
+        decomposition.append(edges)
+
+    return decomposition[0], decomposition[1]
+
+
 def has_cycle(edges: Union[set, dict]) -> bool:
     counter: dict = {}
 
@@ -327,6 +350,75 @@ def is_hamiltonian_cycle(edges: set[tuple], directed: bool = True) -> bool:
     return False
 
 
+counters_titles = {
+    'nodes': 'Nodes',
+    'backtracks': 'Backtracks',
+    'cycle_prunes': 'Cycle prunes',
+    'included_prunes': 'Included in Z prunes',
+    'capacity_prunes': 'Capacity prunes',
+    'leaves': 'Leaves checked',
+    'propagations': 'Propagation steps',
+    'max_depth': 'Max depth',
+}
+
+
+def count_node(counters: Counter, depth: int) -> None:
+    """Counts an expanded node of the search tree at the given depth"""
+
+    counters['nodes'] += 1
+    if depth > counters['max_depth']:
+        counters['max_depth'] = depth
+
+
+def discrepancy_branch(
+    multigraph: nx.MultiGraph,
+    index: int,
+    depth: int,
+    discrepancies: Optional[int],
+    mode: Optional[str],
+) -> tuple[bool, Optional[int]]:
+    """Checks whether a branch may be explored by a discrepancy search
+
+    A branch other than the first one (the heuristic choice) is a
+    discrepancy. Limited discrepancy search ('lds') allows the given number
+    of them on a path, depth-bounded discrepancy search ('dds') allows them
+    above the given depth only and requires one right at it. A skipped branch
+    is marked in multigraph.graph['discrepancy_cut'], including the heuristic
+    choice right at the depth of 'dds': its subtree was searched without
+    discrepancies by the previous iterations only, so deeper ones are left.
+
+    Args:
+        multigraph: multigraph of the search
+        index: number of the branch, 0 - the heuristic choice
+        depth: depth of the branch
+        discrepancies: discrepancies left ('lds') or the depth of the last
+            one plus 1 ('dds'), None - no limit
+        mode: 'lds', 'dds' or None (no limit)
+
+    Returns:
+        tuple: whether the branch is allowed and discrepancies of its subtree
+    """
+
+    if mode is None or discrepancies is None:
+        return True, discrepancies
+
+    if mode == 'lds':
+        if index == 0:
+            return True, discrepancies
+        if discrepancies > 0:
+            return True, discrepancies - 1
+    else:
+        if depth < discrepancies - 1:
+            return True, discrepancies
+        if depth == discrepancies - 1 and index > 0:
+            return True, discrepancies
+        if depth > discrepancies - 1 and index == 0:
+            return True, discrepancies
+
+    multigraph.graph['discrepancy_cut'] = True
+    return False, discrepancies
+
+
 def timeout(method_name: str) -> Callable:
     def decorator_timeout(func):  # type: ignore
         def wrapper(*args, **kwargs):  # type: ignore
@@ -393,8 +485,16 @@ def fix_multiedges(multigraph: nx.MultiGraph) -> None:
 
 
 def fix_edge(
-    multigraph: nx.MultiGraph, edge: tuple, in_z: bool, fixed_in_z: set, fixed_in_w: set
+    multigraph: nx.MultiGraph,
+    edge: tuple,
+    in_z: bool,
+    fixed_in_z: set,
+    fixed_in_w: set,
+    counters: Optional[Counter] = None,
 ) -> None:
+    if counters is not None:
+        counters['propagations'] += 1
+
     u, v = edge
     if in_z:
         fixed_in_z.add(edge)
@@ -422,6 +522,7 @@ def fix_edge(
                     in_z=not in_z,
                     fixed_in_z=fixed_in_z,
                     fixed_in_w=fixed_in_w,
+                    counters=counters,
                 )
     else:
         for node in edge:
@@ -448,4 +549,5 @@ def fix_edge(
                             in_z=True if fixed_w == 2 else False,
                             fixed_in_z=fixed_in_z,
                             fixed_in_w=fixed_in_w,
+                            counters=counters,
                         )
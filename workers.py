@@ -0,0 +1,218 @@
+"""Warm solver processes which can be killed in the middle of a search"""
+
+import multiprocessing
+import signal
+import sys
+from datetime import datetime
+from multiprocessing.connection import Connection
+from time import perf_counter_ns, process_time_ns
+from typing import Optional
+
+import exceptions
+
+# ERROR - the input is invalid, FAILURE - the search or the worker failed
+NOT_FOUND, FOUND, TIMEOUT, ERROR, FAILURE = 0, 1, 2, 3, 4
+statuses = {
+    NOT_FOUND: 'not found',
+    FOUND: 'found',
+    TIMEOUT: 'timeout',
+    ERROR: 'error',
+    FAILURE: 'failure',
+}
+
+
+def solve(
+    graph_x: tuple, graph_y: tuple, method: int, timeout: Optional[float]
+) -> tuple[int, int, int, str]:
+    """Runs one request in the current process
+
+    Args:
+        graph_x: x graph
+        graph_y: y graph
+        method: key of main.funcs
+        timeout: soft runtime threshold (in seconds), checked by the search
+
+    Returns:
+        tuple: status, wall and CPU time in nanoseconds and an error message
+    """
+
+    from main import funcs
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(graph_x) * 10))
+    kwargs = {}
+    message = ''
+    start_time = perf_counter_ns()
+    cpu_start_time = process_time_ns()
+    if timeout:
+        kwargs['timeout'] = (datetime.now(), timeout / 60)
+
+    try:
+        if method not in funcs:
+            raise exceptions.InputError('Unknown method ' + str(method))
+        if len(graph_x) != len(graph_y):
+            raise exceptions.InputGraphsLengthError(list(graph_x), list(graph_y))
+        if graph_x == graph_y:
+            raise exceptions.EqualInputGraphs(list(graph_x), list(graph_y))
+        status = (
+            FOUND if funcs[method]['func'](graph_x, graph_y, **kwargs) else NOT_FOUND
+        )
+    except exceptions.SingleTestTimeoutExceeded as e:
+        status, message = TIMEOUT, e.message
+    except (
+        exceptions.InputError,
+        exceptions.InputGraphsLengthError,
+        exceptions.EqualInputGraphs,
+    ) as e:
+        status, message = ERROR, e.message
+    except Exception as e:
+        status, message = FAILURE, getattr(e, 'message', repr(e))
+
+    return (
+        status,
+        perf_counter_ns() - start_time,
+        process_time_ns() - cpu_start_time,
+        message,
+    )
+
+
+def warm_up() -> None:
+    """Imports the solvers and runs every method once, so the first request
+    doesn't pay for lazy initialization
+    """
+
+    from main import funcs
+
+    for method in funcs:
+        solve((1, 2, 3, 4, 5, 6), (1, 3, 5, 2, 6, 4), method, None)
+
+
+def serve(connection: Connection) -> None:
+    """Solves requests from the connection until None or EOF is received,
+    None is sent once the worker is warmed up
+    """
+
+    # Ctrl+C is handled by the supervising process, which kills the worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_up()
+    connection.send(None)
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        connection.send(solve(*request))
+
+
+class Worker:
+    """Process with the solvers imported, solving one request at a time
+
+    A search can't be interrupted from the outside, so a request is
+    cancelled by killing the process and starting a new one.
+    """
+
+    def __init__(self) -> None:
+        self.process: Optional[multiprocessing.Process] = None
+        self.connection: Optional[Connection] = None
+        self.ready = False
+        self.start()
+
+    def start(self) -> None:
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.ready = False
+
+    def wait_ready(self) -> None:
+        """Waits until the started worker is warmed up"""
+
+        assert self.connection is not None
+        if not self.ready:
+            self.connection.recv()
+            self.ready = True
+
+    def fileno(self) -> int:
+        assert self.connection is not None
+        return self.connection.fileno()
+
+    def send(
+        self, graph_x: tuple, graph_y: tuple, method: int, timeout: Optional[float]
+    ) -> None:
+        assert self.connection is not None
+        self.wait_ready()
+        self.connection.send((tuple(graph_x), tuple(graph_y), method, timeout))
+
+    def receive(self) -> tuple[int, int, int, str]:
+        """Gets the result of the sent request (blocks until it is ready)"""
+
+        assert self.connection is not None
+        try:
+            status, runtime, cpu_time, message = self.connection.recv()
+        except EOFError:
+            self.restart()
+            return FAILURE, 0, 0, 'The worker process died'
+        return status, runtime, cpu_time, message
+
+    def poll(self, timeout: Optional[float]) -> bool:
+        assert self.connection is not None
+        return self.connection.poll(timeout)
+
+    def run(
+        self,
+        graph_x: tuple,
+        graph_y: tuple,
+        method: int,
+        timeout: Optional[float],
+        deadline: Optional[float],
+    ) -> tuple[int, int, int, str]:
+        """Solves the request, the worker is killed and started again if
+        the deadline (in seconds) is exceeded or the wait is interrupted, and
+        started again first if its process died
+
+        Returns:
+            tuple: status, wall and CPU time in nanoseconds and an error message
+        """
+
+        if self.process is None or not self.process.is_alive():
+            # killed while idle, e.g. by the OOM killer
+            self.restart()
+        self.wait_ready()
+        start_time = perf_counter_ns()
+        self.send(graph_x, graph_y, method, timeout)
+        try:
+            ready = self.poll(deadline)
+        except BaseException:
+            self.restart()
+            raise
+        if not ready:
+            self.restart()
+            elapsed = perf_counter_ns() - start_time
+            return TIMEOUT, elapsed, elapsed, 'Deadline exceeded'
+        return self.receive()
+
+    def kill(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.process = None
+
+    def restart(self) -> None:
+        self.kill()
+        self.start()
+
+    def close(self) -> None:
+        """Stops the process after the current request"""
+
+        if self.connection is not None and self.process is not None:
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        self.kill()